@@ -0,0 +1,841 @@
+"""
+End-to-end load test for every route in routers/users.py, routers/hotels.py and
+routers/bookings.py.
+
+The app from main.py is booted in-process, lifespan included, and driven through
+httpx's ASGI transport. The numbers cover routing, validation, services and the
+database, but not the network stack or the ASGI server.
+
+    python -m benchmarks.load_test --duration 30 --concurrency 32
+    python -m benchmarks.load_test --mix findHotelById=10,createBooking=1 --output result.json
+    python -m benchmarks.load_test --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load_test --baseline benchmarks/baseline.json --fail-on-regression
+    python -m benchmarks.load_test --scenario booking-conflict --concurrency 50
+    python -m benchmarks.load_test --mix only:findHotelById,findAllHotels --conditional-gets
+
+The backend is configured through the usual DB_TYPE / DB_URL variables or the flags
+below; the default database name is `loadtest` so a local mongod is not polluted.
+`--backend memory` runs without any database I/O, which isolates the cost of the
+framework and the services; `--backend sqlite` writes to `<db-name>.db`.
+Access and refresh keys are generated for the run when they are not set.
+"""
+
+import argparse
+import asyncio
+import base64
+import datetime
+import http.cookiejar
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+PASSWORD = "loadtest-password"
+CITIES = [
+    ("Toronto", "ON"),
+    ("Ottawa", "ON"),
+    ("Montreal", "QC"),
+    ("Vancouver", "BC"),
+    ("Calgary", "AB"),
+    ("Halifax", "NS"),
+]
+HOTEL_TAGS = ["pool", "gym", "spa", "parking", "breakfast", "pets"]
+ROOM_TYPES = [("single", 1, 90), ("double", 2, 140), ("family", 4, 220), ("suite", 4, 350)]
+# bookings are spread over this many days from the start date, so collisions stay rare
+BOOKING_HORIZON_DAYS = 3 * 365
+BOOKING_START = datetime.datetime(2030, 1, 1)
+
+
+# ---------------------------------------------------------------- environment
+
+
+def _generate_key_pair() -> tuple[str, str]:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return base64.b64encode(private_pem).decode(), base64.b64encode(public_pem).decode()
+
+
+def prepare_environment(args: argparse.Namespace):
+    """Settings are read from the environment at import time, so this runs before main is imported."""
+    if args.backend:
+        os.environ["DB_TYPE"] = args.backend
+    if args.db_url:
+        os.environ["DB_URL"] = args.db_url
+    os.environ["DB_NAME"] = args.db_name
+    # the SQLite backend keeps the run in its own database file next to the working directory
+    os.environ.setdefault("SQLITE_PATH", f"{args.db_name}.db")
+    os.environ.setdefault("LOG_LEVEL", args.log_level)
+
+    for prefix in ("ACCESS", "REFRESH"):
+        if not os.environ.get(f"{prefix}_PRIVATE_KEY"):
+            private_key, public_key = _generate_key_pair()
+            os.environ[f"{prefix}_PRIVATE_KEY"] = private_key
+            os.environ[f"{prefix}_PUBLIC_KEY"] = public_key
+
+
+async def insert_hotels(app, hotels: list[dict]) -> list[str]:
+    """There is no route creating hotels, so they are written to the backend directly."""
+    from config.database_manager import DatabaseType
+
+    db_manager = app.state.db_manager
+    if db_manager.db_type == DatabaseType.MONGODB:
+        result = await db_manager.connection["hotels"].insert_many(hotels)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    if db_manager.db_type == DatabaseType.MEMORY:
+        return db_manager.connection.get_collection("hotels").insert_many(hotels)
+    if db_manager.db_type == DatabaseType.SQLITE:
+        from repository.sql.hotel_repository_sqlite import HotelRepositorySQLite
+
+        return await HotelRepositorySQLite(db_manager.connection).insert_many(hotels)
+    raise ValueError(f"Seeding is not supported for database type {db_manager.db_type}")
+
+
+# ---------------------------------------------------------------- recording
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.recording = False
+        self.total = 0
+
+    def record(self, name: str, status: int, elapsed: float, expected: frozenset[int]):
+        if not self.recording:
+            return
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        stats.latencies.append(elapsed)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        if status not in expected:
+            stats.errors += 1
+        self.total += 1
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for name, stats in sorted(recorder.endpoints.items()):
+        latencies = sorted(stats.latencies)
+        count = len(latencies)
+        endpoints[name] = {
+            "requests": count,
+            "errors": stats.errors,
+            "statuses": {str(status): n for status, n in sorted(stats.statuses.items())},
+            "throughput": round(count / elapsed, 2) if elapsed else 0.0,
+            "meanMs": round(sum(latencies) / count * 1000, 3) if count else 0.0,
+            "p50Ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95Ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99Ms": round(percentile(latencies, 99) * 1000, 3),
+            "maxMs": round(latencies[-1] * 1000, 3) if count else 0.0,
+        }
+    return {
+        "elapsedSeconds": round(elapsed, 3),
+        "totalRequests": recorder.total,
+        "throughput": round(recorder.total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> dict:
+    """
+    Per endpoint change of p95 latency and throughput against the baseline.
+    An endpoint regresses when its p95 grew or its throughput shrank by more than `threshold`.
+    """
+    endpoints = {}
+    regressions = []
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        p95_change = (
+            (current["p95Ms"] - previous["p95Ms"]) / previous["p95Ms"]
+            if previous["p95Ms"]
+            else 0.0
+        )
+        throughput_change = (
+            (current["throughput"] - previous["throughput"]) / previous["throughput"]
+            if previous["throughput"]
+            else 0.0
+        )
+        regressed = p95_change > threshold or throughput_change < -threshold
+        endpoints[name] = {
+            "p95Ms": current["p95Ms"],
+            "baselineP95Ms": previous["p95Ms"],
+            "p95Change": round(p95_change, 4),
+            "throughput": current["throughput"],
+            "baselineThroughput": previous["throughput"],
+            "throughputChange": round(throughput_change, 4),
+            "regressed": regressed,
+        }
+        if regressed:
+            regressions.append(name)
+    return {"threshold": threshold, "regressions": regressions, "endpoints": endpoints}
+
+
+# ---------------------------------------------------------------- load
+
+
+@dataclass
+class Session:
+    email: str
+    user_id: str
+    access_token: str
+    refresh_token: Optional[str]
+    # last ETag per url, sent back as If-None-Match with --conditional-gets
+    etags: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+def _refresh_token_from(response) -> Optional[str]:
+    # parsed from the header, the client itself does not keep cookies between requests
+    for header in response.headers.get_list("set-cookie"):
+        name, _, rest = header.partition("=")
+        if name.strip() == "refreshToken":
+            return rest.split(";", 1)[0]
+    return None
+
+
+def _hotel_document(
+    index: int, rng: random.Random, room_count: Optional[int] = None
+) -> dict:
+    city, province = CITIES[index % len(CITIES)]
+    rooms = []
+    for number in range(room_count or rng.randint(3, 8)):
+        room_type, sleeps, rate = ROOM_TYPES[number % len(ROOM_TYPES)]
+        rooms.append(
+            {
+                "description": f"{room_type} room",
+                "isActive": True,
+                "type": room_type,
+                "baseRate": float(rate + rng.randint(0, 60)),
+                "bedOptions": "queen" if sleeps < 4 else "king",
+                "sleepsCount": sleeps,
+                "tags": [],
+                "roomId": str(100 + number),
+            }
+        )
+    return {
+        "hotelName": f"Load Test Hotel {index}",
+        "isActive": index % 10 != 0,
+        "description": "Seeded by the load test",
+        "tags": rng.sample(HOTEL_TAGS, 2),
+        "photo": "hotel.jpg",
+        "rating": round(rng.uniform(2.5, 5.0), 1),
+        "address": {
+            "street": f"{index} Main Street",
+            "city": city,
+            "province": province,
+            "postalCode": "M5V 1A1",
+            "country": "Canada",
+        },
+        "rooms": rooms,
+    }
+
+
+def _client_info(email: str) -> dict:
+    return {"firstName": "Load", "lastName": "Test", "email": email, "phone": "4165551234"}
+
+
+def _card_info() -> dict:
+    return {
+        "cardNumber": "4111111111111111",
+        "cardName": "Load Test",
+        "expDate": "1230",
+        "cvv": "123",
+        "address": {
+            "street": "1 Main Street",
+            "city": "Toronto",
+            "province": "ON",
+            "postalCode": "M5V 1A1",
+            "country": "Canada",
+        },
+    }
+
+
+class LoadTest:
+    def __init__(self, app, client, args: argparse.Namespace):
+        self.app = app
+        self.client = client
+        self.args = args
+        self.run_id = uuid.uuid4().hex[:8]
+        self.recorder = Recorder()
+        self.sessions: list[Session] = []
+        self.hotels: list[dict] = []
+
+    async def timed(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        expected: frozenset[int] = frozenset({200}),
+        **kwargs,
+    ):
+        start = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        # streamed bodies are part of the request time
+        await response.aread()
+        self.recorder.record(name, response.status_code, time.perf_counter() - start, expected)
+        return response
+
+    # ------------------------------------------------------------ seeding
+
+    def _email(self, label: str) -> str:
+        return f"loadtest-{self.run_id}-{label}@example.com"
+
+    async def _register(self, email: str) -> str:
+        response = await self.client.post(
+            "/user/register", json={"email": email, "role": "user", "password": PASSWORD}
+        )
+        response.raise_for_status()
+        return response.json()["data"]
+
+    async def _login(self, email: str) -> Session:
+        response = await self.client.post(
+            "/user/login", json={"email": email, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        body = response.json()
+        return Session(
+            email=email,
+            user_id=body["user"]["_id"],
+            access_token=body["token"],
+            refresh_token=_refresh_token_from(response),
+        )
+
+    async def seed(self):
+        rng = random.Random(self.args.seed)
+        documents = [
+            _hotel_document(i, rng, self.args.rooms_per_hotel)
+            for i in range(self.args.hotels)
+        ]
+        hotel_ids = await insert_hotels(self.app, [dict(doc) for doc in documents])
+        # written around the repositories, the catalog version did not move
+        await self.app.state.container.catalog_snapshot.rebuild()
+        self.hotels = [{**doc, "_id": hotel_id} for doc, hotel_id in zip(documents, hotel_ids)]
+
+        # one session per worker, refresh token rotation must not race between workers
+        for i in range(self.args.concurrency):
+            email = self._email(f"user{i}")
+            await self._register(email)
+            self.sessions.append(await self._login(email))
+
+        for session in self.sessions:
+            for _ in range(self.args.bookings_per_user):
+                await self._create_booking(session, rng, name=None)
+
+    # ------------------------------------------------------------ scenarios
+
+    def _booking_body(self, session: Session, rng: random.Random) -> dict:
+        hotel = rng.choice(self.hotels)
+        room = rng.choice(hotel["rooms"])
+        nights = rng.randint(1, 3)
+        start = BOOKING_START + datetime.timedelta(days=rng.randrange(BOOKING_HORIZON_DAYS))
+        return {
+            "hotel": hotel["_id"],
+            "from": start.isoformat(),
+            "to": (start + datetime.timedelta(days=nights)).isoformat(),
+            "duration": nights,
+            "numberOfGuest": room["sleepsCount"],
+            "rooms": [room["roomId"]],
+            "totalPrice": room["baseRate"] * nights,
+            "clientInfo": _client_info(session.email),
+            "cardInfo": _card_info(),
+            "userId": session.user_id,
+            "time": datetime.datetime.now().isoformat(),
+        }
+
+    async def _create_booking(self, session: Session, rng: random.Random, name="createBooking"):
+        body = self._booking_body(session, rng)
+        if name is None:
+            await self.client.post("/booking/createBooking", json=body)
+            return
+        # a taken room is a legitimate outcome under load
+        await self.timed(
+            name, "POST", "/booking/createBooking", frozenset({200, 409}), json=body
+        )
+
+    async def register(self, session: Session, rng: random.Random):
+        email = self._email(uuid.uuid4().hex[:12])
+        await self.timed(
+            "register",
+            "POST",
+            "/user/register",
+            json={"email": email, "role": "user", "password": PASSWORD},
+        )
+
+    async def login(self, session: Session, rng: random.Random):
+        await self.timed(
+            "login",
+            "POST",
+            "/user/login",
+            json={"email": session.email, "password": PASSWORD},
+        )
+
+    async def refresh_access_token(self, session: Session, rng: random.Random):
+        response = await self.timed(
+            "refreshAccessToken",
+            "POST",
+            "/user/refreshAccessToken",
+            headers={"Cookie": f"refreshToken={session.refresh_token}"},
+        )
+        if response.status_code == 200:
+            session.access_token = response.json()["token"]
+            session.refresh_token = _refresh_token_from(response) or session.refresh_token
+        else:
+            # keep the worker going with a fresh pair
+            fresh = await self._login(session.email)
+            session.access_token, session.refresh_token = fresh.access_token, fresh.refresh_token
+
+    async def logout(self, session: Session, rng: random.Random):
+        # log out a separate login so the worker's own tokens stay valid
+        other = await self._login(session.email)
+        await self.timed(
+            "logout",
+            "POST",
+            "/user/logout",
+            headers={**other.headers, "Cookie": f"refreshToken={other.refresh_token}"},
+        )
+
+    async def update_user(self, session: Session, rng: random.Random):
+        await self.timed(
+            "updateUser",
+            "POST",
+            f"/user/updateUser/{session.user_id}",
+            headers=session.headers,
+            json={"email": session.email, "role": "user", "password": PASSWORD},
+        )
+
+    async def delete_user(self, session: Session, rng: random.Random):
+        user_id = await self._register(self._email(uuid.uuid4().hex[:12]))
+        await self.timed(
+            "deleteUser", "DELETE", f"/user/deleteUser/{user_id}", headers=session.headers
+        )
+
+    async def find_all_users(self, session: Session, rng: random.Random):
+        await self.timed(
+            "findAllUsers",
+            "GET",
+            "/user/findAllUsers",
+            headers=session.headers,
+            params={"limit": 20},
+        )
+
+    async def find_user_by_email(self, session: Session, rng: random.Random):
+        email = rng.choice(self.sessions).email
+        await self.timed("findUserByEmail", "GET", f"/user/findUserByEmail/{email}")
+
+    async def find_user_by_id(self, session: Session, rng: random.Random):
+        user_id = rng.choice(self.sessions).user_id
+        await self.timed(
+            "findUserById", "GET", f"/user/findUserById/{user_id}", headers=session.headers
+        )
+
+    async def _poll(self, name: str, session: Session, url: str, **kwargs):
+        """GET a hotel read, revalidating the worker's last copy with --conditional-gets."""
+        if not self.args.conditional_gets:
+            await self.timed(name, "GET", url, **kwargs)
+            return
+
+        headers = dict(kwargs.pop("headers", {}))
+        if url in session.etags:
+            headers["If-None-Match"] = session.etags[url]
+        response = await self.timed(
+            name, "GET", url, frozenset({200, 304}), headers=headers, **kwargs
+        )
+        if "etag" in response.headers:
+            session.etags[url] = response.headers["etag"]
+
+    async def find_all_hotels(self, session: Session, rng: random.Random):
+        await self._poll("findAllHotels", session, "/hotel/findAllHotels")
+
+    async def search_hotels(self, session: Session, rng: random.Random):
+        city, _ = rng.choice(CITIES)
+        params = {"city": city, "isActive": "true"}
+        if rng.random() < 0.5:
+            params["minSleeps"] = rng.choice([1, 2, 4])
+        if rng.random() < 0.5:
+            params["maxRate"] = rng.choice([150, 250, 400])
+        await self.timed("search", "GET", "/hotel/search", params=params)
+
+    async def find_hotel_by_id(self, session: Session, rng: random.Random):
+        hotel = rng.choice(self.hotels)
+        await self._poll(
+            "findHotelById",
+            session,
+            f"/hotel/findHotelById/{hotel['_id']}",
+            headers=session.headers,
+        )
+
+    async def update_hotel(self, session: Session, rng: random.Random):
+        hotel = rng.choice(self.hotels)
+        body = {key: value for key, value in hotel.items() if key != "_id"}
+        body["rating"] = round(rng.uniform(2.5, 5.0), 1)
+        await self.timed(
+            "updateHotel",
+            "PUT",
+            f"/hotel/updateHotel/{hotel['_id']}",
+            headers=session.headers,
+            json=body,
+        )
+
+    async def get_user_booked_hotels(self, session: Session, rng: random.Random):
+        await self.timed(
+            "getUserBookedHotels",
+            "GET",
+            f"/hotel/getUserBookedHotels/{session.user_id}",
+            headers=session.headers,
+        )
+
+    async def get_available_rooms(self, session: Session, rng: random.Random):
+        hotel = rng.choice(self.hotels)
+        start = BOOKING_START + datetime.timedelta(days=rng.randrange(BOOKING_HORIZON_DAYS))
+        await self.timed(
+            "getAvailableRooms",
+            "GET",
+            f"/hotel/getAvailableRooms/{hotel['_id']}",
+            params={
+                "from": start.isoformat(),
+                "to": (start + datetime.timedelta(days=rng.randint(1, 7))).isoformat(),
+                "numberOfGuest": rng.randint(1, 4),
+            },
+        )
+
+    async def create_booking(self, session: Session, rng: random.Random):
+        await self._create_booking(session, rng)
+
+    async def find_all_bookings(self, session: Session, rng: random.Random):
+        await self.timed(
+            "findAllBookings",
+            "GET",
+            "/booking/findAllBookings",
+            headers=session.headers,
+            params={"limit": 20},
+        )
+
+    async def find_booking_by_user_id(self, session: Session, rng: random.Random):
+        await self.timed(
+            "findBookingByUserId",
+            "GET",
+            f"/booking/findBookingByUserId/{session.user_id}",
+            headers=session.headers,
+        )
+
+    async def export_bookings(self, session: Session, rng: random.Random):
+        hotel = rng.choice(self.hotels)
+        start = BOOKING_START + datetime.timedelta(days=rng.randrange(BOOKING_HORIZON_DAYS))
+        await self.timed(
+            "exportBookings",
+            "GET",
+            "/booking/exportBookings",
+            headers=session.headers,
+            params={
+                "hotel": hotel["_id"],
+                "from": start.isoformat(),
+                "to": (start + datetime.timedelta(days=90)).isoformat(),
+            },
+        )
+
+    def scenarios(self) -> dict[str, Callable[[Session, random.Random], Awaitable]]:
+        return {
+            "register": self.register,
+            "login": self.login,
+            "refreshAccessToken": self.refresh_access_token,
+            "logout": self.logout,
+            "updateUser": self.update_user,
+            "deleteUser": self.delete_user,
+            "findAllUsers": self.find_all_users,
+            "findUserByEmail": self.find_user_by_email,
+            "findUserById": self.find_user_by_id,
+            "findAllHotels": self.find_all_hotels,
+            "search": self.search_hotels,
+            "findHotelById": self.find_hotel_by_id,
+            "updateHotel": self.update_hotel,
+            "getUserBookedHotels": self.get_user_booked_hotels,
+            "getAvailableRooms": self.get_available_rooms,
+            "createBooking": self.create_booking,
+            "findAllBookings": self.find_all_bookings,
+            "findBookingByUserId": self.find_booking_by_user_id,
+            "exportBookings": self.export_bookings,
+        }
+
+    # ------------------------------------------------------------ runs
+
+    async def run_mix(self, weights: dict[str, float]) -> dict:
+        scenarios = self.scenarios()
+        names = [name for name, weight in weights.items() if weight > 0]
+        name_weights = [weights[name] for name in names]
+        deadline = 0.0
+
+        def done() -> bool:
+            if self.args.requests and self.recorder.total >= self.args.requests:
+                return True
+            return time.perf_counter() >= deadline
+
+        async def worker(index: int):
+            rng = random.Random(self.args.seed + index)
+            session = self.sessions[index]
+            while not done():
+                name = rng.choices(names, weights=name_weights)[0]
+                await scenarios[name](session, rng)
+
+        async def phase(seconds: float):
+            nonlocal deadline
+            deadline = time.perf_counter() + seconds
+            await asyncio.gather(*(worker(i) for i in range(self.args.concurrency)))
+
+        if self.args.warmup > 0:
+            await phase(self.args.warmup)
+
+        self.recorder.recording = True
+        start = time.perf_counter()
+        # with a request budget the duration only bounds the run
+        await phase(self.args.duration)
+        elapsed = time.perf_counter() - start
+        self.recorder.recording = False
+        return summarize(self.recorder, elapsed)
+
+    async def run_booking_conflict(self) -> dict:
+        """
+        `concurrency` clients race for the same room and nights, `rounds` times.
+        Exactly one booking per round may succeed, every other one must be a 409.
+        """
+        hotel = self.hotels[0]
+        room = hotel["rooms"][0]
+        rounds = []
+        self.recorder.recording = True
+        start = time.perf_counter()
+        for round_index in range(self.args.rounds):
+            # far behind the regular booking horizon, so seeded bookings never collide
+            night = BOOKING_START + datetime.timedelta(
+                days=BOOKING_HORIZON_DAYS + 30 + round_index * 7
+            )
+            body_template = {
+                "hotel": hotel["_id"],
+                "from": night.isoformat(),
+                "to": (night + datetime.timedelta(days=2)).isoformat(),
+                "duration": 2,
+                "numberOfGuest": 1,
+                "rooms": [room["roomId"]],
+                "totalPrice": room["baseRate"] * 2,
+                "cardInfo": _card_info(),
+                "time": datetime.datetime.now().isoformat(),
+            }
+            responses = await asyncio.gather(
+                *(
+                    self.timed(
+                        "createBooking",
+                        "POST",
+                        "/booking/createBooking",
+                        frozenset({200, 409}),
+                        json={
+                            **body_template,
+                            "userId": session.user_id,
+                            "clientInfo": _client_info(session.email),
+                        },
+                    )
+                    for session in self.sessions
+                )
+            )
+            statuses = [response.status_code for response in responses]
+            rounds.append(
+                {
+                    "created": statuses.count(200),
+                    "conflicts": statuses.count(409),
+                    "other": len(statuses) - statuses.count(200) - statuses.count(409),
+                }
+            )
+        elapsed = time.perf_counter() - start
+        self.recorder.recording = False
+
+        report = summarize(self.recorder, elapsed)
+        report["rounds"] = rounds
+        report["doubleBookings"] = sum(max(0, r["created"] - 1) for r in rounds)
+        report["passed"] = all(r["created"] == 1 and r["other"] == 0 for r in rounds)
+        return report
+
+
+# ---------------------------------------------------------------- cli
+
+DEFAULT_MIX = {
+    "register": 1,
+    "login": 2,
+    "refreshAccessToken": 2,
+    "logout": 1,
+    "updateUser": 1,
+    "deleteUser": 1,
+    "findAllUsers": 1,
+    "findUserByEmail": 2,
+    "findUserById": 2,
+    "findAllHotels": 4,
+    "search": 6,
+    "findHotelById": 10,
+    "updateHotel": 1,
+    "getUserBookedHotels": 1,
+    "getAvailableRooms": 5,
+    "createBooking": 3,
+    "findAllBookings": 1,
+    "findBookingByUserId": 2,
+    "exportBookings": 1,
+}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """`name=weight,...` overriding the default weights, `only:` drops every other endpoint."""
+    only = value.startswith("only:")
+    weights = {} if only else dict(DEFAULT_MIX)
+    for item in value.removeprefix("only:").split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(
+                f"Unknown endpoint {name}, expected one of {', '.join(DEFAULT_MIX)}"
+            )
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenario", choices=["mix", "booking-conflict"], default="mix")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of measured load")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many measured requests")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX))
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument(
+        "--rooms-per-hotel", type=int, help="rooms of every seeded hotel, 3 to 8 by default"
+    )
+    parser.add_argument("--bookings-per-user", type=int, default=5)
+    parser.add_argument(
+        "--conditional-gets",
+        action="store_true",
+        help="hotel reads send the last ETag back as If-None-Match, like a polling UI",
+    )
+    parser.add_argument("--rounds", type=int, default=20, help="booking-conflict rounds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", help="DB_TYPE to run against, e.g. mongodb, sqlite or memory")
+    parser.add_argument("--db-url", help="DB_URL, a local mongod by default")
+    parser.add_argument("--db-name", default="loadtest")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="compare against this report")
+    parser.add_argument("--save-baseline", help="also store the report as the new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="relative change counted as a regression"
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+    import main
+
+    app = main.app
+    # the harness keeps tokens per virtual user, a shared cookie jar would mix them up
+    no_cookies = http.cookiejar.CookieJar(
+        policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+    )
+    async with app.router.lifespan_context(app):
+        # server errors are recorded as 500 responses instead of aborting the run
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://loadtest",
+            cookies=no_cookies,
+            timeout=60,
+        ) as client:
+            load_test = LoadTest(app, client, args)
+            await load_test.seed()
+            if args.scenario == "booking-conflict":
+                report = await load_test.run_booking_conflict()
+            else:
+                report = await load_test.run_mix(args.mix)
+
+    report["config"] = {
+        "scenario": args.scenario,
+        "backend": os.environ.get("DB_TYPE"),
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "requests": args.requests,
+        "hotels": args.hotels,
+        "roomsPerHotel": args.rooms_per_hotel,
+        "conditionalGets": args.conditional_gets,
+        "seed": args.seed,
+        "mix": args.mix if args.scenario == "mix" else None,
+    }
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    prepare_environment(args)
+    report = asyncio.run(run(args))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+        for name in report["comparison"]["regressions"]:
+            change = report["comparison"]["endpoints"][name]
+            print(
+                f"REGRESSION {name}: p95 {change['baselineP95Ms']}ms -> {change['p95Ms']}ms, "
+                f"throughput {change['baselineThroughput']} -> {change['throughput']} req/s",
+                file=sys.stderr,
+            )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+
+    if args.scenario == "booking-conflict" and not report["passed"]:
+        print(f"Double bookings: {report['doubleBookings']}", file=sys.stderr)
+        return 1
+    if args.fail_on_regression and report.get("comparison", {}).get("regressions"):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Compare the repository backends on the same query shapes.
+
+Every backend gets the same seeded users, hotels and bookings, then each query shape
+(the calls the services make) is awaited back to back and its latency recorded. There is
+no HTTP, validation of requests or service code in the numbers, only the repository call.
+
+    python -m benchmarks.repository_benchmark
+    python -m benchmarks.repository_benchmark --backends mongodb,sqlite --iterations 2000
+    python -m benchmarks.repository_benchmark --db-url mongodb://localhost:27017 --output repos.json
+
+MongoDB runs against the `repository_benchmark` database (emptied before seeding) and SQLite
+against `repository_benchmark.db` (deleted before seeding), unless told otherwise.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Optional
+
+from benchmarks.load_test import _card_info, _client_info, _hotel_document, percentile
+
+BACKENDS = ("mongodb", "sqlite", "memory")
+
+
+async def open_backend(args: argparse.Namespace, backend: str):
+    from config.database_manager import DatabaseManager
+    from config.settings import Settings
+
+    settings = Settings(
+        db_type=backend,
+        db_url=args.db_url or Settings().db_url,
+        db_name=args.db_name,
+        sqlite_path=args.sqlite_path,
+        log_level=args.log_level,
+    )
+    if backend == "sqlite":
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(settings.sqlite_path + suffix):
+                os.remove(settings.sqlite_path + suffix)
+
+    db_manager = DatabaseManager(settings)
+    conn = await db_manager.initialize(settings)
+    if backend == "mongodb":
+        # a dedicated database, so emptying the collections only loses earlier benchmark data
+        for name in ("users", "hotels", "bookings", "roomNights", "refreshTokens"):
+            await conn[name].delete_many({})
+    return db_manager, conn
+
+
+def build_repositories(backend: str, conn) -> dict:
+    if backend == "mongodb":
+        from repository.mongo.booking_repository_mongodb import BookingRepositoryMongoDB
+        from repository.mongo.hotel_repository_mongodb import HotelRepositoryMongoDB
+        from repository.mongo.refresh_token_repository_mongodb import (
+            RefreshTokenRepositoryMongoDB,
+        )
+        from repository.mongo.user_repository_mongodb import UserRepositoryMongoDB
+
+        return {
+            "user": UserRepositoryMongoDB(conn),
+            "hotel": HotelRepositoryMongoDB(conn),
+            "booking": BookingRepositoryMongoDB(conn),
+            "refreshToken": RefreshTokenRepositoryMongoDB(conn),
+        }
+    if backend == "sqlite":
+        from repository.sql.booking_repository_sqlite import BookingRepositorySQLite
+        from repository.sql.hotel_repository_sqlite import HotelRepositorySQLite
+        from repository.sql.refresh_token_repository_sqlite import (
+            RefreshTokenRepositorySQLite,
+        )
+        from repository.sql.user_repository_sqlite import UserRepositorySQLite
+
+        return {
+            "user": UserRepositorySQLite(conn),
+            "hotel": HotelRepositorySQLite(conn),
+            "booking": BookingRepositorySQLite(conn),
+            "refreshToken": RefreshTokenRepositorySQLite(conn),
+        }
+    if backend == "memory":
+        from repository.memory.booking_repository_memory import BookingRepositoryMemory
+        from repository.memory.hotel_repository_memory import HotelRepositoryMemory
+        from repository.memory.refresh_token_repository_memory import (
+            RefreshTokenRepositoryMemory,
+        )
+        from repository.memory.user_repository_memory import UserRepositoryMemory
+
+        return {
+            "user": UserRepositoryMemory(conn),
+            "hotel": HotelRepositoryMemory(conn),
+            "booking": BookingRepositoryMemory(conn),
+            "refreshToken": RefreshTokenRepositoryMemory(conn),
+        }
+    raise ValueError(f"Unknown backend {backend}")
+
+
+async def insert_hotels(backend: str, conn, repositories: dict, hotels: list[dict]) -> list[str]:
+    # there is no repository method creating hotels, so each backend is seeded its own way
+    if backend == "mongodb":
+        result = await conn["hotels"].insert_many(hotels)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    if backend == "sqlite":
+        return await repositories["hotel"].insert_many(hotels)
+    return conn.get_collection("hotels").insert_many(hotels)
+
+
+class Fixture:
+    """The seeded data the query shapes pick their arguments from."""
+
+    def __init__(self):
+        self.emails: list[str] = []
+        self.user_ids: list[str] = []
+        self.hotels: list[dict] = []
+        self.hotel_ids: list[str] = []
+        self.booking_ids: list[str] = []
+        self.tokens: list[str] = []
+        # next free night per (hotel, room), bookings written during the run never conflict
+        self.next_night: dict[tuple[str, str], int] = {}
+
+
+def _booking(fixture: Fixture, rng: random.Random, user_index: int):
+    from models.booking import Booking
+
+    index = rng.randrange(len(fixture.hotel_ids))
+    hotel_id = fixture.hotel_ids[index]
+    room_id = rng.choice(fixture.hotels[index]["rooms"])["roomId"]
+    night = fixture.next_night.get((hotel_id, room_id), 0)
+    fixture.next_night[(hotel_id, room_id)] = night + 2
+    start = datetime.datetime(2030, 1, 1) + datetime.timedelta(days=night)
+    email = fixture.emails[user_index]
+    return Booking(
+        hotel=hotel_id,
+        **{"from": start, "to": start + datetime.timedelta(days=2)},
+        duration=2,
+        numberOfGuest=1,
+        rooms=[room_id],
+        totalPrice=200.0,
+        clientInfo=_client_info(email),
+        cardInfo=_card_info(),
+        userId=fixture.user_ids[user_index],
+        time=datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
+async def seed(
+    args: argparse.Namespace, backend: str, conn, repositories: dict
+) -> Fixture:
+    from models.refresh_token_in_db import RefreshTokenInDB
+    from models.user import User
+    from util.auth import AuthUtils
+
+    rng = random.Random(args.seed)
+    fixture = Fixture()
+
+    for index in range(args.users):
+        email = f"bench-{index}@example.com"
+        user = User(
+            email=email,
+            role="user",
+            password="$2b$12$" + "x" * 53,
+            clientInfo=_client_info(email),
+        )
+        fixture.emails.append(email)
+        fixture.user_ids.append(str(await repositories["user"].create_user(user)))
+
+    fixture.hotels = [_hotel_document(index, rng) for index in range(args.hotels)]
+    fixture.hotel_ids = await insert_hotels(
+        backend, conn, repositories, [dict(hotel) for hotel in fixture.hotels]
+    )
+
+    for _ in range(args.bookings):
+        booking = _booking(fixture, rng, rng.randrange(args.users))
+        fixture.booking_ids.append(
+            str(await repositories["booking"].create_booking(booking))
+        )
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for index in range(args.users):
+        token = AuthUtils.token_key(f"bench-token-{index}")
+        await repositories["refreshToken"].create_refresh_token(
+            RefreshTokenInDB(
+                userId=fixture.user_ids[index],
+                tokenHash=token,
+                createdAt=now,
+                expiredAt=now + datetime.timedelta(hours=1),
+            )
+        )
+        fixture.tokens.append(token)
+    return fixture
+
+
+def query_shapes(
+    repositories: dict, fixture: Fixture, rng: random.Random
+) -> dict[str, Callable[[], Awaitable]]:
+    from schemas.hotel.request.hotel_search_request import HotelSearchRequest
+    from util.auth import AuthUtils
+
+    users, hotels, bookings = (
+        repositories["user"],
+        repositories["hotel"],
+        repositories["booking"],
+    )
+    tokens = repositories["refreshToken"]
+    rotation = {"count": 0}
+
+    async def find_all_hotels_walk():
+        # first page and the page its cursor points to
+        page = await hotels.find_all(limit=20)
+        if page.next_cursor:
+            await hotels.find_all(limit=20, after=page.next_cursor)
+
+    async def rotate_refresh_token():
+        index = rng.randrange(len(fixture.tokens))
+        rotation["count"] += 1
+        new_token = AuthUtils.token_key(f"bench-token-{index}-{rotation['count']}")
+        expired_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            hours=1
+        )
+        await tokens.rotate(fixture.tokens[index], new_token, expired_at)
+        fixture.tokens[index] = new_token
+
+    async def create_booking():
+        await bookings.create_booking(
+            _booking(fixture, rng, rng.randrange(len(fixture.user_ids)))
+        )
+
+    return {
+        "user.get_by_email": lambda: users.get_by_email(rng.choice(fixture.emails)),
+        "user.exists_by_email": lambda: users.exists_by_email(
+            rng.choice(fixture.emails)
+        ),
+        "user.get_by_id": lambda: users.get_by_id(rng.choice(fixture.user_ids)),
+        "hotel.get_by_id": lambda: hotels.get_by_id(rng.choice(fixture.hotel_ids)),
+        "hotel.get_fields_by_id": lambda: hotels.get_fields_by_id(
+            rng.choice(fixture.hotel_ids), ["rooms"]
+        ),
+        "hotel.find_all": find_all_hotels_walk,
+        "hotel.search.city": lambda: hotels.search(
+            HotelSearchRequest(city="Toronto", isActive=True), limit=20
+        ),
+        "hotel.search.rooms": lambda: hotels.search(
+            HotelSearchRequest(minSleeps=4, maxRate=300, tags=["pool"]), limit=20
+        ),
+        "hotel.get_hotels_by_user_id": lambda: hotels.get_hotels_by_user_id(
+            rng.choice(fixture.user_ids)
+        ),
+        "booking.get_by_id": lambda: bookings.get_by_id(
+            rng.choice(fixture.booking_ids)
+        ),
+        "booking.get_bookings_by_user_id": lambda: bookings.get_bookings_by_user_id(
+            rng.choice(fixture.user_ids), limit=20
+        ),
+        "booking.create_booking": create_booking,
+        "refreshToken.get_by_key": lambda: tokens.get_by_key(
+            rng.choice(fixture.tokens)
+        ),
+        "refreshToken.rotate": rotate_refresh_token,
+    }
+
+
+async def measure(call: Callable[[], Awaitable], iterations: int) -> dict:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "iterations": iterations,
+        "opsPerSecond": round(iterations / total, 1) if total else 0.0,
+        "meanMs": round(total / iterations * 1000, 4),
+        "p50Ms": round(percentile(latencies, 50) * 1000, 4),
+        "p95Ms": round(percentile(latencies, 95) * 1000, 4),
+        "p99Ms": round(percentile(latencies, 99) * 1000, 4),
+    }
+
+
+async def run_backend(args: argparse.Namespace, backend: str) -> dict:
+    db_manager, conn = await open_backend(args, backend)
+    try:
+        repositories = build_repositories(backend, conn)
+        seed_started = time.perf_counter()
+        fixture = await seed(args, backend, conn, repositories)
+        seed_seconds = time.perf_counter() - seed_started
+
+        rng = random.Random(args.seed + 1)
+        shapes = query_shapes(repositories, fixture, rng)
+        results = {}
+        for name, call in shapes.items():
+            if args.only and name not in args.only:
+                continue
+            await measure(call, args.warmup)
+            results[name] = await measure(call, args.iterations)
+        return {"seedSeconds": round(seed_seconds, 3), "queries": results}
+    finally:
+        await db_manager.close()
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--backends",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        default=list(BACKENDS),
+        help="comma separated DB_TYPE values",
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda value: {name.strip() for name in value.split(",") if name.strip()},
+        help="comma separated query shapes to run, all by default",
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--hotels", type=int, default=500)
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", help="DB_URL, a local mongod by default")
+    parser.add_argument("--db-name", default="repository_benchmark")
+    parser.add_argument("--sqlite-path", default="repository_benchmark.db")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from config.logging_config import setup_logging
+
+    log_listener = setup_logging(args.log_level)
+    try:
+        report = {}
+        for backend in args.backends:
+            print(f"benchmarking {backend}...", file=sys.stderr)
+            report[backend] = await run_backend(args, backend)
+        return report
+    finally:
+        log_listener.stop()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Micro-benchmark of building and serializing a findAllHotels page.
+
+Two steps are timed separately for a page of hotels with many rooms each:
+
+- build: stored documents to `Hotel` models, validated as the repositories do, next to
+  `model_construct` for comparison;
+- respond: the `HotelListResponse` to response bytes, through FastAPI's `response_model`
+  handling (dump, validate again, json.dumps) and through `ModelResponse` (one pass in
+  pydantic-core). Both must produce the same bytes.
+
+`*.summary` builds and responds the same page with `view=summary`: the projected documents
+validated and serialized by the partial model of the selected fields.
+
+    python -m benchmarks.serialization_benchmark
+    python -m benchmarks.serialization_benchmark --hotels 100 --rooms 60 --iterations 200
+
+For the same page end to end:
+
+    python -m benchmarks.load_test --mix only:findAllHotels --rooms-per-hotel 40
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+from bson import ObjectId
+
+from benchmarks.load_test import _hotel_document, percentile
+
+
+def _model_construct(model, document: dict):
+    """Recursive model_construct of a stored hotel, the unvalidated alternative."""
+    from models.address import Address
+    from models.hotel import Room
+
+    return model.model_construct(
+        **{
+            **document,
+            "_id": str(document["_id"]),
+            "address": Address.model_construct(**document["address"]),
+            "rooms": [Room.model_construct(**room) for room in document["rooms"]],
+        }
+    )
+
+
+def measure(call: Callable[[], object], iterations: int) -> dict:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "meanMs": round(sum(latencies) / iterations * 1000, 3),
+        "p50Ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95Ms": round(percentile(latencies, 95) * 1000, 3),
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from models.hotel import Hotel
+    from repository.projection import project
+    from schemas.field_selection import FieldView, partial_model, partial_response
+    from schemas.hotel.response.hotel_list_response import HotelListResponse
+    from schemas.hotel.response.hotel_views import HOTEL_VIEWS
+    from util.model_response import ModelResponse
+
+    rng = random.Random(args.seed)
+    documents = [
+        {**_hotel_document(index, rng, args.rooms), "_id": ObjectId()}
+        for index in range(args.hotels)
+    ]
+    hotels = [Hotel(**document) for document in documents]
+    page = HotelListResponse(data=hotels, error=None, next_cursor="cursor")
+
+    summary_fields = HOTEL_VIEWS[FieldView.SUMMARY]
+    summary_model = partial_model(Hotel, summary_fields)
+    summary_documents = [project(document, summary_fields) for document in documents]
+    summary_page = partial_response(HotelListResponse, summary_model)(
+        data=[summary_model(**document) for document in summary_documents],
+        error=None,
+        next_cursor="cursor",
+    )
+
+    response_field = create_model_field(
+        name="Response_find_all_hotels", type_=HotelListResponse, mode="serialization"
+    )
+    loop = asyncio.new_event_loop()
+
+    def fastapi_response() -> bytes:
+        # what the route did before: the model goes through response_model handling
+        content = loop.run_until_complete(
+            serialize_response(
+                field=response_field, response_content=page, is_coroutine=True
+            )
+        )
+        return JSONResponse(content).body
+
+    def model_response() -> bytes:
+        return ModelResponse(page).body
+
+    try:
+        fastapi_body, model_body = fastapi_response(), model_response()
+        if fastapi_body != model_body:
+            raise AssertionError("ModelResponse body differs from the response_model body")
+
+        results = {
+            "build.validate": measure(
+                lambda: [Hotel(**document) for document in documents], args.iterations
+            ),
+            "build.model_construct": measure(
+                lambda: [_model_construct(Hotel, document) for document in documents],
+                args.iterations,
+            ),
+            "respond.response_model": measure(fastapi_response, args.iterations),
+            "respond.model_response": measure(model_response, args.iterations),
+            "build.summary": measure(
+                lambda: [summary_model(**document) for document in summary_documents],
+                args.iterations,
+            ),
+            "respond.summary": measure(
+                lambda: ModelResponse(summary_page).body, args.iterations
+            ),
+        }
+    finally:
+        loop.close()
+
+    return {
+        "hotels": args.hotels,
+        "roomsPerHotel": args.rooms,
+        "bodyBytes": len(model_body),
+        "summaryBodyBytes": len(ModelResponse(summary_page).body),
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hotels", type=int, default=100, help="hotels on the page")
+    parser.add_argument("--rooms", type=int, default=40, help="rooms of every hotel")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    print(json.dumps(run(parse_args(argv)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
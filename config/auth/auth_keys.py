@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Any
+from jwt.algorithms import get_default_algorithms
+from config.auth.auth_settings import AuthSettings
+
+
+@dataclass(frozen=True)
+class AuthKeys:
+    """
+    Signing and verification keys parsed once from the PEM strings in AuthSettings.
+    PyJWT accepts these key objects directly and skips re-parsing the PEM per call.
+    """
+
+    access_token_public_key: Any
+    access_token_private_key: Any
+    refresh_token_public_key: Any
+    refresh_token_private_key: Any
+
+    @classmethod
+    def from_settings(cls, auth_settings: AuthSettings) -> "AuthKeys":
+        try:
+            algorithm = get_default_algorithms()[auth_settings.algorithm]
+        except KeyError:
+            raise ValueError(f"Unsupported token algorithm: {auth_settings.algorithm}")
+
+        return cls(
+            access_token_public_key=algorithm.prepare_key(
+                auth_settings.access_token_public_key
+            ),
+            access_token_private_key=algorithm.prepare_key(
+                auth_settings.access_token_private_key
+            ),
+            refresh_token_public_key=algorithm.prepare_key(
+                auth_settings.refresh_token_public_key
+            ),
+            refresh_token_private_key=algorithm.prepare_key(
+                auth_settings.refresh_token_private_key
+            ),
+        )
@@ -1,10 +1,13 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
 from dotenv import load_dotenv
 import base64
 
 
 class AuthSettings(BaseSettings):
+    # built once in the lifespan and shared by every request, so keep it read-only
+    model_config = SettingsConfigDict(frozen=True)
+
     load_dotenv()
     access_token_public_key: str = base64.b64decode(
         os.environ.get("ACCESS_PUBLIC_KEY", "")
@@ -20,3 +23,29 @@ class AuthSettings(BaseSettings):
     ).decode("utf-8")
     algorithm: str = os.environ.get("ALGORITHM", "RS256")
     access_token_expire_minutes: int = 15
+    # verified access token claims kept in memory by get_current_user
+    token_cache_size: int = int(os.environ.get("TOKEN_CACHE_SIZE", "10000"))
+    token_cache_ttl_seconds: int = int(os.environ.get("TOKEN_CACHE_TTL_SECONDS", "300"))
+    # a refresh token just rotated is still accepted this long, for concurrent or
+    # retried refreshes, without issuing another refresh token
+    refresh_token_reuse_grace_seconds: int = int(
+        os.environ.get("REFRESH_TOKEN_REUSE_GRACE_SECONDS", "10")
+    )
+    # revoked access token jtis mirrored into a Bloom filter per worker, see
+    # TokenRevocations; the filter polls the store every refresh interval
+    revoked_token_refresh_seconds: float = float(
+        os.environ.get("REVOKED_TOKEN_REFRESH_SECONDS", "5")
+    )
+    revoked_token_filter_capacity: int = int(
+        os.environ.get("REVOKED_TOKEN_FILTER_CAPACITY", "100000")
+    )
+    revoked_token_filter_error_rate: float = float(
+        os.environ.get("REVOKED_TOKEN_FILTER_ERROR_RATE", "0.01")
+    )
+    # bcrypt runs on its own thread pool, further calls are rejected with 503
+    password_hash_workers: int = int(
+        os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    password_hash_max_pending: int = int(
+        os.environ.get("PASSWORD_HASH_MAX_PENDING", "64")
+    )
@@ -0,0 +1,90 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+from util.circuit_breaker import CircuitBreaker, CircuitState
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHeartbeat:
+    """
+    Pings the database every `interval_seconds` in the background and keeps the
+    outcome, so requests and health checks read a cached state instead of sending a
+    ping of their own (and waiting out the server selection timeout when it is down).
+    Every result is reported to the circuit breaker, the only thing that closes it:
+    while the circuit is open the database is left alone, once it half-opens it is
+    probed right away.
+    """
+
+    def __init__(
+        self,
+        ping: Callable[[], Awaitable[object]],
+        circuit_breaker: CircuitBreaker,
+        interval_seconds: float,
+        timeout_seconds: float,
+    ):
+        self.ping = ping
+        self.circuit_breaker = circuit_breaker
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        # None until the first heartbeat
+        self.healthy: Optional[bool] = None
+        self.last_checked_at: Optional[datetime.datetime] = None
+        self.last_healthy_at: Optional[datetime.datetime] = None
+        self.last_error: Optional[str] = None
+        self.latency_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def beat(self) -> bool:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.ping(), self.timeout_seconds)
+        except Exception as e:
+            self.last_error = str(e) or type(e).__name__
+            if self.healthy is not False:
+                logger.error(f"Database heartbeat failed: {self.last_error}")
+            self.healthy = False
+            self.circuit_breaker.record_failure()
+        else:
+            if self.healthy is False:
+                logger.info("Database heartbeat recovered.")
+            self.healthy = True
+            self.last_error = None
+            self.last_healthy_at = datetime.datetime.now(datetime.timezone.utc)
+            self.circuit_breaker.record_success()
+        finally:
+            self.latency_ms = (time.perf_counter() - started) * 1000
+            self.last_checked_at = datetime.datetime.now(datetime.timezone.utc)
+        return self.healthy
+
+    def _next_delay(self) -> float:
+        if self.circuit_breaker.state == CircuitState.OPEN:
+            return self.circuit_breaker.retry_after()
+        return self.interval_seconds
+
+    async def _run(self):
+        while True:
+            if self.circuit_breaker.begin_probe():
+                logger.info("Database circuit half-open, probing.")
+            await self.beat()
+            await asyncio.sleep(self._next_delay())
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "lastCheckedAt": self.last_checked_at,
+            "lastHealthyAt": self.last_healthy_at,
+            "lastError": self.last_error,
+            "latencyMs": round(self.latency_ms, 3),
+        }
@@ -1,18 +1,20 @@
 from config.auth.auth_settings import AuthSettings
+from config.database_heartbeat import DatabaseHeartbeat
 from config.settings import Settings
 from enum import Enum
 import asyncio
 import logging
+from typing import Optional
 from fastapi import Depends
+from util.circuit_breaker import CircuitBreaker
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+logger = logging.getLogger(__name__)
 
 
 class DatabaseType(Enum):
     MONGODB = "mongodb"
+    MEMORY = "memory"
+    SQLITE = "sqlite"
     MYSQL = "mysql"
     POSTGRESQL = "postgresql"
 
@@ -30,6 +32,10 @@ class DatabaseManager:
         self.is_initialized = False
         self.initializer = None
         self._initialization_lock = asyncio.Lock()
+        self.circuit_breaker = CircuitBreaker(
+            settings.db_circuit_failure_threshold, settings.db_circuit_reset_seconds
+        )
+        self.heartbeat: Optional[DatabaseHeartbeat] = None
 
     # initialize the database connection, if not initialized, initialize it
     async def initialize(self, settings: Settings):
@@ -38,39 +44,62 @@ class DatabaseManager:
             # Double-check pattern: verify still not initialized
             if not self.is_initialized:
                 try:
-                    from config.mongodb_initializer import MongoDBInitializer
-
                     if self.db_type == DatabaseType.MONGODB:
+                        from config.mongodb_initializer import MongoDBInitializer
+
                         self.initializer = MongoDBInitializer(self.settings)
+                    elif self.db_type == DatabaseType.MEMORY:
+                        from config.memory_initializer import MemoryDBInitializer
+
+                        self.initializer = MemoryDBInitializer(self.settings)
+                    elif self.db_type == DatabaseType.SQLITE:
+                        from config.sqlite_initializer import SQLiteDBInitializer
+
+                        self.initializer = SQLiteDBInitializer(self.settings)
                     else:
                         raise ValueError(
                             f"Database type {self.db_type} is not supported"
                         )
 
-                    logging.info("Initializing database connection...")
+                    logger.info("Initializing database connection...")
                     self.connection = await self.initializer.initialize()
                     self.is_initialized = True
-                    logging.info("Database initialization completed")
+                    self.heartbeat = DatabaseHeartbeat(
+                        self.initializer.ping,
+                        self.circuit_breaker,
+                        self.settings.db_heartbeat_interval_seconds,
+                        self.settings.db_heartbeat_timeout_seconds,
+                    )
+                    logger.info("Database initialization completed")
 
                     return self.connection
                 except Exception as e:
-                    logging.error(f"Failed to initialize database: {e}")
+                    logger.error(f"Failed to initialize database: {e}")
                     raise  # Re-raise for caller to handle()
 
             else:
-                logging.info("Database already initialized, skipping")
+                logger.info("Database already initialized, skipping")
                 return self.connection
 
     # get database connection, if not initialized, raise exception
-    async def get_connection(self):
+    # no I/O here, whether the database is reachable is the heartbeat's job
+    def get_connection(self):
         if not self.is_initialized:
             raise Exception("Database not initialized. Call initialize() first.")
         return self.connection
 
+    def start_heartbeat(self):
+        if self.heartbeat is None:
+            raise Exception("Database not initialized. Call initialize() first.")
+        self.heartbeat.start()
+
     # close database connection
-    def close(self):
+    async def close(self):
+        if self.heartbeat is not None:
+            self.heartbeat.stop()
+            self.heartbeat = None
         if self.initializer:
-            self.initializer.close()
+            await self.initializer.close()
             self.initializer = None
             self.connection = None
             self.is_initialized = False
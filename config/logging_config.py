@@ -0,0 +1,85 @@
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from util.request_context import get_request_context
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the current request id, route and user onto the record in the calling task."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = get_request_context()
+        if ctx is None:
+            record.request_id = None
+            record.route = None
+            record.user = None
+        else:
+            record.request_id = ctx.request_id
+            record.route = ctx.route
+            record.user = ctx.user
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Only merges the message args and renders the traceback before enqueueing.
+    The JSON formatting happens on the listener thread, off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "requestId": getattr(record, "request_id", None),
+            "route": getattr(record, "route", None),
+            "user": getattr(record, "user", None),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        elif record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(level: str = "INFO") -> logging.handlers.QueueListener:
+    """
+    Route every log record through a queue to a background thread that writes JSON lines
+    to stderr. Returns the started listener, the caller stops it on shutdown.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    return listener
@@ -0,0 +1,38 @@
+import logging
+from typing import Optional
+from config.settings import Settings
+from repository.memory.collection_memory import InMemoryDatabase
+from repository.memory.indexes_memory import create_indexes
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryDBInitializer:
+    """
+    Backs the repositories with plain dicts in this process, without any I/O.
+    Data lives as long as the process, so it is meant for local runs and benchmarks.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.database: Optional[InMemoryDatabase] = None
+
+    async def initialize(self) -> InMemoryDatabase:
+        self.database = InMemoryDatabase()
+        create_indexes(self.database)
+        logger.info("In-memory database initialized.")
+        return self.database
+
+    async def get_connection(self) -> Optional[InMemoryDatabase]:
+        if self.database is None:
+            await self.initialize()
+        return self.database
+
+    async def ping(self):
+        if self.database is None:
+            raise Exception("Database not initialized. Call initialize() first.")
+
+    async def close(self):
+        if self.database is not None:
+            self.database = None
+            logger.info("In-memory database discarded.")
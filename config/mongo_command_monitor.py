@@ -0,0 +1,208 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+import bson
+from pymongo import monitoring
+from repository.instrumentation import get_current_repository_call
+
+logger = logging.getLogger(__name__)
+
+# commands issued by the driver itself, not by the repositories
+_IGNORED_COMMANDS = frozenset(
+    {"ping", "hello", "ismaster", "isMaster", "buildInfo", "endSessions", "saslStart", "saslContinue"}
+)
+# where each command keeps the part worth showing in the slow query log
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "aggregate": "pipeline",
+    "findAndModify": "query",
+    "update": "updates",
+    "delete": "deletes",
+}
+_MAX_REDACTED_ITEMS = 5
+
+
+def redact(value: Any) -> Any:
+    """Keep the shape of a filter (field names and operators) and drop every value."""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        redacted = [redact(item) for item in value[:_MAX_REDACTED_ITEMS]]
+        if len(value) > _MAX_REDACTED_ITEMS:
+            redacted.append("...")
+        return redacted
+    return "?"
+
+
+def _document_count(command_name: str, reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        if batch is not None:
+            return len(batch)
+    if command_name == "findAndModify":
+        return 0 if reply.get("value") is None else 1
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+@dataclass(slots=True)
+class _PendingCommand:
+    command_name: str
+    collection: str
+    command: dict
+    origin: Optional[str]
+
+
+@dataclass(slots=True)
+class _CommandStats:
+    count: int = 0
+    failures: int = 0
+    total_micros: int = 0
+    max_micros: int = 0
+    documents: int = 0
+    slow: int = 0
+    slow_reply_bytes: int = 0
+
+    def merge(self, other: "_CommandStats"):
+        self.count += other.count
+        self.failures += other.failures
+        self.total_micros += other.total_micros
+        self.max_micros = max(self.max_micros, other.max_micros)
+        self.documents += other.documents
+        self.slow += other.slow
+        self.slow_reply_bytes += other.slow_reply_bytes
+
+
+class MongoCommandMonitor(monitoring.CommandListener):
+    """
+    Records duration and returned documents of every command, aggregated per
+    collection and command in one-minute buckets, and logs commands slower than the
+    threshold with their reply size, redacted filter and originating repository method.
+    Only slow replies are measured: encoding a reply again costs as much as decoding it.
+
+    The driver calls the listener from Motor's executor threads, so the aggregates
+    are guarded by a lock.
+    """
+
+    def __init__(self, slow_query_ms: int, window_minutes: int):
+        self.slow_query_micros = slow_query_ms * 1000
+        self.window_minutes = window_minutes
+        self._pending: dict[tuple, _PendingCommand] = {}
+        # minute -> (collection, command name) -> stats
+        self._buckets: dict[int, dict[tuple[str, str], _CommandStats]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        command = event.command
+        collection = command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = command.get("collection")
+        self._pending[(event.request_id, event.connection_id)] = _PendingCommand(
+            event.command_name,
+            collection if isinstance(collection, str) else event.database_name,
+            command,
+            get_current_repository_call(),
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        pending = self._pending.pop((event.request_id, event.connection_id), None)
+        if pending is None:
+            return
+        reply = event.reply
+        self._record(
+            pending,
+            event.duration_micros,
+            documents=_document_count(pending.command_name, reply),
+            reply=reply,
+            failed=False,
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        pending = self._pending.pop((event.request_id, event.connection_id), None)
+        if pending is None:
+            return
+        self._record(pending, event.duration_micros, documents=0, reply=None, failed=True)
+
+    def _record(
+        self,
+        pending: _PendingCommand,
+        duration_micros: int,
+        documents: int,
+        reply: Optional[dict],
+        failed: bool,
+    ):
+        is_slow = duration_micros >= self.slow_query_micros
+        reply_bytes = len(bson.encode(reply)) if is_slow and reply is not None else 0
+        minute = int(time.time() // 60)
+        key = (pending.collection, pending.command_name)
+        with self._lock:
+            bucket = self._buckets.get(minute)
+            if bucket is None:
+                bucket = self._buckets[minute] = {}
+                self._prune(minute)
+            stats = bucket.get(key)
+            if stats is None:
+                stats = bucket[key] = _CommandStats()
+            stats.count += 1
+            stats.failures += failed
+            stats.total_micros += duration_micros
+            stats.max_micros = max(stats.max_micros, duration_micros)
+            stats.documents += documents
+            stats.slow += is_slow
+            stats.slow_reply_bytes += reply_bytes
+
+        if is_slow:
+            filter_field = _FILTER_FIELDS.get(pending.command_name)
+            redacted = (
+                redact(pending.command.get(filter_field)) if filter_field else None
+            )
+            logger.warning(
+                f"Slow MongoDB command: {pending.command_name} on {pending.collection} "
+                f"took {duration_micros / 1000:.1f}ms, documents: {documents}, "
+                f"reply bytes: {reply_bytes}, filter: {redacted}, origin: {pending.origin}"
+            )
+
+    def _prune(self, current_minute: int):
+        oldest = current_minute - self.window_minutes + 1
+        for minute in [m for m in self._buckets if m < oldest]:
+            del self._buckets[minute]
+
+    def stats(self) -> dict:
+        """Per-collection aggregates over the rolling window, slowest total time first."""
+        oldest = int(time.time() // 60) - self.window_minutes + 1
+        totals: dict[tuple[str, str], _CommandStats] = {}
+        with self._lock:
+            for minute, bucket in self._buckets.items():
+                if minute < oldest:
+                    continue
+                for key, stats in bucket.items():
+                    totals.setdefault(key, _CommandStats()).merge(stats)
+
+        commands = [
+            {
+                "collection": collection,
+                "command": command_name,
+                "count": stats.count,
+                "failures": stats.failures,
+                "totalMs": stats.total_micros / 1000,
+                "avgMs": stats.total_micros / stats.count / 1000,
+                "maxMs": stats.max_micros / 1000,
+                "documents": stats.documents,
+                "slow": stats.slow,
+                "slowReplyBytes": stats.slow_reply_bytes,
+            }
+            for (collection, command_name), stats in totals.items()
+        ]
+        commands.sort(key=lambda item: item["totalMs"], reverse=True)
+        return {
+            "windowMinutes": self.window_minutes,
+            "slowQueryMs": self.slow_query_micros / 1000,
+            "commands": commands,
+        }
@@ -0,0 +1,116 @@
+import logging
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
+from config.mongo_indexes import IndexSpec, QueryShape
+
+logger = logging.getLogger(__name__)
+
+
+class MongoIndexManager:
+    """
+    Applies the declarative index registry idempotently, reports drift between the
+    registry and the database, logs index sizes and optionally explains the known
+    query shapes to flag collection scans.
+    """
+
+    def __init__(
+        self, database: AsyncIOMotorDatabase, indexes: dict[str, list[IndexSpec]]
+    ):
+        self.database = database
+        self.indexes = indexes
+
+    async def apply(self):
+        for collection_name, specs in self.indexes.items():
+            collection = self.database[collection_name]
+            for spec in specs:
+                try:
+                    # creating an index that already exists with the same spec is a no-op
+                    await collection.create_indexes([spec.to_index_model()])
+                except OperationFailure as e:
+                    # e.g. same name with different keys/options, or duplicates for a unique index
+                    message = f"Failed to create index {spec.name} on {collection_name}: {e}"
+                    if spec.required:
+                        logger.error(message)
+                        raise
+                    logger.warning(message)
+
+    async def detect_drift(self) -> dict[str, dict[str, list[str]]]:
+        """Names of registry indexes missing from the database and of unknown extra ones."""
+        drift = {}
+        for collection_name, specs in self.indexes.items():
+            existing = await self.database[collection_name].index_information()
+            expected = {spec.name: spec for spec in specs}
+
+            missing = [name for name in expected if name not in existing]
+            extra = [name for name in existing if name != "_id_" and name not in expected]
+            changed = [
+                name
+                for name, spec in expected.items()
+                if name in existing
+                and self._normalize_keys(existing[name]["key"])
+                != self._normalize_keys(spec.keys)
+            ]
+            if missing or extra or changed:
+                drift[collection_name] = {
+                    "missing": missing,
+                    "extra": extra,
+                    "changed": changed,
+                }
+        return drift
+
+    async def log_report(self):
+        drift = await self.detect_drift()
+        for collection_name, report in drift.items():
+            logger.warning(f"Index drift on {collection_name}: {report}")
+
+        for collection_name in self.indexes:
+            try:
+                stats = await self.database.command("collStats", collection_name)
+                sizes = ", ".join(
+                    f"{name} ({size / 1024:.1f} KB)"
+                    for name, size in stats.get("indexSizes", {}).items()
+                )
+                logger.info(f"Indexes on {collection_name}: {sizes}")
+            except Exception as e:
+                logger.info(f"Could not read index sizes of {collection_name}: {e}")
+
+    async def explain_query_shapes(self, query_shapes: list[QueryShape]) -> list[QueryShape]:
+        """Explain each query shape and return the ones whose winning plan still scans the collection."""
+        collection_scans = []
+        for shape in query_shapes:
+            command = {"find": shape.collection, "filter": shape.filter}
+            if shape.sort:
+                command["sort"] = shape.sort
+            try:
+                explain = await self.database.command(
+                    {"explain": command, "verbosity": "queryPlanner"}
+                )
+            except Exception as e:
+                logger.info(f"Could not explain {shape.description}: {e}")
+                continue
+
+            winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+            if self._has_stage(winning_plan, "COLLSCAN"):
+                collection_scans.append(shape)
+                logger.warning(
+                    f"Query {shape.description} on {shape.collection} does a COLLSCAN: {shape.filter}"
+                )
+        return collection_scans
+
+    @staticmethod
+    def _normalize_keys(keys) -> list[tuple]:
+        # the server may report directions as floats (1.0) for indexes built by the shell
+        return [
+            (name, int(direction) if isinstance(direction, float) else direction)
+            for name, direction in keys
+        ]
+
+    @classmethod
+    def _has_stage(cls, plan, stage: str) -> bool:
+        if isinstance(plan, dict):
+            if plan.get("stage") == stage:
+                return True
+            return any(cls._has_stage(value, stage) for value in plan.values())
+        if isinstance(plan, list):
+            return any(cls._has_stage(value, stage) for value in plan)
+        return False
@@ -0,0 +1,153 @@
+import datetime
+from dataclasses import dataclass, field
+from typing import Optional
+from bson import ObjectId
+from pymongo import IndexModel
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    keys: list[tuple[str, int]]
+    unique: bool = False
+    expire_after_seconds: Optional[int] = None
+    partial_filter: Optional[dict] = None
+    # the application is not correct without it, so failing to build it stops startup
+    required: bool = False
+
+    def to_index_model(self) -> IndexModel:
+        options = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        if self.partial_filter is not None:
+            options["partialFilterExpression"] = self.partial_filter
+        return IndexModel(self.keys, **options)
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A query a repository runs, explained at startup to catch collection scans."""
+
+    collection: str
+    filter: dict
+    sort: Optional[dict] = None
+    description: str = field(default="", compare=False)
+
+
+# every index the repositories rely on, per collection
+INDEXES: dict[str, list[IndexSpec]] = {
+    "users": [
+        # login, register and update all look users up by email
+        IndexSpec("email_unique_index", [("email", 1)], unique=True),
+    ],
+    "hotels": [
+        # equality fields first, _id last so the keyset pagination sort uses the index
+        IndexSpec(
+            "city_active_search_index",
+            [("address.city", 1), ("isActive", 1), ("_id", 1)],
+        ),
+        IndexSpec(
+            "province_active_search_index",
+            [("address.province", 1), ("isActive", 1), ("_id", 1)],
+        ),
+        IndexSpec("tags_search_index", [("tags", 1), ("_id", 1)]),
+        IndexSpec(
+            "room_capacity_rate_search_index",
+            [("rooms.sleepsCount", 1), ("rooms.baseRate", 1)],
+        ),
+    ],
+    "bookings": [
+        # guest bookings carry an empty userId and are never looked up by user
+        IndexSpec(
+            "user_bookings_index",
+            [("userId", 1), ("_id", 1)],
+            partial_filter={"userId": {"$gt": ""}},
+        ),
+        IndexSpec("hotel_dates_index", [("hotel", 1), ("from", 1), ("to", 1)]),
+    ],
+    "roomNights": [
+        # the unique index is what prevents double bookings
+        IndexSpec(
+            "room_night_unique_index",
+            [("hotel", 1), ("roomId", 1), ("night", 1)],
+            unique=True,
+            required=True,
+        ),
+        IndexSpec("room_night_booking_index", [("bookingId", 1)]),
+    ],
+    "refreshTokens": [
+        # refresh, rotation and logout all look tokens up by the hash of their jti;
+        # tokens stored before had no hash and must not collide on null
+        IndexSpec(
+            "token_hash_unique_index",
+            [("tokenHash", 1)],
+            unique=True,
+            partial_filter={"tokenHash": {"$exists": True}},
+        ),
+        # only rotated tokens carry the previous hash, the grace window looks it up
+        IndexSpec(
+            "previous_token_hash_index",
+            [("previousTokenHash", 1)],
+            partial_filter={"previousTokenHash": {"$exists": True}},
+        ),
+        IndexSpec(
+            "expiredAt_expire_index", [("expiredAt", 1)], expire_after_seconds=60
+        ),
+    ],
+    "revokedTokens": [
+        # the exact check behind a Bloom filter hit
+        IndexSpec("jti_unique_index", [("jti", 1)], unique=True),
+        # every worker polls the revocations made since its last refresh
+        IndexSpec("revokedAt_index", [("revokedAt", 1)]),
+        IndexSpec(
+            "expiredAt_expire_index", [("expiredAt", 1)], expire_after_seconds=0
+        ),
+    ],
+}
+
+QUERY_SHAPES: list[QueryShape] = [
+    QueryShape("users", {"email": "user@example.com"}, description="get_by_email"),
+    QueryShape(
+        "hotels",
+        {"address.city": "Toronto", "isActive": True},
+        {"_id": 1},
+        description="search by city",
+    ),
+    QueryShape(
+        "hotels",
+        {"tags": {"$all": ["pool"]}},
+        {"_id": 1},
+        description="search by tags",
+    ),
+    QueryShape(
+        "bookings",
+        {"userId": "000000000000000000000000"},
+        {"_id": 1},
+        description="get_bookings_by_user_id",
+    ),
+    QueryShape(
+        "bookings",
+        {"hotel": "000000000000000000000000"},
+        {"_id": 1},
+        description="stream_bookings by hotel",
+    ),
+    QueryShape(
+        "roomNights",
+        {"bookingId": ObjectId("000000000000000000000000")},
+        description="release room nights",
+    ),
+    QueryShape("refreshTokens", {"tokenHash": "0" * 32}, description="get_by_key"),
+    QueryShape(
+        "refreshTokens",
+        {"previousTokenHash": "0" * 32},
+        description="get_by_previous_key",
+    ),
+    QueryShape("revokedTokens", {"jti": "0" * 32}, description="is_revoked"),
+    QueryShape(
+        "revokedTokens",
+        {"revokedAt": {"$gte": datetime.datetime(2000, 1, 1)}},
+        description="find_revoked_since",
+    ),
+]
@@ -1,4 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from config.mongo_command_monitor import MongoCommandMonitor
+from config.mongo_index_manager import MongoIndexManager
+from config.mongo_indexes import INDEXES, QUERY_SHAPES
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 import logging
@@ -6,19 +9,26 @@ from config.settings import Settings
 from typing import Optional
 from config.auth.auth_settings import AuthSettings
 
+logger = logging.getLogger(__name__)
+
 
 class MongoDBInitializer:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.database = None
         self.client = None
+        self.command_monitor = MongoCommandMonitor(
+            settings.db_slow_query_ms, settings.db_command_stats_window_minutes
+        )
 
     # method for start the MongoDb Connection
     async def initialize(self):
         try:
             # Set MongoDB client
             self.client = AsyncIOMotorClient(
-                self.settings.db_url, serverSelectionTimeoutMS=10000
+                self.settings.db_url,
+                serverSelectionTimeoutMS=10000,
+                event_listeners=[self.command_monitor],
             )
             self.database = self.client.get_database(self.settings.db_name)
             ping_response = await self.database.command("ping")
@@ -27,58 +37,44 @@ class MongoDBInitializer:
             if int(ping_response["ok"]) != 1:
                 raise Exception("Problem connecting to database cluster.")
             else:
-                logging.info("Connected to database cluster.")
+                logger.info("Connected to database cluster.")
 
-            await self.create_expired_index(
-                collection_name="refreshTokens", field_name="expiredAt"
-            )
+            await self.create_indexes()
 
             return self.database
         except Exception as e:
-            logging.info(f"Failed to connect to MongoDB: {e}")
+            logger.info(f"Failed to connect to MongoDB: {e}")
             if self.client:
                 self.client.close()
             raise
 
-    async def create_expired_index(self, collection_name: str, field_name: str):
-        try:
-            if self.database is None:
-                raise Exception("Database not initialized. Call initialize() first.")
-
-            collection = self.database[collection_name]
-            index_name = f"{field_name}_expire_index"
+    async def create_indexes(self):
+        if self.database is None:
+            raise Exception("Database not initialized. Call initialize() first.")
 
-            # the index creation is an idempotent operation in MongoDB, so it can be called multiple times without error
-            await collection.create_index(
-                keys=[(field_name, 1)],
-                name=index_name,
-                expireAfterSeconds=60,  # 60 seconds
-                background=True,  # Create index in the background
-            )
-            logging.info(
-                f"Created index {index_name} on {collection_name} for field {field_name} with expiration of 60 seconds."
-            )
-        except Exception as e:
-            logging.info(
-                f"Failed to create TTL index on {collection_name}.{field_name} in MongoDB: {e}"
-            )
+        index_manager = MongoIndexManager(self.database, INDEXES)
+        await index_manager.apply()
+        await index_manager.log_report()
+        if self.settings.db_explain_queries:
+            await index_manager.explain_query_shapes(QUERY_SHAPES)
 
     async def get_connection(self) -> Optional[AsyncIOMotorDatabase]:
         if self.database is None:
             await self.initialize()
+        # liveness is checked by the heartbeat, not on every call
+        return self.database
 
-        # Validate connection is still alive
-        try:
-            await self.database.command("ping")
-            return self.database
-        except Exception as e:
-            logging.error(f"Database connection lost: {e}")
-            raise
+    async def ping(self):
+        if self.database is None:
+            raise Exception("Database not initialized. Call initialize() first.")
+        ping_response = await self.database.command("ping")
+        if int(ping_response["ok"]) != 1:
+            raise Exception("Problem connecting to database cluster.")
 
     # method to close the database connection
-    def close(self):
+    async def close(self):
         if self.client:
             self.client.close()
             self.database = None
             self.client = None
-            logging.info("Mongo connection closed.")
+            logger.info("Mongo connection closed.")
@@ -1,14 +1,53 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
 from dotenv import load_dotenv
 
 
 class Settings(BaseSettings):
+    # built once in the lifespan and shared by every request, so keep it read-only
+    model_config = SettingsConfigDict(frozen=True)
+
     load_dotenv()
     app_name: str = "FastAPI MongoDB Backend"
     db_type: str = os.environ.get("DB_TYPE", "mongodb")
     db_name: str = os.environ.get("DB_NAME", "fastapi_db")
     db_url: str = os.environ.get("DB_URL", "mongodb://localhost:27017")
+    # DB_TYPE=sqlite: database file and number of pooled connections
+    sqlite_path: str = os.environ.get("SQLITE_PATH", "fastapi.db")
+    sqlite_pool_size: int = int(os.environ.get("SQLITE_POOL_SIZE", "4"))
+    # explain the known repository queries at startup and warn about collection scans
+    db_explain_queries: bool = (
+        os.environ.get("DB_EXPLAIN_QUERIES", "false").lower() == "true"
+    )
+    # MongoDB commands slower than this are logged with their redacted filter
+    db_slow_query_ms: int = int(os.environ.get("DB_SLOW_QUERY_MS", "100"))
+    # rolling window of the per-collection command stats, in minutes
+    db_command_stats_window_minutes: int = int(
+        os.environ.get("DB_COMMAND_STATS_WINDOW_MINUTES", "15")
+    )
+    # the database is pinged in the background, requests only read the outcome
+    db_heartbeat_interval_seconds: float = float(
+        os.environ.get("DB_HEARTBEAT_INTERVAL_SECONDS", "5")
+    )
+    db_heartbeat_timeout_seconds: float = float(
+        os.environ.get("DB_HEARTBEAT_TIMEOUT_SECONDS", "2")
+    )
+    # failed heartbeats in a row before requests are rejected with 503, and how long
+    # until one trial request is let through again
+    db_circuit_failure_threshold: int = int(
+        os.environ.get("DB_CIRCUIT_FAILURE_THRESHOLD", "2")
+    )
+    db_circuit_reset_seconds: float = float(
+        os.environ.get("DB_CIRCUIT_RESET_SECONDS", "10")
+    )
+    # validated hotels kept in memory in front of the hotel repository
+    hotel_cache_size: int = int(os.environ.get("HOTEL_CACHE_SIZE", "1000"))
+    hotel_cache_ttl_seconds: int = int(os.environ.get("HOTEL_CACHE_TTL_SECONDS", "60"))
+    # how often the findAllHotels snapshot checks for updates made by other workers
+    catalog_snapshot_refresh_seconds: float = float(
+        os.environ.get("CATALOG_SNAPSHOT_REFRESH_SECONDS", "10")
+    )
+    log_level: str = os.environ.get("LOG_LEVEL", "INFO")
     cors_origins: list[str] = os.environ.get(
         "CORS_ORIGINS", "http://localhost:8000"
     ).split(",")
@@ -0,0 +1,48 @@
+import logging
+from typing import Optional
+from config.settings import Settings
+from repository.sql.pool_sqlite import SQLitePool
+from repository.sql.schema_sqlite import create_schema
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteDBInitializer:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.pool: Optional[SQLitePool] = None
+
+    async def initialize(self) -> SQLitePool:
+        pool = SQLitePool(self.settings.sqlite_path, self.settings.sqlite_pool_size)
+        try:
+            await pool.open()
+            async with pool.connection() as connection:
+                await create_schema(connection)
+        except Exception as e:
+            logger.error(f"Failed to open SQLite database: {e}")
+            await pool.close()
+            raise
+
+        self.pool = pool
+        logger.info(
+            f"SQLite database {self.settings.sqlite_path} opened with {pool.size} connections."
+        )
+        return pool
+
+    async def get_connection(self) -> Optional[SQLitePool]:
+        if self.pool is None:
+            await self.initialize()
+        return self.pool
+
+    async def ping(self):
+        if self.pool is None:
+            raise Exception("Database not initialized. Call initialize() first.")
+        async with self.pool.connection() as connection:
+            async with connection.execute("SELECT 1") as cursor:
+                await cursor.fetchone()
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            logger.info("SQLite database closed.")
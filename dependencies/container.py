@@ -0,0 +1,203 @@
+from config.auth.auth_keys import AuthKeys
+from config.auth.auth_settings import AuthSettings
+from config.database_manager import DatabaseManager, DatabaseType
+from config.settings import Settings
+from repository.booking_repository import IBookingRepository
+from repository.cache.hotel_repository_cache import CachedHotelRepository
+from repository.hotel_repository import IHotelRepository
+from repository.instrumentation import instrument_repository
+from repository.refresh_token_repository import IRefreshTokenRepository
+from repository.revoked_token_repository import IRevokedTokenRepository
+from repository.user_repository import IUserRepository
+from service.booking_service import BookingService
+from service.catalog_snapshot import CatalogSnapshot
+from service.hotel_service import HotelService
+from service.occupancy_index import OccupancyIndex
+from service.token_revocations import TokenRevocations
+from service.user_service import UserService
+from util.password_hasher import PasswordHasher
+from util.token_cache import VerifiedTokenCache
+
+
+class AppContainer:
+    """
+    Application-scoped objects built once in the lifespan and kept on app.state.
+    Settings, parsed keys, repositories and services are stateless between requests,
+    so the dependency providers only hand out these instances.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        auth_settings: AuthSettings,
+        user_repository: IUserRepository,
+        hotel_repository: IHotelRepository,
+        booking_repository: IBookingRepository,
+        refresh_token_repository: IRefreshTokenRepository,
+        revoked_token_repository: IRevokedTokenRepository,
+    ):
+        self.settings = settings
+        self.auth_settings = auth_settings
+        self.auth_keys = AuthKeys.from_settings(auth_settings)
+        self.access_token_cache = VerifiedTokenCache(
+            auth_settings.token_cache_size, auth_settings.token_cache_ttl_seconds
+        )
+        self.password_hasher = PasswordHasher(
+            auth_settings.password_hash_workers, auth_settings.password_hash_max_pending
+        )
+
+        # latency of the backend itself, the hotel cache sits in front of it
+        user_repository = instrument_repository(user_repository, IUserRepository, "user")
+        hotel_repository = instrument_repository(
+            hotel_repository, IHotelRepository, "hotel"
+        )
+        booking_repository = instrument_repository(
+            booking_repository, IBookingRepository, "booking"
+        )
+        refresh_token_repository = instrument_repository(
+            refresh_token_repository, IRefreshTokenRepository, "refresh_token"
+        )
+        revoked_token_repository = instrument_repository(
+            revoked_token_repository, IRevokedTokenRepository, "revoked_token"
+        )
+
+        self.user_repository = user_repository
+        self.hotel_repository = CachedHotelRepository(
+            hotel_repository, settings.hotel_cache_size, settings.hotel_cache_ttl_seconds
+        )
+        self.booking_repository = booking_repository
+        self.refresh_token_repository = refresh_token_repository
+
+        # every entry is expired one access token lifetime after it was added
+        self.token_revocations = TokenRevocations(
+            revoked_token_repository,
+            auth_settings.revoked_token_refresh_seconds,
+            auth_settings.access_token_expire_minutes * 60,
+            auth_settings.revoked_token_filter_capacity,
+            auth_settings.revoked_token_filter_error_rate,
+        )
+
+        self.user_service = UserService(
+            auth_settings,
+            self.auth_keys,
+            user_repository,
+            refresh_token_repository,
+            self.password_hasher,
+            self.token_revocations,
+        )
+
+        # shared by the hotel service (queries) and the booking service (updates)
+        self.occupancy_index = OccupancyIndex()
+
+        # built from the backend, the cache would only delay the version checks
+        self.catalog_snapshot = CatalogSnapshot(
+            hotel_repository, settings.catalog_snapshot_refresh_seconds
+        )
+
+        self.hotel_service = HotelService(
+            self.hotel_repository, self.occupancy_index, self.catalog_snapshot
+        )
+        self.booking_service = BookingService(
+            booking_repository,
+            self.hotel_repository,
+            user_repository,
+            self.occupancy_index,
+        )
+
+    def close(self):
+        self.catalog_snapshot.stop()
+        self.token_revocations.stop()
+        self.password_hasher.shutdown()
+
+    @classmethod
+    async def create(
+        cls,
+        settings: Settings,
+        auth_settings: AuthSettings,
+        db_manager: DatabaseManager,
+    ) -> "AppContainer":
+        conn = db_manager.get_connection()
+
+        if db_manager.initializer is None or conn is None:
+            raise Exception("Database not initialized.")
+
+        if db_manager.db_type == DatabaseType.MONGODB:
+            from repository.mongo.booking_repository_mongodb import (
+                BookingRepositoryMongoDB,
+            )
+            from repository.mongo.hotel_repository_mongodb import (
+                HotelRepositoryMongoDB,
+            )
+            from repository.mongo.refresh_token_repository_mongodb import (
+                RefreshTokenRepositoryMongoDB,
+            )
+            from repository.mongo.revoked_token_repository_mongodb import (
+                RevokedTokenRepositoryMongoDB,
+            )
+            from repository.mongo.user_repository_mongodb import UserRepositoryMongoDB
+
+            container = cls(
+                settings=settings,
+                auth_settings=auth_settings,
+                user_repository=UserRepositoryMongoDB(conn),
+                hotel_repository=HotelRepositoryMongoDB(conn),
+                booking_repository=BookingRepositoryMongoDB(conn),
+                refresh_token_repository=RefreshTokenRepositoryMongoDB(conn),
+                revoked_token_repository=RevokedTokenRepositoryMongoDB(conn),
+            )
+            await container.booking_repository.backfill_room_night_claims()
+        elif db_manager.db_type == DatabaseType.MEMORY:
+            from repository.memory.booking_repository_memory import (
+                BookingRepositoryMemory,
+            )
+            from repository.memory.hotel_repository_memory import (
+                HotelRepositoryMemory,
+            )
+            from repository.memory.refresh_token_repository_memory import (
+                RefreshTokenRepositoryMemory,
+            )
+            from repository.memory.revoked_token_repository_memory import (
+                RevokedTokenRepositoryMemory,
+            )
+            from repository.memory.user_repository_memory import UserRepositoryMemory
+
+            container = cls(
+                settings=settings,
+                auth_settings=auth_settings,
+                user_repository=UserRepositoryMemory(conn),
+                hotel_repository=HotelRepositoryMemory(conn),
+                booking_repository=BookingRepositoryMemory(conn),
+                refresh_token_repository=RefreshTokenRepositoryMemory(conn),
+                revoked_token_repository=RevokedTokenRepositoryMemory(conn),
+            )
+        elif db_manager.db_type == DatabaseType.SQLITE:
+            from repository.sql.booking_repository_sqlite import (
+                BookingRepositorySQLite,
+            )
+            from repository.sql.hotel_repository_sqlite import HotelRepositorySQLite
+            from repository.sql.refresh_token_repository_sqlite import (
+                RefreshTokenRepositorySQLite,
+            )
+            from repository.sql.revoked_token_repository_sqlite import (
+                RevokedTokenRepositorySQLite,
+            )
+            from repository.sql.user_repository_sqlite import UserRepositorySQLite
+
+            container = cls(
+                settings=settings,
+                auth_settings=auth_settings,
+                user_repository=UserRepositorySQLite(conn),
+                hotel_repository=HotelRepositorySQLite(conn),
+                booking_repository=BookingRepositorySQLite(conn),
+                refresh_token_repository=RefreshTokenRepositorySQLite(conn),
+                revoked_token_repository=RevokedTokenRepositorySQLite(conn),
+            )
+        else:
+            raise ValueError(
+                f"Database type {db_manager.db_type} is not supported for repositories."
+            )
+
+        await container.occupancy_index.load(container.booking_repository)
+        await container.catalog_snapshot.start()
+        await container.token_revocations.start()
+        return container
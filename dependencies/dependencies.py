@@ -5,146 +5,131 @@ from config.database_manager import DatabaseManager
 from config.settings import Settings
 from typing import Annotated
 from fastapi import Depends, Header, Request
-from config.database_manager import DatabaseType
+from dependencies.container import AppContainer
 from exceptions.custom_exception import TokenNotFoundError
 from repository.booking_repository import IBookingRepository
 from repository.hotel_repository import IHotelRepository
 from repository.user_repository import IUserRepository
 from service.booking_service import BookingService
+from service.catalog_snapshot import CatalogSnapshot
 from service.hotel_service import HotelService
 from service.user_service import UserService
 from config.auth.auth_settings import AuthSettings
 from repository.refresh_token_repository import IRefreshTokenRepository
 from util.auth import AuthUtils
+from util.request_context import get_request_context
 
+logger = logging.getLogger(__name__)
 
-def get_settings() -> Settings:
-    return Settings()
+# The providers below are async on purpose: they only read attributes of the
+# container, and FastAPI would otherwise dispatch each sync provider to the
+# threadpool on every request.
 
 
-def get_auth_settings():
-    return AuthSettings()
+async def get_container(request: Request) -> AppContainer:
+    return request.app.state.container
 
 
-def get_db_manager(request: Request) -> DatabaseManager:
+async def get_settings(
+    container: Annotated[AppContainer, Depends(get_container)],
+) -> Settings:
+    return container.settings
+
+
+async def get_auth_settings(
+    container: Annotated[AppContainer, Depends(get_container)],
+) -> AuthSettings:
+    return container.auth_settings
+
+
+async def get_db_manager(request: Request) -> DatabaseManager:
     return request.app.state.db_manager
 
 
-def get_current_user(
-    auth_settings: Annotated[AuthSettings, Depends(get_auth_settings)],
+async def get_current_user(
+    container: Annotated[AppContainer, Depends(get_container)],
     authorization: str = Header(None, alias="Authorization"),
-):
+) -> dict:
     """
     Dependency to get the current user from the request's authorization header.
-    This is a placeholder function and should be replaced with actual user retrieval logic.
+    Claims of tokens verified before are served from the access token cache,
+    so repeated calls with the same token skip the RSA signature check.
+    Revocation is checked on every call, a Bloom filter miss in the common case.
     """
     try:
         if not authorization:
             raise TokenNotFoundError("Access denied, no access token provided")
         token = authorization.split(" ")[-1]
 
-        AuthUtils.verify_token(token, auth_settings.access_token_public_key)
+        claims = container.access_token_cache.get(token)
+        if claims is None:
+            claims = AuthUtils.verify_token(
+                token,
+                container.auth_keys.access_token_public_key,
+                [container.auth_settings.algorithm],
+            )
+            container.access_token_cache.put(token, claims)
+
+        # tokens issued before they carried a jti cannot be revoked
+        jti = claims.get("jti")
+        if jti and await container.token_revocations.is_revoked(jti):
+            raise jwt.InvalidTokenError("Token has been revoked")
+
+        ctx = get_request_context()
+        if ctx is not None:
+            ctx.user = claims.get("email")
+        return claims
     except (TokenNotFoundError, jwt.InvalidTokenError) as e:
-        logging.error(f"Token validation error: {str(e)}")
+        logger.warning(f"Token validation error: {str(e)}")
         raise e
     except Exception as e:
-        logging.error(f"Authentication error: {str(e)}")
+        logger.error(f"Authentication error: {str(e)}")
         raise e
 
 
 async def get_refresh_token_repository(
-    db: Annotated[DatabaseManager, Depends(get_db_manager)],
+    container: Annotated[AppContainer, Depends(get_container)],
 ) -> IRefreshTokenRepository:
-    conn = await db.get_connection()
-
-    if db.initializer is None or conn is None:
-        raise Exception("Database not initialized.")
-
-    if db.db_type == DatabaseType.MONGODB:
-        from repository.mongo.refresh_token_repository_mongodb import (
-            RefreshTokenRepositoryMongoDB,
-        )
-
-        return RefreshTokenRepositoryMongoDB(conn)
-    else:
-        raise ValueError(
-            f"Database type {db.db_type} is not supported for hotel repository."
-        )
+    return container.refresh_token_repository
 
 
 async def get_user_repository(
-    db: Annotated[DatabaseManager, Depends(get_db_manager)],
+    container: Annotated[AppContainer, Depends(get_container)],
 ) -> IUserRepository:
-    conn = await db.get_connection()
-
-    if db.initializer is None or conn is None:
-        raise Exception("Database not initialized.")
+    return container.user_repository
 
-    if db.db_type == DatabaseType.MONGODB:
-        from repository.mongo.user_repository_mongodb import UserRepositoryMongoDB
 
-        return UserRepositoryMongoDB(conn)
-    else:
-        raise ValueError(
-            f"Database type {db.db_type} is not supported for user repository."
-        )
-
-
-def get_user_service(
-    auth_settings: Annotated[AuthSettings, Depends(get_auth_settings)],
-    user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
-    refresh_token_repository: Annotated[
-        IRefreshTokenRepository, Depends(get_refresh_token_repository)
-    ],
+async def get_user_service(
+    container: Annotated[AppContainer, Depends(get_container)],
 ) -> UserService:
-    return UserService(auth_settings, user_repository, refresh_token_repository)
+    return container.user_service
 
 
 async def get_hotel_repository(
-    db: Annotated[DatabaseManager, Depends(get_db_manager)],
+    container: Annotated[AppContainer, Depends(get_container)],
 ) -> IHotelRepository:
-    conn = await db.get_connection()
+    return container.hotel_repository
 
-    if db.initializer is None or conn is None:
-        raise Exception("Database not initialized.")
 
-    if db.db_type == DatabaseType.MONGODB:
-        from repository.mongo.hotel_repository_mongodb import HotelRepositoryMongoDB
-
-        return HotelRepositoryMongoDB(conn)
-    else:
-        raise ValueError(
-            f"Database type {db.db_type} is not supported for hotel repository."
-        )
+async def get_hotel_service(
+    container: Annotated[AppContainer, Depends(get_container)],
+) -> HotelService:
+    return container.hotel_service
 
 
-def get_hotel_service(
-    hotel_repository: Annotated[IHotelRepository, Depends(get_hotel_repository)],
-) -> HotelService:
-    return HotelService(hotel_repository)
+async def get_catalog_snapshot(
+    container: Annotated[AppContainer, Depends(get_container)],
+) -> CatalogSnapshot:
+    return container.catalog_snapshot
 
 
 async def get_booking_repository(
-    db: Annotated[DatabaseManager, Depends(get_db_manager)],
+    container: Annotated[AppContainer, Depends(get_container)],
 ) -> IBookingRepository:
-    conn = await db.get_connection()
-
-    if db.initializer is None or conn is None:
-        raise Exception("Database not initialized.")
-
-    if db.db_type == DatabaseType.MONGODB:
-        from repository.mongo.booking_repository_mongodb import BookingRepositoryMongoDB
-
-        return BookingRepositoryMongoDB(conn)
-    else:
-        raise ValueError(
-            f"Database type {db.db_type} is not supported for booking repository."
-        )
+    return container.booking_repository
 
 
-def get_booking_service(
-    booking_repository: Annotated[IBookingRepository, Depends(get_booking_repository)],
-    hotel_repository: Annotated[IHotelRepository, Depends(get_hotel_repository)],
-    user_repository: Annotated[IUserRepository, Depends(get_user_repository)],
+async def get_booking_service(
+    container: Annotated[AppContainer, Depends(get_container)],
 ) -> BookingService:
-    return BookingService(booking_repository, hotel_repository, user_repository)
+    return container.booking_service
@@ -54,3 +54,27 @@ class HotelNotFoundError(HotelServiceError, NotFoundError):
 
 class BookingServiceError(Exception):
     pass
+
+
+class ServiceUnavailableError(Exception):
+    """Raised when a resource is saturated or down and the request should be retried later"""
+
+    pass
+
+
+class InvalidRequestError(ValueError):
+    """Raised when request parameters are valid on their own but inconsistent"""
+
+    pass
+
+
+class InvalidCursorError(InvalidRequestError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+    pass
+
+
+class BookingConflictError(BookingServiceError):
+    """Raised when a requested room is already booked for one of the requested nights"""
+
+    pass
@@ -2,7 +2,10 @@ from fastapi.responses import JSONResponse
 from fastapi import FastAPI, Request
 from exceptions.custom_exception import (
     AuthenticationError,
+    BookingConflictError,
+    InvalidRequestError,
     NotFoundError,
+    ServiceUnavailableError,
     UserAlreadyExistsError,
 )
 from jwt import InvalidTokenError
@@ -45,3 +48,27 @@ def add_exception_handlers(app: FastAPI):
             status_code=404,
             content={"message": str(exc)},
         )
+
+    @app.exception_handler(ServiceUnavailableError)
+    async def service_unavailable_handler(
+        request: Request, exc: ServiceUnavailableError
+    ):
+        return JSONResponse(
+            status_code=503,
+            content={"message": str(exc)},
+            headers={"Retry-After": "1"},
+        )
+
+    @app.exception_handler(InvalidRequestError)
+    async def invalid_request_handler(request: Request, exc: InvalidRequestError):
+        return JSONResponse(
+            status_code=400,
+            content={"message": str(exc)},
+        )
+
+    @app.exception_handler(BookingConflictError)
+    async def booking_conflict_handler(request: Request, exc: BookingConflictError):
+        return JSONResponse(
+            status_code=409,
+            content={"message": str(exc)},
+        )
@@ -2,10 +2,18 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from config.database_manager import DatabaseManager
 from config.settings import Settings
-from routers import users, hotels, bookings
+from config.auth.auth_settings import AuthSettings
+from dependencies.container import AppContainer
+from routers import users, hotels, bookings, admin, metrics, health
 import logging
 from fastapi.middleware.cors import CORSMiddleware
 from exceptions.exception_handler import add_exception_handlers
+from config.logging_config import setup_logging
+from util.request_context import RequestContextMiddleware
+from util.metrics_middleware import MetricsMiddleware
+from util.circuit_breaker_middleware import CircuitBreakerMiddleware
+
+logger = logging.getLogger(__name__)
 
 origins = [
     "http://localhost",
@@ -20,19 +28,33 @@ origins = [
 # Use lifespan to connect to the database
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logging.info("Starting up application...")
-
     settings = Settings()
+    log_listener = setup_logging(settings.log_level)
+    logger.info("Starting up application...")
+
+    auth_settings = AuthSettings()
     db_manager = DatabaseManager(settings)
     app.state.db_manager = db_manager
 
     try:
         # initialize database
         await app.state.db_manager.initialize(settings)
-        logging.info("Database manager initialized.")
+        logger.info("Database manager initialized.")
+
+        # build settings, repositories and services once for all requests
+        app.state.container = await AppContainer.create(
+            settings, auth_settings, db_manager
+        )
+        logger.info("Dependency container initialized.")
+
+        # requests and health checks read its cached state from now on
+        db_manager.start_heartbeat()
         yield
     finally:
-        app.state.db_manager.close()
+        if getattr(app.state, "container", None) is not None:
+            app.state.container.close()
+        await app.state.db_manager.close()
+        log_listener.stop()
 
 
 app = FastAPI(
@@ -41,6 +63,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# innermost, so the 503s it returns still get CORS headers, a request id and are counted
+app.add_middleware(CircuitBreakerMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -54,8 +78,14 @@ app.add_middleware(
     ],
 )
 
+app.add_middleware(RequestContextMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 add_exception_handlers(app)
 
 app.include_router(users.router)
 app.include_router(hotels.router)
 app.include_router(bookings.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
@@ -39,3 +39,5 @@ class Hotel(BaseModel):
     rating: float
     address: Address
     rooms: list[Room]
+    # bumped by every update, the hotel's ETag is derived from it
+    version: int = Field(default=0, ge=0)
@@ -15,6 +15,10 @@ class RefreshTokenInDB(BaseModel):
 
     id: Optional[PyObjectId] = Field(default=None, alias="_id")
     user_id: PyObjectId = Field(..., alias="userId")
-    token: str
+    # AuthUtils.token_key of the token's jti, the token itself is not stored
+    token_hash: str = Field(..., alias="tokenHash")
+    # key of the token this one replaced, still accepted for a short grace window
+    previous_token_hash: Optional[str] = Field(default=None, alias="previousTokenHash")
+    rotated_at: Optional[datetime.datetime] = Field(default=None, alias="rotatedAt")
     created_at: datetime.datetime = Field(..., alias="createdAt")
     expired_at: datetime.datetime = Field(..., alias="expiredAt")
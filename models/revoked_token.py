@@ -0,0 +1,20 @@
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict
+import datetime
+from config.py_object_id import PyObjectId
+
+
+class RevokedToken(BaseModel):
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_by_alias=True,
+        validate_by_name=True,
+        arbitrary_types_allowed=True,
+    )
+
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
+    # jti of the revoked access token
+    jti: str = Field(...)
+    revoked_at: datetime.datetime = Field(..., alias="revokedAt")
+    # the token's own exp, a revocation is pointless once the token has expired
+    expired_at: datetime.datetime = Field(..., alias="expiredAt")
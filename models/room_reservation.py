@@ -0,0 +1,11 @@
+from typing import NamedTuple
+import datetime
+
+
+class RoomReservation(NamedTuple):
+    """The part of a booking the occupancy index needs: which rooms are taken and when."""
+
+    hotel_id: str
+    rooms: list[str]
+    start_date: datetime.datetime
+    end_date: datetime.datetime
@@ -1,22 +1,104 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Optional, Sequence
+import datetime
 from models.booking import Booking
+from models.room_reservation import RoomReservation
 from config.py_object_id import PyObjectId
+from exceptions.custom_exception import InvalidRequestError
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+
+
+def night_span(
+    start_date: datetime.datetime, end_date: datetime.datetime
+) -> tuple[datetime.datetime, datetime.datetime]:
+    """
+    Midnight (UTC) of the first night and of the checkout day of a stay, the nights
+    are the half-open range between them. A stay within one day takes that night,
+    a stay that does not end after it starts has no nights and is rejected.
+    """
+    # naive datetimes are UTC already, aware ones can only be compared once they are too
+    if start_date.tzinfo is not None:
+        start_date = start_date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    if end_date.tzinfo is not None:
+        end_date = end_date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    if end_date <= start_date:
+        raise InvalidRequestError("`to` must be after `from`")
+
+    first_night = datetime.datetime.combine(start_date.date(), datetime.time.min)
+    checkout = datetime.datetime.combine(end_date.date(), datetime.time.min)
+    return first_night, max(checkout, first_night + datetime.timedelta(days=1))
+
+
+def room_nights(
+    start_date: datetime.datetime, end_date: datetime.datetime
+) -> list[datetime.datetime]:
+    """Midnight (UTC) of every night of a stay, the checkout day is not a night."""
+    first_night, checkout = night_span(start_date, end_date)
+    return [
+        first_night + datetime.timedelta(days=i)
+        for i in range((checkout - first_night).days)
+    ]
 
 
 class IBookingRepository(ABC):
     @abstractmethod
-    async def find_all(self) -> list[Booking]:
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Booking]:
         pass
 
     @abstractmethod
     async def get_by_id(self, booking_id: str) -> Optional[Booking]:
         pass
 
+    @abstractmethod
+    async def exists_by_id(self, booking_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_fields_by_id(
+        self, booking_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        """Only the given (stored, aliased) fields of the document, `_id` as a string."""
+        pass
+
     @abstractmethod
     async def create_booking(self, booking: Booking) -> Optional[PyObjectId]:
+        """Insert the booking, raise BookingConflictError if one of its room nights is already taken."""
+        pass
+
+    @abstractmethod
+    async def get_bookings_by_user_id(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Booking]:
+        pass
+
+    @abstractmethod
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        user_id: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        """Like `find_all` (`get_bookings_by_user_id` with a user), with only the given (stored, aliased) fields, `_id` as a string."""
+        pass
+
+    @abstractmethod
+    def stream_bookings(
+        self,
+        start_date: Optional[datetime.datetime] = None,
+        end_date: Optional[datetime.datetime] = None,
+        hotel_id: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield raw booking documents in batches, optionally only the stays overlapping the dates or for one hotel."""
         pass
 
     @abstractmethod
-    async def get_bookings_by_user_id(self, user_id: str) -> list[Booking]:
+    def iter_room_reservations(self) -> AsyncIterator[RoomReservation]:
+        """Yield hotel, rooms and dates of every booking, used to build the occupancy index."""
         pass
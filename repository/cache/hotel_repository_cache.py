@@ -0,0 +1,121 @@
+from typing import Optional, Sequence
+from models.hotel import Hotel
+from repository.hotel_repository import CATALOG_COUNTER, IHotelRepository
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from schemas.hotel.request.hotel_search_request import HotelSearchRequest
+from util.cache import TTLCache
+
+
+class CachedHotelRepository(IHotelRepository):
+    """
+    Read-through cache of validated Hotel models in front of another hotel repository.
+    Entries are dropped as soon as an update goes through this repository; updates made
+    by other worker processes become visible once the TTL runs out.
+    Cached models are shared between requests and must not be mutated.
+
+    Versions of cached hotels come from the cached model, and the catalog version is
+    cached with the same TTL, so an unchanged conditional GET does not reach the backend.
+
+    An update bumps the generation of the hotel and of the catalog version before and
+    after its write, and a read only fills the cache if the generation it started with
+    is still current, so a read overlapping an update cannot cache what it replaced.
+    """
+
+    def __init__(self, repository: IHotelRepository, max_size: int, ttl_seconds: float):
+        self.repository = repository
+        self.cache: TTLCache[str, Hotel] = TTLCache(max_size, ttl_seconds)
+        self.catalog_versions: TTLCache[str, int] = TTLCache(1, ttl_seconds)
+        # hotel id -> generation, only updates bump it
+        self._generations: dict[str, int] = {}
+        self._catalog_generation = 0
+
+    def _bump(self, hotel_id: str) -> int:
+        generation = self._generations.get(hotel_id, 0) + 1
+        self._generations[hotel_id] = generation
+        self._catalog_generation += 1
+        return generation
+
+    async def get_by_id(self, hotel_id: str) -> Optional[Hotel]:
+        hotel = self.cache.get(hotel_id)
+        if hotel is not None:
+            return hotel
+
+        generation = self._generations.get(hotel_id, 0)
+        hotel = await self.repository.get_by_id(hotel_id)
+        if hotel is not None and self._generations.get(hotel_id, 0) == generation:
+            self.cache.set(hotel_id, hotel)
+        return hotel
+
+    async def exists_by_id(self, hotel_id: str) -> bool:
+        if self.cache.get(hotel_id) is not None:
+            return True
+        return await self.repository.exists_by_id(hotel_id)
+
+    async def get_version(self, hotel_id: str) -> Optional[int]:
+        hotel = self.cache.get(hotel_id)
+        if hotel is not None:
+            return hotel.version
+        return await self.repository.get_version(hotel_id)
+
+    async def get_catalog_version(self) -> int:
+        version = self.catalog_versions.get(CATALOG_COUNTER)
+        if version is None:
+            generation = self._catalog_generation
+            version = await self.repository.get_catalog_version()
+            if self._catalog_generation == generation:
+                self.catalog_versions.set(CATALOG_COUNTER, version)
+        return version
+
+    async def get_fields_by_id(
+        self, hotel_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        return await self.repository.get_fields_by_id(hotel_id, fields)
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Hotel]:
+        return await self.repository.find_all(limit, after)
+
+    async def search(
+        self,
+        criteria: HotelSearchRequest,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Hotel]:
+        return await self.repository.search(criteria, limit, after)
+
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        criteria: Optional[HotelSearchRequest] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        return await self.repository.find_fields(fields, criteria, limit, after)
+
+    async def update(self, hotel_id: str, hotel_data: Hotel) -> Optional[Hotel]:
+        generation = self._bump(hotel_id)
+        try:
+            hotel = await self.repository.update(hotel_id, hotel_data)
+        except Exception:
+            # drop the entry even if the write failed, the document may have changed
+            self.cache.invalidate(hotel_id)
+            raise
+        finally:
+            # reads that started during the write may carry the old document
+            ended = self._bump(hotel_id)
+            # the catalog version may have been bumped, read it again
+            self.catalog_versions.clear()
+
+        # the post-image is the current document unless another update overlapped
+        if hotel is not None and ended == generation + 1:
+            self.cache.set(hotel_id, hotel)
+        else:
+            self.cache.invalidate(hotel_id)
+        return hotel
+
+    async def get_hotels_by_user_id(self, user_id: str) -> list[Hotel]:
+        return await self.repository.get_hotels_by_user_id(user_id)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 from models.hotel import Hotel
+from schemas.hotel.request.hotel_search_request import HotelSearchRequest
 from config.py_object_id import PyObjectId
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+
+# the catalog version is kept in the backend's counters under this name
+CATALOG_COUNTER = "hotels"
 
 
 class IHotelRepository(ABC):
@@ -10,13 +15,57 @@ class IHotelRepository(ABC):
         pass
 
     @abstractmethod
-    async def find_all(self) -> list[Hotel]:
+    async def exists_by_id(self, hotel_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_version(self, hotel_id: str) -> Optional[int]:
+        """The hotel's version, bumped by every update, None if it does not exist."""
+        pass
+
+    @abstractmethod
+    async def get_catalog_version(self) -> int:
+        """Version of the whole catalog, bumped after any hotel is updated."""
+        pass
+
+    @abstractmethod
+    async def get_fields_by_id(
+        self, hotel_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        """Only the given (stored, aliased) fields of the document, `_id` as a string."""
         pass
 
     @abstractmethod
-    async def update(self, hotel_id: str, hotel_data: Hotel) -> int:
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Hotel]:
+        pass
+
+    @abstractmethod
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        criteria: Optional[HotelSearchRequest] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        """Like `search` (`find_all` without criteria), with only the given (stored, aliased) fields, `_id` as a string."""
+        pass
+
+    @abstractmethod
+    async def update(self, hotel_id: str, hotel_data: Hotel) -> Optional[Hotel]:
+        """Replace the hotel and return the stored post-image, None if it does not exist."""
         pass
 
     @abstractmethod
     async def get_hotels_by_user_id(self, user_id: str) -> list[Hotel]:
         pass
+
+    @abstractmethod
+    async def search(
+        self,
+        criteria: HotelSearchRequest,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Hotel]:
+        pass
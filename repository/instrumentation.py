@@ -0,0 +1,83 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Optional, TypeVar
+from util.metrics import REPOSITORY_CALL_DURATION, REPOSITORY_CALL_ERRORS
+
+R = TypeVar("R")
+
+# "<repository>.<method>" of the repository call in progress, read by the database
+# command monitor to attribute slow commands; Motor copies it into its executor threads
+_current_repository_call: ContextVar[Optional[str]] = ContextVar(
+    "current_repository_call", default=None
+)
+
+
+def get_current_repository_call() -> Optional[str]:
+    return _current_repository_call.get()
+
+
+def _time_coroutine(method, labels: tuple):
+    call_name = ".".join(labels)
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = _current_repository_call.set(call_name)
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception:
+            REPOSITORY_CALL_ERRORS.inc(labels)
+            raise
+        finally:
+            REPOSITORY_CALL_DURATION.observe(labels, time.perf_counter() - start)
+            _current_repository_call.reset(token)
+
+    return wrapper
+
+
+def _time_async_generator(method, labels: tuple):
+    call_name = ".".join(labels)
+
+    # measured from the first request of an item until the generator is exhausted or closed
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        generator = method(*args, **kwargs)
+        try:
+            while True:
+                # set around each step only, the consumer may close us from another context
+                token = _current_repository_call.set(call_name)
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    _current_repository_call.reset(token)
+                yield item
+        except Exception:
+            REPOSITORY_CALL_ERRORS.inc(labels)
+            raise
+        finally:
+            await generator.aclose()
+            REPOSITORY_CALL_DURATION.observe(labels, time.perf_counter() - start)
+
+    return wrapper
+
+
+def instrument_repository(repository: R, interface: type, name: str) -> R:
+    """
+    Record latency and errors of every method declared by `interface`
+    (the I*Repository ABC) on this repository instance.
+    Methods that are not part of the interface are left untouched.
+    """
+    for method_name in interface.__abstractmethods__:
+        method = getattr(repository, method_name)
+        labels = (name, method_name)
+        if inspect.isasyncgenfunction(method):
+            wrapper = _time_async_generator(method, labels)
+        else:
+            wrapper = _time_coroutine(method, labels)
+        setattr(repository, method_name, wrapper)
+    return repository
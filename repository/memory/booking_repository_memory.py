@@ -0,0 +1,135 @@
+from ..booking_repository import IBookingRepository
+from typing import AsyncIterator, Optional, Sequence
+import datetime
+from models.booking import Booking
+from models.room_reservation import RoomReservation
+from config.py_object_id import PyObjectId
+from exceptions.custom_exception import BookingConflictError
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.memory.collection_memory import (
+    DuplicateKeyError,
+    InMemoryDatabase,
+    to_utc_naive,
+)
+from repository.memory.pagination_memory import find_page
+from repository.projection import project
+
+
+class BookingRepositoryMemory(IBookingRepository):
+    def __init__(self, db: InMemoryDatabase):
+        self.booking_collection = db.get_collection("bookings")
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Booking]:
+        return find_page(
+            self.booking_collection, limit, after, lambda doc: Booking(**doc)
+        )
+
+    async def get_by_id(self, booking_id: str) -> Optional[Booking]:
+        booking = self.booking_collection.get(booking_id)
+        if booking:
+            return Booking(**booking)
+        return None
+
+    async def exists_by_id(self, booking_id: str) -> bool:
+        return self.booking_collection.get(booking_id) is not None
+
+    async def get_fields_by_id(
+        self, booking_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        return project(self.booking_collection.get(booking_id), fields)
+
+    async def create_booking(self, booking: Booking) -> Optional[PyObjectId]:
+        document = booking.model_dump(by_alias=True, exclude_unset=True)
+        for field in ("from", "to", "time"):
+            if field in document:
+                document[field] = to_utc_naive(document[field])
+        # the unique room night index rejects the whole booking if any night is taken
+        try:
+            return self.booking_collection.insert(document)
+        except DuplicateKeyError as e:
+            if e.index_name != "room_night_unique_index":
+                raise
+            raise BookingConflictError(
+                f"Rooms {booking.rooms} of hotel {booking.hotel_id} are already booked for the requested dates"
+            )
+
+    async def get_bookings_by_user_id(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Booking]:
+        return find_page(
+            self.booking_collection,
+            limit,
+            after,
+            lambda doc: Booking(**doc),
+            ids=self.booking_collection.find_ids("user_bookings_index", user_id),
+        )
+
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        user_id: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        ids = (
+            self.booking_collection.find_ids("user_bookings_index", user_id)
+            if user_id is not None
+            else None
+        )
+        return find_page(
+            self.booking_collection,
+            limit,
+            after,
+            lambda doc: project(doc, fields),
+            ids=ids,
+        )
+
+    async def stream_bookings(
+        self,
+        start_date: Optional[datetime.datetime] = None,
+        end_date: Optional[datetime.datetime] = None,
+        hotel_id: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[dict]]:
+        start_date = to_utc_naive(start_date) if start_date else None
+        end_date = to_utc_naive(end_date) if end_date else None
+
+        # a stay overlaps [start_date, end_date) when it starts before the end and ends after the start
+        def overlaps(booking: dict) -> bool:
+            if start_date and not booking["to"] > start_date:
+                return False
+            if end_date and not booking["from"] < end_date:
+                return False
+            return True
+
+        last_id = None
+        while True:
+            # every batch restarts after the last id, so bookings written meanwhile do not shift the scan
+            ids = (
+                self.booking_collection.find_ids("hotel_bookings_index", hotel_id)
+                if hotel_id
+                else None
+            )
+            batch = []
+            for booking in self.booking_collection.iter_after(last_id, ids, overlaps):
+                batch.append(dict(booking))
+                if len(batch) == batch_size:
+                    break
+            if not batch:
+                break
+            last_id = batch[-1]["_id"]
+            yield batch
+
+    async def iter_room_reservations(self) -> AsyncIterator[RoomReservation]:
+        for booking in list(self.booking_collection.documents.values()):
+            yield RoomReservation(
+                hotel_id=booking["hotel"],
+                rooms=booking.get("rooms", []),
+                start_date=booking["from"],
+                end_date=booking["to"],
+            )
@@ -0,0 +1,193 @@
+import bisect
+import datetime
+from typing import Callable, Hashable, Iterable, Iterator, Optional
+from bson import ObjectId
+
+
+class DuplicateKeyError(KeyError):
+    """A write would give a unique index two documents with the same key."""
+
+    def __init__(self, index_name: str, key: Hashable):
+        super().__init__(f"Duplicate key {key!r} in index {index_name}")
+        self.index_name = index_name
+        self.key = key
+
+
+def to_utc_naive(value: datetime.datetime) -> datetime.datetime:
+    """Store datetimes the way MongoDB hands them back: naive and in UTC."""
+    if value.tzinfo is not None:
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _insert_sorted(ids: list[str], document_id: str):
+    # new ObjectIds are increasing, so this is an append in the common case
+    if not ids or ids[-1] < document_id:
+        ids.append(document_id)
+    else:
+        bisect.insort(ids, document_id)
+
+
+def _remove_sorted(ids: list[str], document_id: str):
+    index = bisect.bisect_left(ids, document_id)
+    if index < len(ids) and ids[index] == document_id:
+        del ids[index]
+
+
+class _Index:
+    def __init__(self, name: str, keys: Callable[[dict], Iterable[Hashable]], unique: bool):
+        self.name = name
+        self.keys = keys
+        self.unique = unique
+        # key -> sorted ids of the documents with that key
+        self.entries: dict[Hashable, list[str]] = {}
+
+    def _keys(self, document: dict) -> set[Hashable]:
+        # a document is listed once per key, even if a non-unique index yields it twice
+        return set(self.keys(document))
+
+    def check(self, document: dict, document_id: str):
+        if not self.unique:
+            return
+        # every key of a unique index stands for a row of its own (a room night
+        # claim in MongoDB and SQLite), so one document cannot hold a key twice
+        seen: set[Hashable] = set()
+        for key in self.keys(document):
+            if key in seen:
+                raise DuplicateKeyError(self.name, key)
+            seen.add(key)
+            ids = self.entries.get(key)
+            if ids and ids != [document_id]:
+                raise DuplicateKeyError(self.name, key)
+
+    def add(self, document: dict, document_id: str):
+        for key in self._keys(document):
+            _insert_sorted(self.entries.setdefault(key, []), document_id)
+
+    def remove(self, document: dict, document_id: str):
+        for key in self._keys(document):
+            ids = self.entries.get(key)
+            if ids is None:
+                continue
+            _remove_sorted(ids, document_id)
+            if not ids:
+                del self.entries[key]
+
+
+class MemoryCollection:
+    """
+    Documents keyed by their `_id` (ObjectId hex string), plus the ids in sorted order
+    so keyset pagination is a bisect instead of a scan.
+    Secondary indexes map the keys a function extracts from a document (several keys
+    per document are allowed, like a multikey index) to the sorted ids holding them.
+
+    Only the event loop touches a collection, and no method awaits, so every
+    method is atomic with respect to other requests.
+    """
+
+    def __init__(self):
+        self.documents: dict[str, dict] = {}
+        self._ids: list[str] = []
+        self._indexes: dict[str, _Index] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def create_index(
+        self,
+        name: str,
+        keys: Callable[[dict], Iterable[Hashable]],
+        unique: bool = False,
+    ):
+        """Index the documents under every key returned by `keys`, an empty result skips the document."""
+        if name in self._indexes:
+            return
+        index = _Index(name, keys, unique)
+        for document_id, document in self.documents.items():
+            index.check(document, document_id)
+            index.add(document, document_id)
+        self._indexes[name] = index
+
+    def find_ids(self, index_name: str, key: Hashable) -> list[str]:
+        """Sorted ids of the documents indexed under `key`, do not modify the list."""
+        return self._indexes[index_name].entries.get(key, [])
+
+    def find_one(self, index_name: str, key: Hashable) -> Optional[dict]:
+        ids = self.find_ids(index_name, key)
+        return self.documents.get(ids[0]) if ids else None
+
+    def get(self, document_id: str) -> Optional[dict]:
+        return self.documents.get(document_id)
+
+    def insert(self, document: dict) -> str:
+        document_id = str(document.get("_id") or ObjectId())
+        if document_id in self.documents:
+            raise DuplicateKeyError("_id", document_id)
+        document["_id"] = document_id
+        # validate every unique index before touching any of them
+        for index in self._indexes.values():
+            index.check(document, document_id)
+
+        self.documents[document_id] = document
+        _insert_sorted(self._ids, document_id)
+        for index in self._indexes.values():
+            index.add(document, document_id)
+        return document_id
+
+    def insert_many(self, documents: list[dict]) -> list[str]:
+        return [self.insert(document) for document in documents]
+
+    def replace(self, document_id: str, document: dict) -> Optional[dict]:
+        previous = self.documents.get(document_id)
+        if previous is None:
+            return None
+        document["_id"] = document_id
+        for index in self._indexes.values():
+            index.check(document, document_id)
+
+        self.documents[document_id] = document
+        for index in self._indexes.values():
+            index.remove(previous, document_id)
+            index.add(document, document_id)
+        return document
+
+    def delete(self, document_id: str) -> Optional[dict]:
+        document = self.documents.pop(document_id, None)
+        if document is not None:
+            _remove_sorted(self._ids, document_id)
+            for index in self._indexes.values():
+                index.remove(document, document_id)
+        return document
+
+    def iter_after(
+        self,
+        after_id: Optional[str] = None,
+        ids: Optional[list[str]] = None,
+        predicate: Optional[Callable[[dict], bool]] = None,
+    ) -> Iterator[dict]:
+        """
+        Documents in `_id` order, starting after `after_id`.
+        `ids` narrows the scan to a sorted secondary index.
+        """
+        ids = self._ids if ids is None else ids
+        start = bisect.bisect_right(ids, after_id) if after_id else 0
+        for index in range(start, len(ids)):
+            document = self.documents.get(ids[index])
+            if document is not None and (predicate is None or predicate(document)):
+                yield document
+
+
+class InMemoryDatabase:
+    """The in-memory counterpart of AsyncIOMotorDatabase, one MemoryCollection per name."""
+
+    def __init__(self):
+        self._collections: dict[str, MemoryCollection] = {}
+
+    def get_collection(self, name: str) -> MemoryCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = MemoryCollection()
+        return collection
+
+    def stats(self) -> dict:
+        return {name: len(collection) for name, collection in self._collections.items()}
@@ -0,0 +1,156 @@
+from ..hotel_repository import CATALOG_COUNTER, IHotelRepository
+from typing import Optional, Sequence
+from models.hotel import Hotel
+from schemas.hotel.request.hotel_search_request import HotelSearchRequest
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.memory.collection_memory import InMemoryDatabase
+from repository.memory.pagination_memory import find_page
+from repository.projection import project
+
+
+def _room_matches(room: dict, criteria: HotelSearchRequest) -> bool:
+    if criteria.min_sleeps is not None and room.get("sleepsCount", 0) < criteria.min_sleeps:
+        return False
+    rate = room.get("baseRate", 0)
+    if criteria.min_rate is not None and rate < criteria.min_rate:
+        return False
+    if criteria.max_rate is not None and rate > criteria.max_rate:
+        return False
+    return True
+
+
+def _search_predicate(criteria: HotelSearchRequest):
+    match_rooms = (
+        criteria.min_sleeps is not None
+        or criteria.min_rate is not None
+        or criteria.max_rate is not None
+    )
+
+    def matches(hotel: dict) -> bool:
+        address = hotel.get("address", {})
+        if criteria.city and address.get("city") != criteria.city:
+            return False
+        if criteria.province and address.get("province") != criteria.province:
+            return False
+        if criteria.is_active is not None and hotel.get("isActive") != criteria.is_active:
+            return False
+        if criteria.tags and not set(criteria.tags).issubset(hotel.get("tags", [])):
+            return False
+        # capacity and price are matched on the same room, like $elemMatch
+        if match_rooms and not any(
+            _room_matches(room, criteria) for room in hotel.get("rooms", [])
+        ):
+            return False
+        return True
+
+    return matches
+
+
+class HotelRepositoryMemory(IHotelRepository):
+    def __init__(self, db: InMemoryDatabase):
+        self.hotel_collection = db.get_collection("hotels")
+        self.booking_collection = db.get_collection("bookings")
+        self.counter_collection = db.get_collection("counters")
+
+    async def get_by_id(self, hotel_id: str) -> Optional[Hotel]:
+        hotel = self.hotel_collection.get(hotel_id)
+        if hotel:
+            return Hotel(**hotel)
+        return None
+
+    async def exists_by_id(self, hotel_id: str) -> bool:
+        return self.hotel_collection.get(hotel_id) is not None
+
+    async def get_version(self, hotel_id: str) -> Optional[int]:
+        hotel = self.hotel_collection.get(hotel_id)
+        if hotel:
+            return hotel.get("version", 0)
+        return None
+
+    async def get_catalog_version(self) -> int:
+        counter = self.counter_collection.get(CATALOG_COUNTER)
+        return counter["version"] if counter else 0
+
+    async def get_fields_by_id(
+        self, hotel_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        return project(self.hotel_collection.get(hotel_id), fields)
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Hotel]:
+        return find_page(self.hotel_collection, limit, after, lambda doc: Hotel(**doc))
+
+    async def search(
+        self,
+        criteria: HotelSearchRequest,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Hotel]:
+        ids = (
+            self.hotel_collection.find_ids("city_search_index", criteria.city)
+            if criteria.city
+            else None
+        )
+        return find_page(
+            self.hotel_collection,
+            limit,
+            after,
+            lambda doc: Hotel(**doc),
+            ids=ids,
+            predicate=_search_predicate(criteria),
+        )
+
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        criteria: Optional[HotelSearchRequest] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        ids = (
+            self.hotel_collection.find_ids("city_search_index", criteria.city)
+            if criteria and criteria.city
+            else None
+        )
+        return find_page(
+            self.hotel_collection,
+            limit,
+            after,
+            lambda doc: project(doc, fields),
+            ids=ids,
+            predicate=_search_predicate(criteria) if criteria else None,
+        )
+
+    async def update(self, hotel_id: str, hotel_data: Hotel) -> Optional[Hotel]:
+        previous = self.hotel_collection.get(hotel_id)
+        if previous is None:
+            return None
+
+        document = hotel_data.model_dump(
+            by_alias=True, exclude_unset=True, exclude={"id", "version"}
+        )
+        document["version"] = previous.get("version", 0) + 1
+        hotel = self.hotel_collection.replace(hotel_id, document)
+
+        counter = self.counter_collection.get(CATALOG_COUNTER)
+        if counter is None:
+            self.counter_collection.insert({"_id": CATALOG_COUNTER, "version": 1})
+        else:
+            counter["version"] += 1
+        return Hotel(**hotel)
+
+    async def get_hotels_by_user_id(self, user_id: str) -> list[Hotel]:
+        # distinct hotels of the user's bookings, hotels deleted since are skipped
+        hotel_ids = dict.fromkeys(
+            self.booking_collection.get(booking_id)["hotel"]
+            for booking_id in self.booking_collection.find_ids(
+                "user_bookings_index", user_id
+            )
+        )
+        hotels = []
+        for hotel_id in hotel_ids:
+            hotel = self.hotel_collection.get(hotel_id)
+            if hotel:
+                hotels.append(Hotel(**hotel))
+        return hotels
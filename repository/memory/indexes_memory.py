@@ -0,0 +1,59 @@
+from typing import Callable, Hashable, Iterable
+from repository.booking_repository import room_nights
+from repository.memory.collection_memory import InMemoryDatabase
+
+IndexKeys = Callable[[dict], Iterable[Hashable]]
+
+
+def _room_night_keys(booking: dict) -> list[tuple]:
+    return [
+        (booking["hotel"], room_id, night)
+        for room_id in booking.get("rooms", [])
+        for night in room_nights(booking["from"], booking["to"])
+    ]
+
+
+# the in-memory counterpart of config/mongo_indexes.py: (name, keys, unique) per collection
+INDEXES: dict[str, list[tuple[str, IndexKeys, bool]]] = {
+    "users": [
+        ("email_unique_index", lambda user: [user["email"]], True),
+    ],
+    "hotels": [
+        (
+            "city_search_index",
+            lambda hotel: [hotel.get("address", {}).get("city")],
+            False,
+        ),
+    ],
+    "bookings": [
+        # guest bookings carry an empty userId and are never looked up by user
+        (
+            "user_bookings_index",
+            lambda booking: [booking["userId"]] if booking.get("userId") else [],
+            False,
+        ),
+        ("hotel_bookings_index", lambda booking: [booking["hotel"]], False),
+        # one key per booked room and night, what the roomNights collection does in MongoDB
+        ("room_night_unique_index", _room_night_keys, True),
+    ],
+    "refreshTokens": [
+        ("token_hash_unique_index", lambda token: [token["tokenHash"]], True),
+        (
+            "previous_token_hash_index",
+            lambda token: [token["previousTokenHash"]]
+            if token.get("previousTokenHash")
+            else [],
+            False,
+        ),
+    ],
+    "revokedTokens": [
+        ("jti_unique_index", lambda revoked: [revoked["jti"]], True),
+    ],
+}
+
+
+def create_indexes(db: InMemoryDatabase):
+    for collection_name, indexes in INDEXES.items():
+        collection = db.get_collection(collection_name)
+        for name, keys, unique in indexes:
+            collection.create_index(name, keys, unique)
@@ -0,0 +1,29 @@
+from typing import Callable, Optional, TypeVar
+from repository.memory.collection_memory import MemoryCollection
+from repository.pagination import Page, decode_cursor, encode_cursor
+
+T = TypeVar("T")
+
+
+def find_page(
+    collection: MemoryCollection,
+    limit: int,
+    after: Optional[str],
+    to_model: Callable[[dict], T],
+    ids: Optional[list[str]] = None,
+    predicate: Optional[Callable[[dict], bool]] = None,
+) -> Page[T]:
+    """Keyset pagination on `_id` with the same cursors as the MongoDB repositories."""
+    after_id = decode_cursor(after) if after else None
+
+    documents = []
+    has_more = False
+    for document in collection.iter_after(after_id, ids, predicate):
+        # one extra document tells whether there is a next page
+        if len(documents) == limit:
+            has_more = True
+            break
+        documents.append(document)
+
+    next_cursor = encode_cursor(documents[-1]["_id"]) if has_more else None
+    return Page(items=[to_model(doc) for doc in documents], next_cursor=next_cursor)
@@ -0,0 +1,107 @@
+import datetime
+import heapq
+from typing import Optional
+from models.refresh_token_in_db import RefreshTokenInDB
+from repository.refresh_token_repository import IRefreshTokenRepository
+from config.py_object_id import PyObjectId
+from repository.memory.collection_memory import InMemoryDatabase, to_utc_naive
+
+
+def _utc_now() -> datetime.datetime:
+    return to_utc_naive(datetime.datetime.now(datetime.timezone.utc))
+
+
+class RefreshTokenRepositoryMemory(IRefreshTokenRepository):
+    """
+    Refresh tokens expire at their `expiredAt`, like the TTL index in MongoDB.
+    Expired tokens are invisible to reads right away and removed on the next write,
+    from a heap ordered by expiry.
+    """
+
+    def __init__(self, db: InMemoryDatabase):
+        self.refresh_token_collection = db.get_collection("refreshTokens")
+        # (expiredAt, _id), entries of updated or deleted tokens are skipped when popped
+        self._expiry_heap: list[tuple[datetime.datetime, str]] = []
+
+    def _live(self, token: Optional[dict]) -> Optional[dict]:
+        if token is None or token["expiredAt"] <= _utc_now():
+            return None
+        return token
+
+    def _purge_expired(self):
+        now = _utc_now()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expired_at, token_id = heapq.heappop(self._expiry_heap)
+            token = self.refresh_token_collection.get(token_id)
+            if token is not None and token["expiredAt"] == expired_at:
+                self.refresh_token_collection.delete(token_id)
+
+    def _store(self, token: dict, token_id: Optional[str] = None) -> Optional[str]:
+        token["createdAt"] = to_utc_naive(token["createdAt"])
+        token["expiredAt"] = to_utc_naive(token["expiredAt"])
+        if token_id is None:
+            token_id = self.refresh_token_collection.insert(token)
+        elif self.refresh_token_collection.replace(token_id, token) is None:
+            return None
+        heapq.heappush(self._expiry_heap, (token["expiredAt"], token_id))
+        return token_id
+
+    async def get_by_id(self, token_id: str) -> Optional[RefreshTokenInDB]:
+        token = self._live(self.refresh_token_collection.get(token_id))
+        if token:
+            return RefreshTokenInDB(**token)
+        return None
+
+    async def get_by_key(self, key: str) -> Optional[RefreshTokenInDB]:
+        tokenInDB = self._live(
+            self.refresh_token_collection.find_one("token_hash_unique_index", key)
+        )
+        if tokenInDB:
+            return RefreshTokenInDB(**tokenInDB)
+        return None
+
+    async def create_refresh_token(
+        self, tokenInDB: RefreshTokenInDB
+    ) -> Optional[PyObjectId]:
+        self._purge_expired()
+        return self._store(tokenInDB.model_dump(by_alias=True, exclude_unset=True))
+
+    async def delete(self, key: str) -> int:
+        ids = self.refresh_token_collection.find_ids("token_hash_unique_index", key)
+        if not ids:
+            return 0
+        self.refresh_token_collection.delete(ids[0])
+        return 1
+
+    async def rotate(
+        self, key: str, new_key: str, expired_at: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
+        self._purge_expired()
+        current = self._live(
+            self.refresh_token_collection.find_one("token_hash_unique_index", key)
+        )
+        if current is None:
+            return None
+
+        current_time = datetime.datetime.now(datetime.timezone.utc)
+        rotated = {
+            **current,
+            "tokenHash": new_key,
+            "previousTokenHash": key,
+            "rotatedAt": to_utc_naive(current_time),
+            "createdAt": current_time,
+            "expiredAt": expired_at,
+        }
+        if self._store(rotated, current["_id"]) is None:
+            return None
+        return RefreshTokenInDB(**rotated)
+
+    async def get_by_previous_key(
+        self, key: str, rotated_after: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
+        tokenInDB = self._live(
+            self.refresh_token_collection.find_one("previous_token_hash_index", key)
+        )
+        if tokenInDB and tokenInDB["rotatedAt"] > to_utc_naive(rotated_after):
+            return RefreshTokenInDB(**tokenInDB)
+        return None
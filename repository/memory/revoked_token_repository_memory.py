@@ -0,0 +1,61 @@
+import datetime
+import heapq
+from bson import ObjectId
+from models.revoked_token import RevokedToken
+from repository.revoked_token_repository import IRevokedTokenRepository
+from repository.memory.collection_memory import InMemoryDatabase, to_utc_naive
+
+
+def _utc_now() -> datetime.datetime:
+    return to_utc_naive(datetime.datetime.now(datetime.timezone.utc))
+
+
+class RevokedTokenRepositoryMemory(IRevokedTokenRepository):
+    """
+    Revocations expire at their `expiredAt`, like the refresh tokens: invisible to reads
+    right away and removed on the next write, from a heap ordered by expiry.
+    Ids are ObjectIds made at revocation, so `_id` order is revocation order.
+    """
+
+    def __init__(self, db: InMemoryDatabase):
+        self.revoked_token_collection = db.get_collection("revokedTokens")
+        self._expiry_heap: list[tuple[datetime.datetime, str]] = []
+
+    def _purge_expired(self):
+        now = _utc_now()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, revoked_id = heapq.heappop(self._expiry_heap)
+            self.revoked_token_collection.delete(revoked_id)
+
+    async def revoke(self, jti: str, expired_at: datetime.datetime) -> bool:
+        self._purge_expired()
+        if self.revoked_token_collection.find_one("jti_unique_index", jti):
+            return False
+        revoked = {
+            "jti": jti,
+            "revokedAt": _utc_now(),
+            "expiredAt": to_utc_naive(expired_at),
+        }
+        revoked_id = self.revoked_token_collection.insert(revoked)
+        heapq.heappush(self._expiry_heap, (revoked["expiredAt"], revoked_id))
+        return True
+
+    async def is_revoked(self, jti: str) -> bool:
+        revoked = self.revoked_token_collection.find_one("jti_unique_index", jti)
+        return revoked is not None and revoked["expiredAt"] > _utc_now()
+
+    async def find_revoked_since(
+        self, since: datetime.datetime
+    ) -> list[RevokedToken]:
+        now = _utc_now()
+        # ObjectIds made an earlier second sort before every revocation since then
+        start = since - datetime.timedelta(seconds=1)
+        after_id = str(ObjectId.from_datetime(start)) if start.timestamp() > 0 else None
+        return [
+            RevokedToken(**revoked)
+            for revoked in self.revoked_token_collection.iter_after(
+                after_id,
+                predicate=lambda revoked: revoked["revokedAt"] >= to_utc_naive(since)
+                and revoked["expiredAt"] > now,
+            )
+        ]
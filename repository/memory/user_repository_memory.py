@@ -0,0 +1,70 @@
+from ..user_repository import IUserRepository
+from typing import Optional, Sequence
+from models.user import User
+from config.py_object_id import PyObjectId
+from exceptions.custom_exception import UserAlreadyExistsError
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.memory.collection_memory import DuplicateKeyError, InMemoryDatabase
+from repository.memory.pagination_memory import find_page
+from repository.projection import project
+
+
+class UserRepositoryMemory(IUserRepository):
+    def __init__(self, db: InMemoryDatabase):
+        self.user_collection = db.get_collection("users")
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        user = self.user_collection.find_one("email_unique_index", email)
+        if user:
+            return User(**user)
+        return None
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        user = self.user_collection.get(user_id)
+        if user:
+            return User(**user)
+        return None
+
+    async def exists_by_id(self, user_id: str) -> bool:
+        return self.user_collection.get(user_id) is not None
+
+    async def exists_by_email(self, email: str) -> bool:
+        return bool(self.user_collection.find_ids("email_unique_index", email))
+
+    async def get_id_by_email(self, email: str) -> Optional[str]:
+        ids = self.user_collection.find_ids("email_unique_index", email)
+        return ids[0] if ids else None
+
+    async def get_fields_by_id(
+        self, user_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        return project(self.user_collection.get(user_id), fields)
+
+    async def create_user(self, user: User) -> Optional[PyObjectId]:
+        try:
+            return self.user_collection.insert(
+                user.model_dump(by_alias=True, exclude_unset=True)
+            )
+        except DuplicateKeyError:
+            raise UserAlreadyExistsError(f"User with email {user.email} already exists")
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[User]:
+        return find_page(self.user_collection, limit, after, lambda doc: User(**doc))
+
+    async def delete(self, user_id: str) -> int:
+        return 1 if self.user_collection.delete(user_id) is not None else 0
+
+    async def update(self, user_id: str, user_data: User) -> Optional[User]:
+        try:
+            user = self.user_collection.replace(
+                user_id, user_data.model_dump(by_alias=True, exclude_unset=True)
+            )
+        except DuplicateKeyError:
+            raise UserAlreadyExistsError(
+                f"User with email {user_data.email} already exists"
+            )
+        if user:
+            return User(**user)
+        return None
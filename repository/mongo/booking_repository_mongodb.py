@@ -1,21 +1,33 @@
-from ..booking_repository import IBookingRepository
-from typing import Optional
+from ..booking_repository import IBookingRepository, room_nights
+from typing import AsyncIterator, Optional, Sequence
+import datetime
 from models.booking import Booking
+from models.room_reservation import RoomReservation
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from exceptions.custom_exception import BookingConflictError
+import logging
 from config.py_object_id import PyObjectId
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.mongo.pagination_mongodb import find_page
+from repository.mongo.projection_mongodb import to_projection, with_str_id
+
+logger = logging.getLogger(__name__)
 
 
 class BookingRepositoryMongoDB(IBookingRepository):
     def __init__(self, db: AsyncIOMotorDatabase):
         self.booking_collection = db.get_collection("bookings")
+        # one claim document per booked room and night, unique on (hotel, roomId, night)
+        self.room_night_collection = db.get_collection("roomNights")
 
-    async def find_all(self) -> list[Booking]:
-        raw_documents = await self.booking_collection.find().to_list(100)
-        if raw_documents:
-            bookings = [Booking(**doc) for doc in raw_documents]
-            return bookings
-        return []
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Booking]:
+        return await find_page(
+            self.booking_collection, {}, limit, after, lambda doc: Booking(**doc)
+        )
 
     async def get_by_id(self, booking_id: str) -> Optional[Booking]:
         booking = await self.booking_collection.find_one(
@@ -26,17 +38,159 @@ class BookingRepositoryMongoDB(IBookingRepository):
             return Booking(**booking)
         return None
 
-    async def create_booking(self, booking: Booking) -> Optional[PyObjectId]:
-        response = await self.booking_collection.insert_one(
-            booking.model_dump(by_alias=True, exclude_unset=True)
+    async def exists_by_id(self, booking_id: str) -> bool:
+        booking = await self.booking_collection.find_one(
+            {"_id": ObjectId(booking_id)}, {"_id": 1}
+        )
+        return booking is not None
+
+    async def get_fields_by_id(
+        self, booking_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        booking = await self.booking_collection.find_one(
+            {"_id": ObjectId(booking_id)}, to_projection(fields)
         )
+        return with_str_id(booking)
+
+    def _room_night_claims(self, booking: Booking, booking_id: ObjectId) -> list[dict]:
+        return [
+            {
+                "hotel": booking.hotel_id,
+                "roomId": room_id,
+                "night": night,
+                "bookingId": booking_id,
+            }
+            for room_id in booking.rooms
+            for night in room_nights(booking.start_date, booking.end_date)
+        ]
+
+    async def _release_room_nights(self, booking_id: ObjectId):
+        await self.room_night_collection.delete_many({"bookingId": booking_id})
+
+    async def create_booking(self, booking: Booking) -> Optional[PyObjectId]:
+        # Claim every room night first: the unique index lets exactly one of two
+        # overlapping bookings through, without locks or transactions.
+        booking_id = ObjectId()
+        claims = self._room_night_claims(booking, booking_id)
+        if claims:
+            try:
+                await self.room_night_collection.insert_many(claims, ordered=True)
+            except BulkWriteError as e:
+                # release the nights claimed before the conflicting one
+                await self._release_room_nights(booking_id)
+                write_errors = e.details.get("writeErrors", [])
+                if any(error.get("code") == 11000 for error in write_errors):
+                    raise BookingConflictError(
+                        f"Rooms {booking.rooms} of hotel {booking.hotel_id} are already booked for the requested dates"
+                    )
+                raise
+
+        try:
+            document = booking.model_dump(by_alias=True, exclude_unset=True)
+            document["_id"] = booking_id
+            response = await self.booking_collection.insert_one(document)
+        except Exception:
+            await self._release_room_nights(booking_id)
+            raise
         return response.inserted_id
 
-    async def get_bookings_by_user_id(self, user_id: str) -> list[Booking]:
-        raw_documents = await self.booking_collection.find({"userId": user_id}).to_list(
-            100
+    async def backfill_room_night_claims(self):
+        """Create the claims of bookings made before room nights were tracked."""
+        if await self.room_night_collection.estimated_document_count() > 0:
+            return
+        if await self.booking_collection.estimated_document_count() == 0:
+            return
+
+        logger.info("Backfilling room night claims from existing bookings...")
+        cursor = self.booking_collection.find(
+            {}, {"hotel": 1, "rooms": 1, "from": 1, "to": 1}
+        ).batch_size(1000)
+        async for doc in cursor:
+            if doc["to"] <= doc["from"]:
+                # stored before the dates were validated, it has no night to claim
+                logger.warning(f"Booking {doc['_id']} ends before it starts, skipped")
+                continue
+            claims = [
+                {
+                    "hotel": doc["hotel"],
+                    "roomId": room_id,
+                    "night": night,
+                    "bookingId": doc["_id"],
+                }
+                for room_id in doc.get("rooms", [])
+                for night in room_nights(doc["from"], doc["to"])
+            ]
+            if not claims:
+                continue
+            try:
+                await self.room_night_collection.insert_many(claims, ordered=False)
+            except BulkWriteError:
+                # bookings that already overlapped before the unique index existed
+                logger.warning(
+                    f"Booking {doc['_id']} overlaps an earlier booking, skipped its duplicate nights"
+                )
+
+    async def get_bookings_by_user_id(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Booking]:
+        return await find_page(
+            self.booking_collection,
+            {"userId": user_id},
+            limit,
+            after,
+            lambda doc: Booking(**doc),
         )
-        if raw_documents:
-            bookings = [Booking(**doc) for doc in raw_documents]
-            return bookings
-        return []
+
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        user_id: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        return await find_page(
+            self.booking_collection,
+            {"userId": user_id} if user_id is not None else {},
+            limit,
+            after,
+            with_str_id,
+            projection=to_projection(fields),
+        )
+
+    async def stream_bookings(
+        self,
+        start_date: Optional[datetime.datetime] = None,
+        end_date: Optional[datetime.datetime] = None,
+        hotel_id: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[dict]]:
+        query = {}
+        # a stay overlaps [start_date, end_date) when it starts before the end and ends after the start
+        if start_date:
+            query["to"] = {"$gt": start_date}
+        if end_date:
+            query["from"] = {"$lt": end_date}
+        if hotel_id:
+            query["hotel"] = hotel_id
+
+        cursor = self.booking_collection.find(query).sort("_id", 1).batch_size(batch_size)
+        while True:
+            batch = await cursor.to_list(batch_size)
+            if not batch:
+                break
+            yield batch
+
+    async def iter_room_reservations(self) -> AsyncIterator[RoomReservation]:
+        cursor = self.booking_collection.find(
+            {}, {"_id": 0, "hotel": 1, "rooms": 1, "from": 1, "to": 1}
+        ).batch_size(1000)
+        async for doc in cursor:
+            yield RoomReservation(
+                hotel_id=doc["hotel"],
+                rooms=doc.get("rooms", []),
+                start_date=doc["from"],
+                end_date=doc["to"],
+            )
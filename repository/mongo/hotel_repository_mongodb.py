@@ -1,15 +1,64 @@
-from ..hotel_repository import IHotelRepository
-from typing import Optional
+from ..hotel_repository import CATALOG_COUNTER, IHotelRepository
+from typing import Optional, Sequence
 from models.hotel import Hotel
+from schemas.hotel.request.hotel_search_request import HotelSearchRequest
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import ReturnDocument
 from config.py_object_id import PyObjectId
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.mongo.pagination_mongodb import find_page
+from repository.mongo.projection_mongodb import to_projection, with_str_id
+
+
+# stored fields an update replaces, the others are managed by the repository
+_REPLACED_FIELDS = [
+    field.alias or name
+    for name, field in Hotel.model_fields.items()
+    if name not in ("id", "version")
+]
+
+
+def _replace_update(document: dict) -> dict:
+    """Update with the effect of replacing the hotel by `document`, bumping its version."""
+    update = {"$set": document, "$inc": {"version": 1}}
+    missing = [key for key in _REPLACED_FIELDS if key not in document]
+    if missing:
+        update["$unset"] = dict.fromkeys(missing, "")
+    return update
+
+
+def _search_query(criteria: HotelSearchRequest) -> dict:
+    query = {}
+    if criteria.city:
+        query["address.city"] = criteria.city
+    if criteria.province:
+        query["address.province"] = criteria.province
+    if criteria.is_active is not None:
+        query["isActive"] = criteria.is_active
+    if criteria.tags:
+        query["tags"] = {"$all": criteria.tags}
+
+    # $elemMatch so that capacity and price are matched on the same room
+    room_query = {}
+    if criteria.min_sleeps is not None:
+        room_query["sleepsCount"] = {"$gte": criteria.min_sleeps}
+    if criteria.min_rate is not None or criteria.max_rate is not None:
+        room_query["baseRate"] = {}
+        if criteria.min_rate is not None:
+            room_query["baseRate"]["$gte"] = criteria.min_rate
+        if criteria.max_rate is not None:
+            room_query["baseRate"]["$lte"] = criteria.max_rate
+    if room_query:
+        query["rooms"] = {"$elemMatch": room_query}
+    return query
 
 
 class HotelRepositoryMongoDB(IHotelRepository):
     def __init__(self, db: AsyncIOMotorDatabase):
         self.hotel_collection = db.get_collection("hotels")
         self.booking_collection = db.get_collection("bookings")
+        self.counter_collection = db.get_collection("counters")
 
     async def get_by_id(self, hotel_id: str) -> Optional[Hotel]:
         hotel = await self.hotel_collection.find_one(
@@ -20,19 +69,85 @@ class HotelRepositoryMongoDB(IHotelRepository):
             return Hotel(**hotel)
         return None
 
-    async def find_all(self) -> list[Hotel]:
-        raw_documents = await self.hotel_collection.find().to_list(100)
-        if raw_documents:
-            hotels = [Hotel(**doc) for doc in raw_documents]
-            return hotels
-        return []
+    async def exists_by_id(self, hotel_id: str) -> bool:
+        hotel = await self.hotel_collection.find_one(
+            {"_id": ObjectId(hotel_id)}, {"_id": 1}
+        )
+        return hotel is not None
+
+    async def get_version(self, hotel_id: str) -> Optional[int]:
+        hotel = await self.hotel_collection.find_one(
+            {"_id": ObjectId(hotel_id)}, {"version": 1}
+        )
+        if hotel:
+            return hotel.get("version", 0)
+        return None
+
+    async def get_catalog_version(self) -> int:
+        counter = await self.counter_collection.find_one({"_id": CATALOG_COUNTER})
+        return counter["version"] if counter else 0
 
-    async def update(self, hotel_id: str, hotel_data: Hotel) -> int:
-        response = await self.hotel_collection.replace_one(
+    async def get_fields_by_id(
+        self, hotel_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        hotel = await self.hotel_collection.find_one(
+            {"_id": ObjectId(hotel_id)}, to_projection(fields)
+        )
+        return with_str_id(hotel)
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Hotel]:
+        return await find_page(
+            self.hotel_collection, {}, limit, after, lambda doc: Hotel(**doc)
+        )
+
+    async def search(
+        self,
+        criteria: HotelSearchRequest,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Hotel]:
+        query = _search_query(criteria)
+        return await find_page(
+            self.hotel_collection, query, limit, after, lambda doc: Hotel(**doc)
+        )
+
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        criteria: Optional[HotelSearchRequest] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        return await find_page(
+            self.hotel_collection,
+            _search_query(criteria) if criteria else {},
+            limit,
+            after,
+            with_str_id,
+            projection=to_projection(fields),
+        )
+
+    async def update(self, hotel_id: str, hotel_data: Hotel) -> Optional[Hotel]:
+        # replace, bump the version and read back in a single round trip
+        hotel = await self.hotel_collection.find_one_and_update(
             {"_id": ObjectId(hotel_id)},
-            hotel_data.model_dump(by_alias=True, exclude_unset=True),
+            _replace_update(
+                hotel_data.model_dump(
+                    by_alias=True, exclude_unset=True, exclude={"id", "version"}
+                )
+            ),
+            return_document=ReturnDocument.AFTER,
+        )
+        if not hotel:
+            return None
+
+        # bumped after the hotel, so a catalog version is never newer than the hotels
+        await self.counter_collection.update_one(
+            {"_id": CATALOG_COUNTER}, {"$inc": {"version": 1}}, upsert=True
         )
-        return response.modified_count
+        return Hotel(**hotel)
 
     async def get_hotels_by_user_id(self, user_id: str) -> list[Hotel]:
         pipeline = [
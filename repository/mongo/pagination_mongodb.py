@@ -0,0 +1,35 @@
+from typing import Callable, Optional, TypeVar
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from repository.pagination import Page, decode_cursor, encode_cursor
+
+T = TypeVar("T")
+
+
+async def find_page(
+    collection: AsyncIOMotorCollection,
+    query: dict,
+    limit: int,
+    after: Optional[str],
+    to_model: Callable[[dict], T],
+    projection: Optional[dict] = None,
+) -> Page[T]:
+    """
+    Keyset pagination on `_id`: the cursor turns into an `_id > last_id` range on the
+    index, so every page costs the same as the first one, unlike skip/limit.
+    """
+    if after:
+        query = {**query, "_id": {"$gt": ObjectId(decode_cursor(after))}}
+
+    # fetch one extra document to know whether there is a next page
+    raw_documents = (
+        await collection.find(query, projection)
+        .sort("_id", 1)
+        .limit(limit + 1)
+        .to_list(limit + 1)
+    )
+    has_more = len(raw_documents) > limit
+    raw_documents = raw_documents[:limit]
+
+    next_cursor = encode_cursor(str(raw_documents[-1]["_id"])) if has_more else None
+    return Page(items=[to_model(doc) for doc in raw_documents], next_cursor=next_cursor)
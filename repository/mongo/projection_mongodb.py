@@ -0,0 +1,13 @@
+from typing import Optional, Sequence
+
+
+def to_projection(fields: Sequence[str]) -> dict:
+    """Inclusion projection of the given (stored, aliased) field paths, `_id` is always returned."""
+    # an empty projection would return the whole document
+    return {field: 1 for field in fields} or {"_id": 1}
+
+
+def with_str_id(document: Optional[dict]) -> Optional[dict]:
+    if document is not None and "_id" in document:
+        document["_id"] = str(document["_id"])
+    return document
@@ -1,7 +1,7 @@
-from abc import ABC, abstractmethod
 from typing import Optional
 
 from bson import ObjectId
+from pymongo import ReturnDocument
 from models.refresh_token_in_db import RefreshTokenInDB
 from repository.refresh_token_repository import IRefreshTokenRepository
 from config.py_object_id import PyObjectId
@@ -22,11 +22,8 @@ class RefreshTokenRepositoryMongoDB(IRefreshTokenRepository):
             return RefreshTokenInDB(**token)
         return None
 
-    async def get_by_token(self, token: str) -> Optional[RefreshTokenInDB]:
-        tokenInDB = await self.refresh_token_collection.find_one(
-            {"token": token}  # must convert str to ObjectId
-        )
-        # need to convert raw documents to Hotel instance
+    async def get_by_key(self, key: str) -> Optional[RefreshTokenInDB]:
+        tokenInDB = await self.refresh_token_collection.find_one({"tokenHash": key})
         if tokenInDB:
             return RefreshTokenInDB(**tokenInDB)
         return None
@@ -39,21 +36,38 @@ class RefreshTokenRepositoryMongoDB(IRefreshTokenRepository):
         )
         return response.inserted_id
 
-    async def delete(self, token: str):
-        response = await self.refresh_token_collection.delete_one({"token": token})
+    async def delete(self, key: str) -> int:
+        response = await self.refresh_token_collection.delete_one({"tokenHash": key})
         return response.deleted_count
 
-    async def update(self, token: str, newToken: str) -> int:
+    async def rotate(
+        self, key: str, new_key: str, expired_at: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
         current_time = datetime.datetime.now(datetime.timezone.utc)
-        time_delta = datetime.timedelta(hours=1)
-        response = await self.refresh_token_collection.update_one(
-            {"token": token},
+        # the filter is the claim: of two concurrent rotations only one matches
+        tokenInDB = await self.refresh_token_collection.find_one_and_update(
+            {"tokenHash": key, "expiredAt": {"$gt": current_time}},
             {
                 "$set": {
-                    "token": newToken,
+                    "tokenHash": new_key,
+                    "previousTokenHash": key,
+                    "rotatedAt": current_time,
                     "createdAt": current_time,
-                    "expiredAt": current_time + time_delta,
+                    "expiredAt": expired_at,
                 }
             },
+            return_document=ReturnDocument.AFTER,
         )
-        return response.modified_count
+        if tokenInDB:
+            return RefreshTokenInDB(**tokenInDB)
+        return None
+
+    async def get_by_previous_key(
+        self, key: str, rotated_after: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
+        tokenInDB = await self.refresh_token_collection.find_one(
+            {"previousTokenHash": key, "rotatedAt": {"$gt": rotated_after}}
+        )
+        if tokenInDB:
+            return RefreshTokenInDB(**tokenInDB)
+        return None
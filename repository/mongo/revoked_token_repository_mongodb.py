@@ -0,0 +1,46 @@
+import datetime
+from models.revoked_token import RevokedToken
+from repository.revoked_token_repository import IRevokedTokenRepository
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+class RevokedTokenRepositoryMongoDB(IRevokedTokenRepository):
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.revoked_token_collection = db.get_collection("revokedTokens")
+
+    async def revoke(self, jti: str, expired_at: datetime.datetime) -> bool:
+        # revoking twice keeps the first revokedAt, the filters have seen that one
+        response = await self.revoked_token_collection.update_one(
+            {"jti": jti},
+            {
+                "$setOnInsert": {
+                    "jti": jti,
+                    "revokedAt": datetime.datetime.now(datetime.timezone.utc),
+                    "expiredAt": expired_at,
+                }
+            },
+            upsert=True,
+        )
+        return response.upserted_id is not None
+
+    async def is_revoked(self, jti: str) -> bool:
+        # the TTL monitor only runs every minute, so check the expiry here as well
+        revoked = await self.revoked_token_collection.find_one(
+            {
+                "jti": jti,
+                "expiredAt": {"$gt": datetime.datetime.now(datetime.timezone.utc)},
+            },
+            {"_id": 1},
+        )
+        return revoked is not None
+
+    async def find_revoked_since(
+        self, since: datetime.datetime
+    ) -> list[RevokedToken]:
+        cursor = self.revoked_token_collection.find(
+            {
+                "revokedAt": {"$gte": since},
+                "expiredAt": {"$gt": datetime.datetime.now(datetime.timezone.utc)},
+            }
+        )
+        return [RevokedToken(**revoked) async for revoked in cursor]
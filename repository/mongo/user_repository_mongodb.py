@@ -1,9 +1,15 @@
 from ..user_repository import IUserRepository
-from typing import Optional
+from typing import Optional, Sequence
 from models.user import User
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from config.py_object_id import PyObjectId
+from exceptions.custom_exception import UserAlreadyExistsError
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.mongo.pagination_mongodb import find_page
+from repository.mongo.projection_mongodb import to_projection, with_str_id
 
 
 class UserRepositoryMongoDB(IUserRepository):
@@ -26,26 +32,66 @@ class UserRepositoryMongoDB(IUserRepository):
             return User(**user)
         return None
 
-    async def create_user(self, user: User) -> Optional[PyObjectId]:
-        response = await self.user_collection.insert_one(
-            user.model_dump(by_alias=True, exclude_unset=True)
+    async def exists_by_id(self, user_id: str) -> bool:
+        user = await self.user_collection.find_one(
+            {"_id": ObjectId(user_id)}, {"_id": 1}
+        )
+        return user is not None
+
+    async def exists_by_email(self, email: str) -> bool:
+        # only the indexed field is projected, so the index alone answers the query
+        user = await self.user_collection.find_one(
+            {"email": email}, {"_id": 0, "email": 1}
+        )
+        return user is not None
+
+    async def get_id_by_email(self, email: str) -> Optional[str]:
+        user = await self.user_collection.find_one({"email": email}, {"_id": 1})
+        if user:
+            return str(user["_id"])
+        return None
+
+    async def get_fields_by_id(
+        self, user_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        user = await self.user_collection.find_one(
+            {"_id": ObjectId(user_id)}, to_projection(fields)
         )
+        return with_str_id(user)
+
+    async def create_user(self, user: User) -> Optional[PyObjectId]:
+        # email_unique_index settles registrations racing past exists_by_email
+        try:
+            response = await self.user_collection.insert_one(
+                user.model_dump(by_alias=True, exclude_unset=True)
+            )
+        except DuplicateKeyError:
+            raise UserAlreadyExistsError(f"User with email {user.email} already exists")
         return response.inserted_id
 
-    async def find_all(self) -> list[User]:
-        raw_documents = await self.user_collection.find().to_list(100)
-        if raw_documents:
-            users = [User(**doc) for doc in raw_documents]
-            return users
-        return []
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[User]:
+        return await find_page(
+            self.user_collection, {}, limit, after, lambda doc: User(**doc)
+        )
 
-    async def delete(self, user_id: str):
+    async def delete(self, user_id: str) -> int:
         response = await self.user_collection.delete_one({"_id": ObjectId(user_id)})
         return response.deleted_count
 
-    async def update(self, user_id: str, user_data: User) -> int:
-        response = await self.user_collection.replace_one(
-            {"_id": ObjectId(user_id)},
-            user_data.model_dump(by_alias=True, exclude_unset=True),
-        )
-        return response.modified_count
+    async def update(self, user_id: str, user_data: User) -> Optional[User]:
+        # replace and read back in a single round trip
+        try:
+            user = await self.user_collection.find_one_and_replace(
+                {"_id": ObjectId(user_id)},
+                user_data.model_dump(by_alias=True, exclude_unset=True),
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            raise UserAlreadyExistsError(
+                f"User with email {user_data.email} already exists"
+            )
+        if user:
+            return User(**user)
+        return None
@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Generic, Optional, TypeVar
+from bson import ObjectId
+from exceptions.custom_exception import InvalidCursorError
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset (cursor) paginated query ordered by `_id`."""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(last_id: str) -> str:
+    """Build the opaque cursor pointing right after the document with `last_id`."""
+    payload = json.dumps({"id": str(last_id)}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Return the `_id` (hex string) a cursor points after, raise InvalidCursorError otherwise."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}")
+
+    if not isinstance(last_id, str) or not ObjectId.is_valid(last_id):
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}")
+    return last_id
@@ -0,0 +1,34 @@
+from typing import Optional, Sequence
+
+
+def _project_path(target: dict, source: dict, path: list[str]):
+    key = path[0]
+    if key not in source:
+        return
+    value = source[key]
+    if len(path) == 1:
+        target[key] = value
+    elif isinstance(value, dict):
+        nested = target.setdefault(key, {})
+        _project_path(nested, value, path[1:])
+    elif isinstance(value, list):
+        # a path into an array of documents projects every document of the array
+        elements = [element for element in value if isinstance(element, dict)]
+        projected = target.setdefault(key, [{} for _ in elements])
+        for nested, element in zip(projected, elements):
+            _project_path(nested, element, path[1:])
+
+
+def project(document: Optional[dict], fields: Sequence[str]) -> Optional[dict]:
+    """
+    Inclusion projection of the given (stored, aliased) field paths, like a MongoDB
+    projection: dotted paths keep their nesting, reach into arrays of documents and
+    `_id` is always returned.
+    """
+    if document is None:
+        return None
+
+    projected = {"_id": document["_id"]}
+    for field in fields:
+        _project_path(projected, document, field.split("."))
+    return projected
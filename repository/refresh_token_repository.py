@@ -1,16 +1,19 @@
 from abc import ABC, abstractmethod
 from typing import Optional
+import datetime
 from models.refresh_token_in_db import RefreshTokenInDB
 from config.py_object_id import PyObjectId
 
 
 class IRefreshTokenRepository(ABC):
+    """Refresh tokens are stored and looked up by their key, see AuthUtils.token_key."""
+
     @abstractmethod
     async def get_by_id(self, user_id: str) -> Optional[RefreshTokenInDB]:
         pass
 
     @abstractmethod
-    async def get_by_token(self, token: str) -> Optional[RefreshTokenInDB]:
+    async def get_by_key(self, key: str) -> Optional[RefreshTokenInDB]:
         pass
 
     @abstractmethod
@@ -20,9 +23,22 @@ class IRefreshTokenRepository(ABC):
         pass
 
     @abstractmethod
-    async def delete(self, token: str):
+    async def delete(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    async def rotate(
+        self, key: str, new_key: str, expired_at: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
+        """
+        Replace the live token `key` by `new_key` in one conditional write, remembering
+        `key` as the previous one. None if `key` is not live, e.g. it was rotated already.
+        """
         pass
 
     @abstractmethod
-    async def update(self, token: str, newToken: str) -> int:
+    async def get_by_previous_key(
+        self, key: str, rotated_after: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
+        """The live token that replaced `key`, if that happened after `rotated_after`."""
         pass
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+import datetime
+from models.revoked_token import RevokedToken
+
+
+class IRevokedTokenRepository(ABC):
+    """
+    Access tokens revoked before their `exp`, by jti. An entry expires with its token,
+    like the refresh tokens.
+    """
+
+    @abstractmethod
+    async def revoke(self, jti: str, expired_at: datetime.datetime) -> bool:
+        """Revoke the token `jti` until `expired_at`, False if already revoked."""
+        pass
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def find_revoked_since(
+        self, since: datetime.datetime
+    ) -> list[RevokedToken]:
+        """The live revocations made at or after `since`, all of them for the epoch."""
+        pass
@@ -0,0 +1,189 @@
+from ..booking_repository import IBookingRepository, room_nights
+from typing import AsyncIterator, Optional, Sequence
+import datetime
+import json
+import sqlite3
+from bson import ObjectId
+from models.booking import Booking
+from models.room_reservation import RoomReservation
+from config.py_object_id import PyObjectId
+from exceptions.custom_exception import BookingConflictError
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.projection import project
+from repository.sql.pagination_sqlite import fetch_page
+from repository.sql.pool_sqlite import SQLitePool, decode_datetime, encode_datetime
+
+
+def _to_document(row: sqlite3.Row) -> dict:
+    return {
+        "_id": row["id"],
+        "hotel": row["hotel_id"],
+        "from": decode_datetime(row["start_date"]),
+        "to": decode_datetime(row["end_date"]),
+        "duration": row["duration"],
+        "numberOfGuest": row["number_of_guest"],
+        "rooms": json.loads(row["rooms"]),
+        "totalPrice": row["total_price"],
+        "clientInfo": json.loads(row["client_info"]),
+        "cardInfo": json.loads(row["card_info"]),
+        "userId": row["user_id"],
+        "time": decode_datetime(row["created_time"]),
+    }
+
+
+class BookingRepositorySQLite(IBookingRepository):
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+
+    async def _get_row(self, booking_id: str) -> Optional[sqlite3.Row]:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT * FROM bookings WHERE id = ?", (booking_id,)
+            ) as cursor:
+                return await cursor.fetchone()
+
+    async def _find_page(
+        self,
+        where: Sequence[str],
+        params: Sequence,
+        limit: int,
+        after: Optional[str],
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page:
+        """A page of bookings, or of booking documents with only `fields` if given."""
+        async with self.pool.connection() as connection:
+            rows, next_cursor = await fetch_page(
+                connection, "SELECT * FROM bookings", where, params, limit, after
+            )
+        if fields is None:
+            items = [Booking(**_to_document(row)) for row in rows]
+        else:
+            items = [project(_to_document(row), fields) for row in rows]
+        return Page(items=items, next_cursor=next_cursor)
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Booking]:
+        return await self._find_page([], [], limit, after)
+
+    async def get_by_id(self, booking_id: str) -> Optional[Booking]:
+        row = await self._get_row(booking_id)
+        if row:
+            return Booking(**_to_document(row))
+        return None
+
+    async def exists_by_id(self, booking_id: str) -> bool:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT 1 FROM bookings WHERE id = ?", (booking_id,)
+            ) as cursor:
+                return await cursor.fetchone() is not None
+
+    async def get_fields_by_id(
+        self, booking_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        row = await self._get_row(booking_id)
+        return project(_to_document(row), fields) if row else None
+
+    async def create_booking(self, booking: Booking) -> Optional[PyObjectId]:
+        booking_id = str(ObjectId())
+        document = booking.model_dump(by_alias=True, exclude_unset=True)
+        nights = [
+            (booking_id, booking.hotel_id, room_id, encode_datetime(night))
+            for room_id in booking.rooms
+            for night in room_nights(booking.start_date, booking.end_date)
+        ]
+        try:
+            # the booking and its room nights commit together, the unique key on
+            # (hotel, room, night) rolls both back if any night is already taken
+            async with self.pool.transaction() as connection:
+                await connection.execute(
+                    "INSERT INTO bookings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        booking_id,
+                        booking.hotel_id,
+                        booking.user_id,
+                        encode_datetime(booking.start_date),
+                        encode_datetime(booking.end_date),
+                        booking.duration,
+                        booking.number_of_guest,
+                        json.dumps(booking.rooms),
+                        booking.total_price,
+                        json.dumps(document["clientInfo"]),
+                        json.dumps(document["cardInfo"]),
+                        encode_datetime(booking.created_time),
+                    ),
+                )
+                await connection.executemany(
+                    "INSERT INTO booked_room_nights VALUES (?, ?, ?, ?)", nights
+                )
+        except sqlite3.IntegrityError as e:
+            if "booked_room_nights" not in str(e):
+                raise
+            raise BookingConflictError(
+                f"Rooms {booking.rooms} of hotel {booking.hotel_id} are already booked for the requested dates"
+            )
+        return booking_id
+
+    async def get_bookings_by_user_id(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Booking]:
+        return await self._find_page(["user_id = ?"], [user_id], limit, after)
+
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        user_id: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        where, params = (["user_id = ?"], [user_id]) if user_id is not None else ([], [])
+        return await self._find_page(where, params, limit, after, fields)
+
+    async def stream_bookings(
+        self,
+        start_date: Optional[datetime.datetime] = None,
+        end_date: Optional[datetime.datetime] = None,
+        hotel_id: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[dict]]:
+        where, params = [], []
+        # a stay overlaps [start_date, end_date) when it starts before the end and ends after the start
+        if start_date:
+            where.append("end_date > ?")
+            params.append(encode_datetime(start_date))
+        if end_date:
+            where.append("start_date < ?")
+            params.append(encode_datetime(end_date))
+        if hotel_id:
+            where.append("hotel_id = ?")
+            params.append(hotel_id)
+
+        after = None
+        while True:
+            # every batch is a separate keyset query, so no connection is held while the client reads
+            async with self.pool.connection() as connection:
+                rows, after = await fetch_page(
+                    connection, "SELECT * FROM bookings", where, params, batch_size, after
+                )
+            if rows:
+                yield [_to_document(row) for row in rows]
+            if after is None:
+                break
+
+    async def iter_room_reservations(self) -> AsyncIterator[RoomReservation]:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT hotel_id, rooms, start_date, end_date FROM bookings"
+            ) as cursor:
+                rows = await cursor.fetchall()
+        for row in rows:
+            yield RoomReservation(
+                hotel_id=row["hotel_id"],
+                rooms=json.loads(row["rooms"]),
+                start_date=decode_datetime(row["start_date"]),
+                end_date=decode_datetime(row["end_date"]),
+            )
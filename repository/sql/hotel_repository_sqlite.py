@@ -0,0 +1,324 @@
+from ..hotel_repository import CATALOG_COUNTER, IHotelRepository
+from typing import Iterable, Optional, Sequence
+import json
+import sqlite3
+from bson import ObjectId
+import aiosqlite
+from models.hotel import Hotel
+from schemas.hotel.request.hotel_search_request import HotelSearchRequest
+from config.py_object_id import PyObjectId
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.projection import project
+from repository.sql.pagination_sqlite import fetch_page
+from repository.sql.pool_sqlite import SQLitePool
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+async def _load_documents(
+    connection: aiosqlite.Connection,
+    hotel_rows: Sequence[sqlite3.Row],
+    tags: bool = True,
+    rooms: bool = True,
+) -> list[dict]:
+    """
+    Assemble hotel documents, with the tags and rooms of all of them read in one query
+    each. `tags` / `rooms` False skips the query and leaves the list empty.
+    """
+    if not hotel_rows:
+        return []
+
+    documents = {}
+    for row in hotel_rows:
+        documents[row["id"]] = {
+            "_id": row["id"],
+            "hotelName": row["hotel_name"],
+            "isActive": bool(row["is_active"]),
+            "description": row["description"],
+            "tags": [],
+            "photo": row["photo"],
+            "rating": row["rating"],
+            "address": {
+                "street": row["street"],
+                "city": row["city"],
+                "province": row["province"],
+                "postalCode": row["postal_code"],
+                "country": row["country"],
+            },
+            "rooms": [],
+            "version": row["version"],
+        }
+
+    ids = list(documents)
+    if tags:
+        await _load_tags(connection, ids, documents)
+    if rooms:
+        await _load_rooms(connection, ids, documents)
+    return list(documents.values())
+
+
+async def _load_tags(connection: aiosqlite.Connection, ids: list[str], documents: dict):
+    async with connection.execute(
+        f"SELECT hotel_id, tag FROM hotel_tags WHERE hotel_id IN ({_placeholders(len(ids))}) "
+        "ORDER BY hotel_id, position",
+        ids,
+    ) as cursor:
+        async for row in cursor:
+            documents[row["hotel_id"]]["tags"].append(row["tag"])
+
+
+async def _load_rooms(connection: aiosqlite.Connection, ids: list[str], documents: dict):
+    async with connection.execute(
+        f"SELECT * FROM rooms WHERE hotel_id IN ({_placeholders(len(ids))}) "
+        "ORDER BY hotel_id, position",
+        ids,
+    ) as cursor:
+        async for row in cursor:
+            documents[row["hotel_id"]]["rooms"].append(
+                {
+                    "description": row["description"],
+                    "isActive": bool(row["is_active"]),
+                    "type": row["type"],
+                    "baseRate": row["base_rate"],
+                    "bedOptions": row["bed_options"],
+                    "sleepsCount": row["sleeps_count"],
+                    "tags": json.loads(row["tags"]),
+                    "roomId": row["room_id"],
+                }
+            )
+
+
+def _selects(fields: Sequence[str], key: str) -> bool:
+    return any(field == key or field.startswith(key + ".") for field in fields)
+
+
+async def _write_hotel(
+    connection: aiosqlite.Connection, hotel_id: str, document: dict, version: int
+):
+    address = document["address"]
+    await connection.execute(
+        "INSERT INTO hotels VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            hotel_id,
+            document["hotelName"],
+            int(document.get("isActive", True)),
+            document["description"],
+            document["photo"],
+            document["rating"],
+            address["street"],
+            address["city"],
+            address["province"],
+            address["postalCode"],
+            address["country"],
+            version,
+        ),
+    )
+    await connection.executemany(
+        "INSERT INTO hotel_tags VALUES (?, ?, ?)",
+        [(hotel_id, position, tag) for position, tag in enumerate(document["tags"])],
+    )
+    await connection.executemany(
+        "INSERT INTO rooms VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                hotel_id,
+                position,
+                room["roomId"],
+                room["description"],
+                int(room.get("isActive", True)),
+                room["type"],
+                room["baseRate"],
+                room["bedOptions"],
+                room["sleepsCount"],
+                json.dumps(room["tags"]),
+            )
+            for position, room in enumerate(document["rooms"])
+        ],
+    )
+
+
+def _search_conditions(criteria: HotelSearchRequest) -> tuple[list[str], list]:
+    where, params = [], []
+    if criteria.city:
+        where.append("city = ?")
+        params.append(criteria.city)
+    if criteria.province:
+        where.append("province = ?")
+        params.append(criteria.province)
+    if criteria.is_active is not None:
+        where.append("is_active = ?")
+        params.append(int(criteria.is_active))
+    for tag in criteria.tags:
+        where.append(
+            "EXISTS (SELECT 1 FROM hotel_tags t WHERE t.hotel_id = hotels.id AND t.tag = ?)"
+        )
+        params.append(tag)
+
+    # capacity and price are matched on the same room, like $elemMatch
+    room_where, room_params = [], []
+    if criteria.min_sleeps is not None:
+        room_where.append("r.sleeps_count >= ?")
+        room_params.append(criteria.min_sleeps)
+    if criteria.min_rate is not None:
+        room_where.append("r.base_rate >= ?")
+        room_params.append(criteria.min_rate)
+    if criteria.max_rate is not None:
+        room_where.append("r.base_rate <= ?")
+        room_params.append(criteria.max_rate)
+    if room_where:
+        where.append(
+            "EXISTS (SELECT 1 FROM rooms r WHERE r.hotel_id = hotels.id AND "
+            + " AND ".join(room_where)
+            + ")"
+        )
+        params.extend(room_params)
+    return where, params
+
+
+class HotelRepositorySQLite(IHotelRepository):
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+
+    async def _get_document(self, hotel_id: str) -> Optional[dict]:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT * FROM hotels WHERE id = ?", (hotel_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                return None
+            return (await _load_documents(connection, [row]))[0]
+
+    async def get_by_id(self, hotel_id: str) -> Optional[Hotel]:
+        hotel = await self._get_document(hotel_id)
+        if hotel:
+            return Hotel(**hotel)
+        return None
+
+    async def exists_by_id(self, hotel_id: str) -> bool:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT 1 FROM hotels WHERE id = ?", (hotel_id,)
+            ) as cursor:
+                return await cursor.fetchone() is not None
+
+    async def get_version(self, hotel_id: str) -> Optional[int]:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT version FROM hotels WHERE id = ?", (hotel_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return row["version"] if row else None
+
+    async def get_catalog_version(self) -> int:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT version FROM counters WHERE name = ?", (CATALOG_COUNTER,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return row["version"] if row else 0
+
+    async def get_fields_by_id(
+        self, hotel_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        return project(await self._get_document(hotel_id), fields)
+
+    async def _find_page(
+        self,
+        where: Sequence[str],
+        params: Sequence,
+        limit: int,
+        after: Optional[str],
+        fields: Optional[Sequence[str]] = None,
+    ) -> Page[dict]:
+        """A page of hotel documents, only loading tags and rooms if `fields` selects them."""
+        async with self.pool.connection() as connection:
+            rows, next_cursor = await fetch_page(
+                connection, "SELECT * FROM hotels", where, params, limit, after
+            )
+            if fields is None:
+                documents = await _load_documents(connection, rows)
+            else:
+                documents = await _load_documents(
+                    connection,
+                    rows,
+                    tags=_selects(fields, "tags"),
+                    rooms=_selects(fields, "rooms"),
+                )
+                documents = [project(doc, fields) for doc in documents]
+        return Page(items=documents, next_cursor=next_cursor)
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[Hotel]:
+        page = await self._find_page([], [], limit, after)
+        return Page(
+            items=[Hotel(**doc) for doc in page.items], next_cursor=page.next_cursor
+        )
+
+    async def search(
+        self,
+        criteria: HotelSearchRequest,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[Hotel]:
+        where, params = _search_conditions(criteria)
+        page = await self._find_page(where, params, limit, after)
+        return Page(
+            items=[Hotel(**doc) for doc in page.items], next_cursor=page.next_cursor
+        )
+
+    async def find_fields(
+        self,
+        fields: Sequence[str],
+        criteria: Optional[HotelSearchRequest] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Page[dict]:
+        where, params = _search_conditions(criteria) if criteria else ([], [])
+        return await self._find_page(where, params, limit, after, fields)
+
+    async def insert_many(self, documents: Iterable[dict]) -> list[PyObjectId]:
+        """Insert stored (aliased) hotel documents in one transaction, used to seed the catalog."""
+        hotel_ids = []
+        async with self.pool.transaction() as connection:
+            for document in documents:
+                hotel_id = str(document.get("_id") or ObjectId())
+                await _write_hotel(
+                    connection, hotel_id, document, document.get("version", 0)
+                )
+                hotel_ids.append(hotel_id)
+        return hotel_ids
+
+    async def update(self, hotel_id: str, hotel_data: Hotel) -> Optional[Hotel]:
+        document = hotel_data.model_dump(by_alias=True, exclude_unset=True)
+        async with self.pool.transaction() as connection:
+            # deleting the hotel cascades to its tags and rooms, which are then written again
+            async with connection.execute(
+                "DELETE FROM hotels WHERE id = ? RETURNING version", (hotel_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                return None
+            await _write_hotel(connection, hotel_id, document, row["version"] + 1)
+            await connection.execute(
+                "INSERT INTO counters VALUES (?, 1) "
+                "ON CONFLICT (name) DO UPDATE SET version = version + 1",
+                (CATALOG_COUNTER,),
+            )
+
+        return await self.get_by_id(hotel_id)
+
+    async def get_hotels_by_user_id(self, user_id: str) -> list[Hotel]:
+        # distinct hotels of the user's bookings, hotels deleted since are skipped
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT * FROM hotels WHERE id IN "
+                "(SELECT hotel_id FROM bookings WHERE user_id = ?) ORDER BY id",
+                (user_id,),
+            ) as cursor:
+                rows = await cursor.fetchall()
+            documents = await _load_documents(connection, rows)
+        return [Hotel(**doc) for doc in documents]
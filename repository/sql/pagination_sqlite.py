@@ -0,0 +1,39 @@
+from typing import Optional, Sequence
+import aiosqlite
+from repository.pagination import decode_cursor, encode_cursor
+
+
+async def fetch_page(
+    connection: aiosqlite.Connection,
+    select: str,
+    where: Sequence[str],
+    params: Sequence,
+    limit: int,
+    after: Optional[str],
+    id_column: str = "id",
+) -> tuple[list[aiosqlite.Row], Optional[str]]:
+    """
+    Keyset pagination on the id with the same cursors as the MongoDB repositories:
+    `id > last_id ORDER BY id` is a range on the primary key (or the tail of a search index).
+    Returns the rows of the page and the cursor of the next one.
+    """
+    where = list(where)
+    params = list(params)
+    if after:
+        where.append(f"{id_column} > ?")
+        params.append(decode_cursor(after))
+
+    sql = select
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    # fetch one extra row to know whether there is a next page
+    sql += f" ORDER BY {id_column} LIMIT ?"
+    params.append(limit + 1)
+
+    async with connection.execute(sql, params) as cursor:
+        rows = await cursor.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1]["id"]) if has_more else None
+    return rows, next_cursor
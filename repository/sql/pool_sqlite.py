@@ -0,0 +1,75 @@
+import asyncio
+import datetime
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import aiosqlite
+
+# Every connection runs in autocommit mode; writes that must be atomic open an explicit
+# BEGIN IMMEDIATE, which takes the single SQLite write lock up front instead of
+# failing on a lock upgrade halfway through.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def encode_datetime(value: Optional[datetime.datetime]) -> Optional[str]:
+    """Naive UTC in a fixed-width format, so string order is time order."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def decode_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    return datetime.datetime.fromisoformat(value) if value is not None else None
+
+
+class SQLitePool:
+    """
+    A fixed set of aiosqlite connections (each with its own thread) handed out one
+    request at a time. With WAL, readers on the other connections never wait for the writer.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._connections: list[aiosqlite.Connection] = []
+
+    async def open(self):
+        for _ in range(self.size):
+            connection = await aiosqlite.connect(self.path, isolation_level=None)
+            connection.row_factory = aiosqlite.Row
+            for pragma in _PRAGMAS:
+                await connection.execute(pragma)
+            self._connections.append(connection)
+            self._idle.put_nowait(connection)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        connection = await self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put_nowait(connection)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with self.connection() as connection:
+            await connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                await connection.execute("ROLLBACK")
+                raise
+            await connection.execute("COMMIT")
+
+    async def close(self):
+        for connection in self._connections:
+            await connection.close()
+        self._connections.clear()
+        self._idle = asyncio.Queue()
@@ -0,0 +1,125 @@
+import datetime
+import sqlite3
+from typing import Optional
+from bson import ObjectId
+from models.refresh_token_in_db import RefreshTokenInDB
+from repository.refresh_token_repository import IRefreshTokenRepository
+from config.py_object_id import PyObjectId
+from repository.sql.pool_sqlite import SQLitePool, decode_datetime, encode_datetime
+
+
+def _now() -> str:
+    return encode_datetime(datetime.datetime.now(datetime.timezone.utc))
+
+
+def _to_document(row: sqlite3.Row) -> dict:
+    return {
+        "_id": row["id"],
+        "userId": row["user_id"],
+        "tokenHash": row["token_hash"],
+        "previousTokenHash": row["previous_token_hash"],
+        "rotatedAt": decode_datetime(row["rotated_at"]),
+        "createdAt": decode_datetime(row["created_at"]),
+        "expiredAt": decode_datetime(row["expired_at"]),
+    }
+
+
+class RefreshTokenRepositorySQLite(IRefreshTokenRepository):
+    """
+    Refresh tokens expire at their `expiredAt`, like the TTL index in MongoDB:
+    expired rows are invisible to reads and deleted whenever a token is created.
+    """
+
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+
+    async def _fetch_one(self, sql: str, params: tuple) -> Optional[sqlite3.Row]:
+        async with self.pool.connection() as connection:
+            async with connection.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+
+    async def get_by_id(self, token_id: str) -> Optional[RefreshTokenInDB]:
+        row = await self._fetch_one(
+            "SELECT * FROM refresh_tokens WHERE id = ? AND expired_at > ?",
+            (token_id, _now()),
+        )
+        if row:
+            return RefreshTokenInDB(**_to_document(row))
+        return None
+
+    async def get_by_key(self, key: str) -> Optional[RefreshTokenInDB]:
+        row = await self._fetch_one(
+            "SELECT * FROM refresh_tokens WHERE token_hash = ? AND expired_at > ?",
+            (key, _now()),
+        )
+        if row:
+            return RefreshTokenInDB(**_to_document(row))
+        return None
+
+    async def create_refresh_token(
+        self, tokenInDB: RefreshTokenInDB
+    ) -> Optional[PyObjectId]:
+        token_id = str(ObjectId())
+        async with self.pool.connection() as connection:
+            await connection.execute(
+                "DELETE FROM refresh_tokens WHERE expired_at <= ?", (_now(),)
+            )
+            await connection.execute(
+                "INSERT INTO refresh_tokens VALUES (?, ?, ?, NULL, NULL, ?, ?)",
+                (
+                    token_id,
+                    tokenInDB.user_id,
+                    tokenInDB.token_hash,
+                    encode_datetime(tokenInDB.created_at),
+                    encode_datetime(tokenInDB.expired_at),
+                ),
+            )
+        return token_id
+
+    async def delete(self, key: str) -> int:
+        async with self.pool.connection() as connection:
+            cursor = await connection.execute(
+                "DELETE FROM refresh_tokens WHERE token_hash = ?", (key,)
+            )
+            return cursor.rowcount
+
+    async def rotate(
+        self, key: str, new_key: str, expired_at: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
+        current_time = encode_datetime(datetime.datetime.now(datetime.timezone.utc))
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                """
+                UPDATE refresh_tokens
+                SET token_hash = ?, previous_token_hash = token_hash, rotated_at = ?,
+                    created_at = ?, expired_at = ?
+                WHERE token_hash = ? AND expired_at > ?
+                RETURNING *
+                """,
+                (
+                    new_key,
+                    current_time,
+                    current_time,
+                    encode_datetime(expired_at),
+                    key,
+                    current_time,
+                ),
+            ) as cursor:
+                row = await cursor.fetchone()
+        if row:
+            return RefreshTokenInDB(**_to_document(row))
+        return None
+
+    async def get_by_previous_key(
+        self, key: str, rotated_after: datetime.datetime
+    ) -> Optional[RefreshTokenInDB]:
+        row = await self._fetch_one(
+            """
+            SELECT * FROM refresh_tokens
+            WHERE previous_token_hash = ? AND rotated_at > ? AND expired_at > ?
+            """,
+            (key, encode_datetime(rotated_after), _now()),
+        )
+        if row:
+            return RefreshTokenInDB(**_to_document(row))
+        return None
@@ -0,0 +1,59 @@
+import datetime
+import sqlite3
+from models.revoked_token import RevokedToken
+from repository.revoked_token_repository import IRevokedTokenRepository
+from repository.sql.pool_sqlite import SQLitePool, decode_datetime, encode_datetime
+
+
+def _now() -> str:
+    return encode_datetime(datetime.datetime.now(datetime.timezone.utc))
+
+
+def _to_document(row: sqlite3.Row) -> dict:
+    return {
+        "jti": row["jti"],
+        "revokedAt": decode_datetime(row["revoked_at"]),
+        "expiredAt": decode_datetime(row["expired_at"]),
+    }
+
+
+class RevokedTokenRepositorySQLite(IRevokedTokenRepository):
+    """
+    Revocations expire at their `expiredAt`: expired rows are invisible to reads and
+    deleted whenever a token is revoked.
+    """
+
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+
+    async def revoke(self, jti: str, expired_at: datetime.datetime) -> bool:
+        current_time = _now()
+        async with self.pool.connection() as connection:
+            await connection.execute(
+                "DELETE FROM revoked_tokens WHERE expired_at <= ?", (current_time,)
+            )
+            # revoking twice keeps the first revoked_at, the filters have seen that one
+            cursor = await connection.execute(
+                "INSERT INTO revoked_tokens VALUES (?, ?, ?) ON CONFLICT DO NOTHING",
+                (jti, current_time, encode_datetime(expired_at)),
+            )
+            return cursor.rowcount == 1
+
+    async def is_revoked(self, jti: str) -> bool:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT 1 FROM revoked_tokens WHERE jti = ? AND expired_at > ?",
+                (jti, _now()),
+            ) as cursor:
+                return await cursor.fetchone() is not None
+
+    async def find_revoked_since(
+        self, since: datetime.datetime
+    ) -> list[RevokedToken]:
+        async with self.pool.connection() as connection:
+            async with connection.execute(
+                "SELECT * FROM revoked_tokens WHERE revoked_at >= ? AND expired_at > ?",
+                (encode_datetime(since), _now()),
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return [RevokedToken(**_to_document(row)) for row in rows]
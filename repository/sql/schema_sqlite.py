@@ -0,0 +1,119 @@
+import aiosqlite
+
+# Ids are ObjectId hex strings, so ids, cursors and exports look the same as with MongoDB.
+# Value objects that are only ever read whole (client and card info, room tags) are JSON text.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    password TEXT NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    client_info TEXT,
+    card_info TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS email_unique_index ON users (email);
+
+CREATE TABLE IF NOT EXISTS hotels (
+    id TEXT PRIMARY KEY,
+    hotel_name TEXT NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    description TEXT NOT NULL,
+    photo TEXT NOT NULL,
+    rating REAL NOT NULL,
+    street TEXT NOT NULL,
+    city TEXT NOT NULL,
+    province TEXT NOT NULL,
+    postal_code TEXT NOT NULL,
+    country TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+-- equality fields first, id last so the keyset pagination order comes from the index
+CREATE INDEX IF NOT EXISTS city_active_search_index ON hotels (city, is_active, id);
+CREATE INDEX IF NOT EXISTS province_active_search_index ON hotels (province, is_active, id);
+
+CREATE TABLE IF NOT EXISTS hotel_tags (
+    hotel_id TEXT NOT NULL REFERENCES hotels (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (hotel_id, position)
+);
+CREATE INDEX IF NOT EXISTS tags_search_index ON hotel_tags (tag, hotel_id);
+
+CREATE TABLE IF NOT EXISTS rooms (
+    hotel_id TEXT NOT NULL REFERENCES hotels (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    room_id TEXT NOT NULL,
+    description TEXT NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    type TEXT NOT NULL,
+    base_rate REAL NOT NULL,
+    bed_options TEXT NOT NULL,
+    sleeps_count INTEGER NOT NULL,
+    tags TEXT NOT NULL,
+    PRIMARY KEY (hotel_id, position)
+);
+CREATE INDEX IF NOT EXISTS room_capacity_rate_search_index
+    ON rooms (hotel_id, sleeps_count, base_rate);
+
+CREATE TABLE IF NOT EXISTS bookings (
+    id TEXT PRIMARY KEY,
+    hotel_id TEXT NOT NULL,
+    user_id TEXT NOT NULL DEFAULT '',
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    number_of_guest INTEGER NOT NULL,
+    rooms TEXT NOT NULL,
+    total_price REAL NOT NULL,
+    client_info TEXT NOT NULL,
+    card_info TEXT NOT NULL,
+    created_time TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS user_bookings_index ON bookings (user_id, id);
+CREATE INDEX IF NOT EXISTS hotel_dates_index ON bookings (hotel_id, start_date, end_date);
+
+-- the unique key is what prevents double bookings
+CREATE TABLE IF NOT EXISTS booked_room_nights (
+    booking_id TEXT NOT NULL REFERENCES bookings (id) ON DELETE CASCADE,
+    hotel_id TEXT NOT NULL,
+    room_id TEXT NOT NULL,
+    night TEXT NOT NULL,
+    UNIQUE (hotel_id, room_id, night)
+);
+CREATE INDEX IF NOT EXISTS room_night_booking_index ON booked_room_nights (booking_id);
+
+-- versions of whole collections, e.g. the hotel catalog
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+
+-- tokens are stored by the hash of their jti, see AuthUtils.token_key
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    token_hash TEXT NOT NULL,
+    previous_token_hash TEXT,
+    rotated_at TEXT,
+    created_at TEXT NOT NULL,
+    expired_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS token_hash_unique_index ON refresh_tokens (token_hash);
+CREATE INDEX IF NOT EXISTS previous_token_hash_index ON refresh_tokens (previous_token_hash)
+    WHERE previous_token_hash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS expired_at_index ON refresh_tokens (expired_at);
+
+-- access tokens revoked before their exp, polled by every worker's Bloom filter
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti TEXT PRIMARY KEY,
+    revoked_at TEXT NOT NULL,
+    expired_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS revoked_at_index ON revoked_tokens (revoked_at);
+CREATE INDEX IF NOT EXISTS revoked_expired_at_index ON revoked_tokens (expired_at);
+"""
+
+
+async def create_schema(connection: aiosqlite.Connection):
+    await connection.executescript(SCHEMA)
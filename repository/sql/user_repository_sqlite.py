@@ -0,0 +1,134 @@
+from ..user_repository import IUserRepository
+from typing import Optional, Sequence
+import json
+import sqlite3
+from bson import ObjectId
+from models.user import User
+from config.py_object_id import PyObjectId
+from exceptions.custom_exception import UserAlreadyExistsError
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
+from repository.projection import project
+from repository.sql.pagination_sqlite import fetch_page
+from repository.sql.pool_sqlite import SQLitePool
+
+
+def _to_document(row: sqlite3.Row) -> dict:
+    document = {
+        "_id": row["id"],
+        "email": row["email"],
+        "role": row["role"],
+        "password": row["password"],
+        "isActive": bool(row["is_active"]),
+    }
+    if row["client_info"] is not None:
+        document["clientInfo"] = json.loads(row["client_info"])
+    if row["card_info"] is not None:
+        document["cardInfo"] = json.loads(row["card_info"])
+    return document
+
+
+def _to_row(user_id: str, user: User) -> tuple:
+    document = user.model_dump(by_alias=True, exclude_unset=True)
+    client_info = document.get("clientInfo")
+    card_info = document.get("cardInfo")
+    return (
+        user_id,
+        document["email"],
+        document["role"],
+        document["password"],
+        int(document.get("isActive", True)),
+        json.dumps(client_info) if client_info is not None else None,
+        json.dumps(card_info) if card_info is not None else None,
+    )
+
+
+class UserRepositorySQLite(IUserRepository):
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+
+    async def _fetch_one(self, sql: str, params: Sequence) -> Optional[sqlite3.Row]:
+        async with self.pool.connection() as connection:
+            async with connection.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        row = await self._fetch_one("SELECT * FROM users WHERE email = ?", (email,))
+        if row:
+            return User(**_to_document(row))
+        return None
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        row = await self._fetch_one("SELECT * FROM users WHERE id = ?", (user_id,))
+        if row:
+            return User(**_to_document(row))
+        return None
+
+    async def exists_by_id(self, user_id: str) -> bool:
+        row = await self._fetch_one("SELECT 1 FROM users WHERE id = ?", (user_id,))
+        return row is not None
+
+    async def exists_by_email(self, email: str) -> bool:
+        # answered from the unique email index alone
+        row = await self._fetch_one("SELECT 1 FROM users WHERE email = ?", (email,))
+        return row is not None
+
+    async def get_id_by_email(self, email: str) -> Optional[str]:
+        row = await self._fetch_one("SELECT id FROM users WHERE email = ?", (email,))
+        return row["id"] if row else None
+
+    async def get_fields_by_id(
+        self, user_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        row = await self._fetch_one("SELECT * FROM users WHERE id = ?", (user_id,))
+        return project(_to_document(row), fields) if row else None
+
+    async def create_user(self, user: User) -> Optional[PyObjectId]:
+        user_id = str(ObjectId())
+        try:
+            async with self.pool.connection() as connection:
+                await connection.execute(
+                    "INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    _to_row(user_id, user),
+                )
+        except sqlite3.IntegrityError:
+            raise UserAlreadyExistsError(f"User with email {user.email} already exists")
+        return user_id
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[User]:
+        async with self.pool.connection() as connection:
+            rows, next_cursor = await fetch_page(
+                connection, "SELECT * FROM users", [], [], limit, after
+            )
+        return Page(
+            items=[User(**_to_document(row)) for row in rows], next_cursor=next_cursor
+        )
+
+    async def delete(self, user_id: str) -> int:
+        async with self.pool.connection() as connection:
+            cursor = await connection.execute(
+                "DELETE FROM users WHERE id = ?", (user_id,)
+            )
+            return cursor.rowcount
+
+    async def update(self, user_id: str, user_data: User) -> Optional[User]:
+        # replace and read back in a single statement
+        try:
+            row = await self._fetch_one(
+                """
+                UPDATE users
+                SET email = ?2, role = ?3, password = ?4, is_active = ?5,
+                    client_info = ?6, card_info = ?7
+                WHERE id = ?1
+                RETURNING *
+                """,
+                _to_row(user_id, user_data),
+            )
+        except sqlite3.IntegrityError:
+            raise UserAlreadyExistsError(
+                f"User with email {user_data.email} already exists"
+            )
+        if row:
+            return User(**_to_document(row))
+        return None
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 from models.user import User
 from config.py_object_id import PyObjectId
+from repository.pagination import DEFAULT_PAGE_SIZE, Page
 
 
 class IUserRepository(ABC):
@@ -13,18 +14,40 @@ class IUserRepository(ABC):
     async def get_by_id(self, user_id: str) -> Optional[User]:
         pass
 
+    @abstractmethod
+    async def exists_by_id(self, user_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def exists_by_email(self, email: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_id_by_email(self, email: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def get_fields_by_id(
+        self, user_id: str, fields: Sequence[str]
+    ) -> Optional[dict]:
+        """Only the given (stored, aliased) fields of the document, `_id` as a string."""
+        pass
+
     @abstractmethod
     async def create_user(self, user: User) -> Optional[PyObjectId]:
         pass
 
     @abstractmethod
-    async def find_all(self) -> list[User]:
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Page[User]:
         pass
 
     @abstractmethod
-    async def delete(self, user_id: str):
+    async def delete(self, user_id: str) -> int:
         pass
 
     @abstractmethod
-    async def update(self, user_id: str, user_data: User) -> int:
+    async def update(self, user_id: str, user_data: User) -> Optional[User]:
+        """Replace the user and return the stored post-image, None if it does not exist."""
         pass
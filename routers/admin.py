@@ -0,0 +1,31 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+from dependencies.container import AppContainer
+from config.database_manager import DatabaseManager
+from dependencies.dependencies import get_container, get_current_user, get_db_manager
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/stats", dependencies=[Depends(get_current_user)])
+async def get_stats(
+    container: Annotated[AppContainer, Depends(get_container)],
+):
+    return {
+        "tokenCache": container.access_token_cache.stats(),
+        "passwordHasher": container.password_hasher.stats(),
+        "occupancyIndex": container.occupancy_index.stats(),
+        "tokenRevocations": container.token_revocations.stats(),
+        "hotelCache": container.hotel_repository.stats(),
+    }
+
+
+@router.get("/dbStats", dependencies=[Depends(get_current_user)])
+async def get_db_stats(
+    db_manager: Annotated[DatabaseManager, Depends(get_db_manager)],
+):
+    # only backends that monitor their commands have an answer here
+    command_monitor = getattr(db_manager.initializer, "command_monitor", None)
+    if command_monitor is None:
+        return {}
+    return command_monitor.stats()
@@ -1,11 +1,16 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+import datetime
 from dependencies.dependencies import get_booking_service, get_current_user
 from models.booking import Booking
 from schemas.booking.response.booking_create_response import BookingCreateResponse
 from schemas.booking.response.booking_list_response import BookingListResponse
 from schemas.booking.request.booking_request import BookingRequest
+from schemas.field_selection import FieldView
 from service.booking_service import BookingService
+from repository.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from util.model_response import ModelResponse
 
 router = APIRouter(prefix="/booking", tags=["bookings"])
 
@@ -15,7 +20,7 @@ async def create_booking(
     req: BookingRequest,
     booking_service: Annotated[BookingService, Depends(get_booking_service)],
 ):
-    return await booking_service.create_booking(req)
+    return ModelResponse(await booking_service.create_booking(req))
 
 
 @router.get(
@@ -25,8 +30,12 @@ async def create_booking(
 )
 async def find_all_bookings(
     booking_service: Annotated[BookingService, Depends(get_booking_service)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[FieldView] = None,
 ):
-    return await booking_service.find_all()
+    return ModelResponse(await booking_service.find_all(limit, after, fields, view))
 
 
 @router.get(
@@ -37,5 +46,26 @@ async def find_all_bookings(
 async def get_bookings_by_user_id(
     user_id: str,
     booking_service: Annotated[BookingService, Depends(get_booking_service)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[FieldView] = None,
 ):
-    return await booking_service.get_bookings_by_user_id(user_id)
+    return ModelResponse(
+        await booking_service.get_bookings_by_user_id(
+            user_id, limit, after, fields, view
+        )
+    )
+
+
+@router.get("/exportBookings", dependencies=[Depends(get_current_user)])
+async def export_bookings(
+    booking_service: Annotated[BookingService, Depends(get_booking_service)],
+    start_date: Annotated[Optional[datetime.datetime], Query(alias="from")] = None,
+    end_date: Annotated[Optional[datetime.datetime], Query(alias="to")] = None,
+    hotel_id: Annotated[Optional[str], Query(alias="hotel")] = None,
+):
+    return StreamingResponse(
+        booking_service.export_bookings(start_date, end_date, hotel_id),
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,49 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from config.database_manager import DatabaseManager
+from dependencies.dependencies import get_db_manager
+from util.circuit_breaker import CircuitState
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+# both only read cached state, a probe never waits on the database
+
+
+@router.get("/live")
+async def live():
+    """The process is up and its event loop answers."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def ready(
+    request: Request,
+    db_manager: Annotated[DatabaseManager, Depends(get_db_manager)],
+):
+    """
+    Ready to take traffic: started, the last database heartbeat succeeded and the
+    circuit is closed. 503 otherwise, so load balancers route around this worker.
+    """
+    heartbeat = db_manager.heartbeat
+    circuit_breaker = db_manager.circuit_breaker
+    is_ready = (
+        getattr(request.app.state, "container", None) is not None
+        and heartbeat is not None
+        and heartbeat.healthy is True
+        and circuit_breaker.state == CircuitState.CLOSED
+    )
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content=jsonable_encoder(
+            {
+                "status": "ready" if is_ready else "unavailable",
+                "database": {
+                    "type": db_manager.db_type.value,
+                    **(heartbeat.stats() if heartbeat is not None else {}),
+                },
+                "circuit": circuit_breaker.stats(),
+            }
+        ),
+    )
@@ -1,21 +1,113 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends
-from dependencies.dependencies import get_hotel_service, get_current_user
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from dependencies.dependencies import (
+    get_catalog_snapshot,
+    get_current_user,
+    get_hotel_service,
+)
 from models.hotel import Hotel
 from schemas.hotel.response.hotel_get_response import HotelGetResponse
 from schemas.hotel.response.hotel_list_response import HotelListResponse
 from schemas.hotel.response.hotel_update_response import HotelUpdateResponse
+from schemas.hotel.response.room_availability_response import (
+    RoomAvailabilityResponse,
+)
 from schemas.hotel.request.hotel_request import HotelRequest
+from schemas.hotel.request.hotel_search_request import HotelSearchRequest
+from schemas.field_selection import FieldView
+from service.catalog_snapshot import CatalogSnapshot, Snapshot
 from service.hotel_service import HotelService
+from repository.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from util.etag import etag_matches, make_etag, not_modified
+from util.model_response import ModelResponse
+import datetime
 
 router = APIRouter(prefix="/hotel", tags=["hotels"])
 
 
+def _snapshot_response(
+    snapshot: Snapshot,
+    request: Request,
+    accept_encoding: Optional[str],
+    if_none_match: Optional[str],
+) -> Response:
+    body, encoding = snapshot.encoded(accept_encoding)
+    etag = make_etag(snapshot.version, request, encoding)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+
 @router.get("/findAllHotels", response_model=HotelListResponse)
 async def find_all_hotels(
+    request: Request,
+    hotel_service: Annotated[HotelService, Depends(get_hotel_service)],
+    catalog_snapshot: Annotated[CatalogSnapshot, Depends(get_catalog_snapshot)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[FieldView] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    accept_encoding: Annotated[Optional[str], Header()] = None,
+):
+    # the plain first page is served from memory while the snapshot is current
+    snapshot = catalog_snapshot.current
+    if (
+        snapshot is not None
+        and limit == catalog_snapshot.limit
+        and after is None
+        and fields is None
+        and view is None
+    ):
+        return _snapshot_response(snapshot, request, accept_encoding, if_none_match)
+
+    # read before the page, so the page is never older than its ETag
+    etag = make_etag(await hotel_service.get_catalog_version(), request)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return ModelResponse(
+        await hotel_service.find_all(limit, after, fields, view),
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/search", response_model=HotelListResponse)
+async def search_hotels(
+    request: Request,
     hotel_service: Annotated[HotelService, Depends(get_hotel_service)],
+    # the same limits as HotelSearchRequest, so bad input is a 422 rather than a 500
+    city: Annotated[Optional[str], Query(max_length=30)] = None,
+    province: Annotated[Optional[str], Query(max_length=2)] = None,
+    tags: Annotated[list[str], Query()] = [],
+    is_active: Annotated[Optional[bool], Query(alias="isActive")] = None,
+    min_sleeps: Annotated[Optional[int], Query(alias="minSleeps", ge=1)] = None,
+    min_rate: Annotated[Optional[float], Query(alias="minRate", ge=0)] = None,
+    max_rate: Annotated[Optional[float], Query(alias="maxRate", ge=0)] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[FieldView] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    return await hotel_service.find_all()
+    etag = make_etag(await hotel_service.get_catalog_version(), request)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    criteria = HotelSearchRequest(
+        city=city,
+        province=province,
+        tags=tags,
+        is_active=is_active,
+        min_sleeps=min_sleeps,
+        min_rate=min_rate,
+        max_rate=max_rate,
+    )
+    return ModelResponse(
+        await hotel_service.search(criteria, limit, after, fields, view),
+        headers={"ETag": etag},
+    )
 
 
 @router.get(
@@ -24,9 +116,24 @@ async def find_all_hotels(
     response_model=HotelGetResponse,
 )
 async def find_hotel_by_id(
-    hotel_id: str, hotel_service: Annotated[HotelService, Depends(get_hotel_service)]
+    hotel_id: str,
+    request: Request,
+    hotel_service: Annotated[HotelService, Depends(get_hotel_service)],
+    fields: Optional[str] = None,
+    view: Optional[FieldView] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    return await hotel_service.get_by_id(hotel_id)
+    version = await hotel_service.get_version(hotel_id)
+    if version is None:
+        # nothing to tag, the response carries no hotel
+        return ModelResponse(await hotel_service.get_by_id(hotel_id, fields, view))
+
+    etag = make_etag(version, request)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return ModelResponse(
+        await hotel_service.get_by_id(hotel_id, fields, view), headers={"ETag": etag}
+    )
 
 
 @router.put(
@@ -39,7 +146,7 @@ async def update_hotel(
     req: HotelRequest,
     hotel_service: Annotated[HotelService, Depends(get_hotel_service)],
 ):
-    return await hotel_service.update(hotel_id, req)
+    return ModelResponse(await hotel_service.update(hotel_id, req))
 
 
 @router.get(
@@ -51,4 +158,21 @@ async def get_user_booked_hotels(
     user_id: str,
     hotel_service: Annotated[HotelService, Depends(get_hotel_service)],
 ):
-    return await hotel_service.get_hotels_by_user_id(user_id)
+    return ModelResponse(await hotel_service.get_hotels_by_user_id(user_id))
+
+
+@router.get(
+    "/getAvailableRooms/{hotel_id}", response_model=RoomAvailabilityResponse
+)
+async def get_available_rooms(
+    hotel_id: str,
+    hotel_service: Annotated[HotelService, Depends(get_hotel_service)],
+    start_date: Annotated[datetime.datetime, Query(alias="from")],
+    end_date: Annotated[datetime.datetime, Query(alias="to")],
+    number_of_guest: Annotated[int, Query(alias="numberOfGuest", ge=1)] = 1,
+):
+    return ModelResponse(
+        await hotel_service.get_available_rooms(
+            hotel_id, start_date, end_date, number_of_guest
+        )
+    )
@@ -0,0 +1,52 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from dependencies.container import AppContainer
+from config.database_manager import DatabaseManager
+from dependencies.dependencies import get_container, get_db_manager
+from util.metrics import REGISTRY, render_gauges
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(
+    container: Annotated[AppContainer, Depends(get_container)],
+    db_manager: Annotated[DatabaseManager, Depends(get_db_manager)],
+):
+    heartbeat = db_manager.heartbeat
+    body = (
+        REGISTRY.render()
+        + render_gauges(
+            "token_cache", "Verified access token cache.", container.access_token_cache.stats()
+        )
+        + render_gauges(
+            "hotel_cache", "Hotel read-through cache.", container.hotel_repository.stats()
+        )
+        + render_gauges(
+            "password_hasher",
+            "Password hashing thread pool.",
+            container.password_hasher.stats(),
+        )
+        + render_gauges(
+            "occupancy_index", "In-memory room occupancy index.", container.occupancy_index.stats()
+        )
+        + render_gauges(
+            "token_revocations",
+            "Revoked access token Bloom filter.",
+            container.token_revocations.stats(),
+        )
+        + render_gauges(
+            "database_heartbeat",
+            "Background database ping.",
+            heartbeat.stats() if heartbeat is not None else {},
+        )
+        + render_gauges(
+            "database_circuit",
+            "Database circuit breaker.",
+            db_manager.circuit_breaker.stats(),
+        )
+    )
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,5 +1,5 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, Cookie, Response, Request
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Cookie, Header, Query, Response, Request
 from dependencies.dependencies import get_user_service, get_current_user
 from models.user import User
 from schemas.user.request.login_request import LoginRequest
@@ -12,13 +12,13 @@ from schemas.user.response.user_list_response import UserListResponse
 from schemas.user.response.user_update_response import UserUpdateResponse
 from schemas.user.request.user_request import UserRequest
 from service.user_service import UserService
+from repository.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from exceptions.custom_exception import TokenNotFoundError
+from util.model_response import ModelResponse
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level to INFO or DEBUG
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Format for log messages
-)
+logger = logging.getLogger(__name__)
+
 
 router = APIRouter(prefix="/user", tags=["users"])
 
@@ -28,7 +28,7 @@ async def create_user(
     req: UserRequest,
     user_service: Annotated[UserService, Depends(get_user_service)],
 ):
-    return await user_service.create_user(req)
+    return ModelResponse(await user_service.create_user(req))
 
 
 @router.post("/login", response_model=LoginResponse)
@@ -45,10 +45,13 @@ async def logout(
     user_service: Annotated[UserService, Depends(get_user_service)],
     response: Response,
     refreshToken: Annotated[str | None, Cookie(alias="refreshToken")] = None,
+    authorization: Annotated[str | None, Header(alias="Authorization")] = None,
 ):
-    if refreshToken is None:
+    # the access token is optional, when sent it is revoked along with the session
+    access_token = authorization.split(" ")[-1] if authorization else None
+    if refreshToken is None and access_token is None:
         return {"message": "No refresh token provided."}
-    return await user_service.logout(refreshToken, response)
+    return await user_service.logout(refreshToken, response, access_token)
 
 
 @router.post("/refreshAccessToken", response_model=RefreshTokenResponse)
@@ -58,7 +61,7 @@ async def refresh_access_token(
     refreshToken: Annotated[str | None, Cookie(alias="refreshToken")] = None,
 ):
     if refreshToken is None:
-        logging.info(f"No refresh token provided")
+        logger.info("No refresh token provided")
         raise TokenNotFoundError("No refresh token provided")
     return await user_service.refresh_access_token(response, refreshToken)
 
@@ -73,7 +76,7 @@ async def update_user(
     req: UserRequest,
     user_service: Annotated[UserService, Depends(get_user_service)],
 ):
-    return await user_service.update(user_id, req)
+    return ModelResponse(await user_service.update(user_id, req))
 
 
 @router.delete(
@@ -84,7 +87,7 @@ async def update_user(
 async def delete_user(
     user_id: str, user_service: Annotated[UserService, Depends(get_user_service)]
 ):
-    return await user_service.delete(user_id)
+    return ModelResponse(await user_service.delete(user_id))
 
 
 @router.get(
@@ -94,15 +97,17 @@ async def delete_user(
 )
 async def find_all_users(
     user_service: Annotated[UserService, Depends(get_user_service)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
 ):
-    return await user_service.find_all()
+    return ModelResponse(await user_service.find_all(limit, after))
 
 
 @router.get("/findUserByEmail/{email}", response_model=UserGetResponse)
 async def find_user_by_email(
     email: str, user_service: Annotated[UserService, Depends(get_user_service)]
 ):
-    return await user_service.get_by_email(email)
+    return ModelResponse(await user_service.get_by_email(email))
 
 
 @router.get(
@@ -113,4 +118,4 @@ async def find_user_by_email(
 async def find_user_by_id(
     user_id: str, user_service: Annotated[UserService, Depends(get_user_service)]
 ):
-    return await user_service.get_by_id(user_id)
+    return ModelResponse(await user_service.get_by_id(user_id))
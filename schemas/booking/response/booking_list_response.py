@@ -10,3 +10,4 @@ class BookingListResponse(BaseModel):
 
     data: list[Booking] = []
     error: Optional[str] = None
+    next_cursor: Optional[str] = None  # pass as `after` to get the next page
@@ -0,0 +1,17 @@
+from schemas.field_selection import FieldView
+
+# the stay without the guest's contact and card details
+BOOKING_VIEWS = {
+    FieldView.SUMMARY: (
+        "duration",
+        "from",
+        "hotel",
+        "numberOfGuest",
+        "rooms",
+        "time",
+        "to",
+        "totalPrice",
+        "userId",
+    ),
+    FieldView.FULL: None,
+}
@@ -0,0 +1,141 @@
+import types
+from enum import Enum
+from functools import lru_cache
+from typing import Optional, Union, get_args, get_origin
+from pydantic import BaseModel, Field, create_model
+from exceptions.custom_exception import InvalidRequestError
+
+ID_FIELD = "_id"
+
+
+class FieldView(str, Enum):
+    """Named field selections of the list and get endpoints."""
+
+    SUMMARY = "summary"
+    FULL = "full"
+
+
+def _models_in(annotation) -> list[type[BaseModel]]:
+    """The models a field holds, directly, as Optional or as a list."""
+    if get_origin(annotation) in (Union, types.UnionType, list):
+        return [model for arg in get_args(annotation) for model in _models_in(arg)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation]
+    return []
+
+
+def _with_models(annotation, replace):
+    """The annotation with every model in it swapped for `replace(model)`."""
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return Union[tuple(_with_models(arg, replace) for arg in get_args(annotation))]
+    if origin is list:
+        return list[_with_models(get_args(annotation)[0], replace)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return replace(annotation)
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def stored_paths(model: type[BaseModel]) -> frozenset[str]:
+    """Every (stored, aliased) field path of the model, nested models included."""
+    paths = set()
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        paths.add(key)
+        for nested in _models_in(field.annotation):
+            paths.update(f"{key}.{path}" for path in stored_paths(nested))
+    return frozenset(paths)
+
+
+def select_fields(
+    model: type[BaseModel],
+    views: dict[FieldView, Optional[tuple[str, ...]]],
+    fields: Optional[str],
+    view: Optional[FieldView],
+) -> Optional[tuple[str, ...]]:
+    """
+    Resolve the `fields` (comma separated, dotted stored paths) or `view` query parameter
+    to the field paths to read, None for the whole document. `_id` is always returned.
+    """
+    if fields is not None and view is not None:
+        raise InvalidRequestError("Pass either `fields` or `view`, not both")
+    if view is not None:
+        return views[view]
+    if fields is None:
+        return None
+
+    requested = {path.strip() for path in fields.split(",") if path.strip()}
+    unknown = sorted(requested - stored_paths(model) - {ID_FIELD})
+    if unknown:
+        raise InvalidRequestError(f"Unknown fields: {', '.join(unknown)}")
+
+    # a path inside an already selected field adds nothing
+    selected = {
+        path
+        for path in requested - {ID_FIELD}
+        if not any(path.startswith(prefix + ".") for prefix in requested)
+    }
+    return tuple(sorted(selected))
+
+
+def _field_tree(fields: tuple[str, ...]) -> dict:
+    """{"address": {"city": None}, "rating": None}, None marks a whole field."""
+    tree = {}
+    for path in fields:
+        node = tree
+        *parents, leaf = path.split(".")
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = None
+    return tree
+
+
+def _partial(model: type[BaseModel], tree: dict, top_level: bool) -> type[BaseModel]:
+    definitions = {}
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        if key in tree:
+            subtree = tree[key]
+        elif top_level and key == ID_FIELD:
+            subtree = None
+        else:
+            continue
+
+        if subtree is None:
+            definitions[name] = (field.annotation, field)
+        else:
+            annotation = _with_models(
+                field.annotation, lambda nested: _partial(nested, subtree, False)
+            )
+            default = ... if field.is_required() else field.default
+            definitions[name] = (annotation, Field(default, alias=field.alias))
+
+    return create_model(
+        f"{model.__name__}Partial", __config__=model.model_config, **definitions
+    )
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    A model with only the selected fields of `model` (and `_id`), nested models cut down
+    to the selected sub-fields. Validation and serialization then only touch those fields.
+    """
+    return _partial(model, _field_tree(fields), True)
+
+
+@lru_cache(maxsize=256)
+def partial_response(
+    response_model: type[BaseModel], item_model: type[BaseModel]
+) -> type[BaseModel]:
+    """The response envelope with `data` holding partial items instead of whole models."""
+    data = response_model.model_fields["data"]
+    return create_model(
+        response_model.__name__,
+        __base__=response_model,
+        data=(
+            _with_models(data.annotation, lambda _: item_model),
+            Field(default=data.default),
+        ),
+    )
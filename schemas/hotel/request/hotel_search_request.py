@@ -0,0 +1,19 @@
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class HotelSearchRequest(BaseModel):
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        validate_by_alias=True,
+        validate_by_name=True,
+    )
+
+    city: Optional[str] = Field(default=None, max_length=30)
+    province: Optional[str] = Field(default=None, max_length=2)
+    tags: list[str] = []  # hotels must carry every tag
+    is_active: Optional[bool] = Field(default=None, alias="isActive")
+    # room criteria, a single room has to satisfy all of them
+    min_sleeps: Optional[int] = Field(default=None, alias="minSleeps", ge=1)
+    min_rate: Optional[float] = Field(default=None, alias="minRate", ge=0)
+    max_rate: Optional[float] = Field(default=None, alias="maxRate", ge=0)
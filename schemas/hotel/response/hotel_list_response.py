@@ -10,3 +10,4 @@ class HotelListResponse(BaseModel):
 
     data: list[Hotel] = []
     error: Optional[str] = None
+    next_cursor: Optional[str] = None  # pass as `after` to get the next page
@@ -0,0 +1,15 @@
+from schemas.field_selection import FieldView
+
+# what a hotel card in a result list renders
+HOTEL_VIEWS = {
+    FieldView.SUMMARY: (
+        "address.city",
+        "address.province",
+        "hotelName",
+        "isActive",
+        "photo",
+        "rating",
+        "tags",
+    ),
+    FieldView.FULL: None,
+}
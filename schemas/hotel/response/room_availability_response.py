@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+from pydantic import ConfigDict
+
+
+class RoomAvailabilityResponse(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True, arbitrary_types_allowed=True)
+
+    data: list[str] = []  # roomIds free for the requested stay
+    error: Optional[str] = None
@@ -10,3 +10,4 @@ class UserListResponse(BaseModel):
 
     data: list[User] = []
     error: Optional[str] = None
+    next_cursor: Optional[str] = None  # pass as `after` to get the next page
@@ -1,26 +1,38 @@
 from bson import ObjectId
-from repository.booking_repository import IBookingRepository
+from repository.booking_repository import IBookingRepository, night_span
 from repository.hotel_repository import IHotelRepository
 from repository.user_repository import IUserRepository
 from models.booking import Booking
-import inspect
 import logging
 from schemas.booking.response.booking_create_response import BookingCreateResponse
 from schemas.booking.response.booking_list_response import BookingListResponse
 from schemas.booking.request.booking_request import BookingRequest
+from schemas.booking.response.booking_views import BOOKING_VIEWS
+from schemas.field_selection import (
+    FieldView,
+    partial_model,
+    partial_response,
+    select_fields,
+)
 from passlib.context import CryptContext
 from exceptions.custom_exception import (
+    BookingConflictError,
     BookingServiceError,
     HotelNotFoundError,
+    InvalidCursorError,
+    InvalidRequestError,
     NotFoundError,
     UserNotFoundError,
 )
 from exceptions.user_identifier import UserIdentifier
+from repository.pagination import DEFAULT_PAGE_SIZE
+from typing import AsyncIterator, Optional
+import datetime
+from util.ndjson import encode_ndjson
+from models.room_reservation import RoomReservation
+from service.occupancy_index import OccupancyIndex
 
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level to INFO or DEBUG
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Format for log messages
-)
+logger = logging.getLogger(__name__)
 
 
 class BookingService:
@@ -29,68 +41,152 @@ class BookingService:
         booking_repository: IBookingRepository,
         hotel_repository: IHotelRepository,
         user_repository: IUserRepository,
+        occupancy_index: OccupancyIndex,
     ):
         self.booking_repository = booking_repository
         self.hotel_repository = hotel_repository
         self.user_repository = user_repository
+        self.occupancy_index = occupancy_index
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-    async def find_all(self) -> BookingListResponse:
+    async def _find_fields(
+        self,
+        fields: tuple[str, ...],
+        user_id: Optional[str],
+        limit: int,
+        after: Optional[str],
+    ) -> BookingListResponse:
+        item_model = partial_model(Booking, fields)
+        page = await self.booking_repository.find_fields(fields, user_id, limit, after)
+        return partial_response(BookingListResponse, item_model)(
+            data=[item_model(**doc) for doc in page.items],
+            error=None,
+            next_cursor=page.next_cursor,
+        )
+
+    async def find_all(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[str] = None,
+        view: Optional[FieldView] = None,
+    ) -> BookingListResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
-            bookings = await self.booking_repository.find_all()
-            return BookingListResponse(data=bookings, error=None)
+            logger.info("find_all called")
+            selection = select_fields(Booking, BOOKING_VIEWS, fields, view)
+            if selection is not None:
+                return await self._find_fields(selection, None, limit, after)
+
+            page = await self.booking_repository.find_all(limit, after)
+            return BookingListResponse(
+                data=page.items, error=None, next_cursor=page.next_cursor
+            )
+        except (InvalidCursorError, InvalidRequestError) as e:
+            raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in find_all")
             raise BookingServiceError(f"Failed to retrieve bookings: {str(e)}")
             # return BookingListResponse(data=[], error=str(e))
 
     async def create_booking(self, req: BookingRequest) -> BookingCreateResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
+            logger.info("create_booking called")
 
             # check if hotel exists
-            hotel = await self.hotel_repository.get_by_id(req.hotel_id)
-            if not hotel:
+            if not await self.hotel_repository.exists_by_id(req.hotel_id):
                 raise HotelNotFoundError(f"Hotel with id {req.hotel_id} does not exist")
 
             # check if user exists if user_id is not empty
             if req.user_id:
-                user = await self.user_repository.get_by_id(req.user_id)
-                if not user:
+                if not await self.user_repository.exists_by_id(req.user_id):
                     raise UserNotFoundError(
                         UserIdentifier.user_id,
                         f"User with id {req.user_id} does not exist",
                     )
 
             booking = Booking(**req.model_dump(by_alias=True, exclude_unset=True))
+            # raises InvalidRequestError when the stay has no nights
+            night_span(booking.start_date, booking.end_date)
+
+            # fail fast on rooms this worker already knows to be taken, the
+            # repository still enforces the final check atomically
+            if not all(
+                self.occupancy_index.is_room_free(
+                    booking.hotel_id, room_id, booking.start_date, booking.end_date
+                )
+                for room_id in booking.rooms
+            ):
+                raise BookingConflictError(
+                    f"Rooms {booking.rooms} of hotel {booking.hotel_id} are already booked for the requested dates"
+                )
+
             inserted_id = await self.booking_repository.create_booking(booking)
 
+            # the insert is acknowledged, no need to read the booking back
             if not inserted_id:
                 raise BookingServiceError()
 
-            # verify creation
-            created_booking = await self.booking_repository.get_by_id(inserted_id)
-            if not created_booking:
-                raise BookingServiceError()
+            self.occupancy_index.add(
+                RoomReservation(
+                    hotel_id=booking.hotel_id,
+                    rooms=booking.rooms,
+                    start_date=booking.start_date,
+                    end_date=booking.end_date,
+                )
+            )
 
             return BookingCreateResponse(is_created=True, data=inserted_id, error=None)
-        except NotFoundError as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+        except (NotFoundError, BookingConflictError, InvalidRequestError) as e:
+            logger.warning(f"create_booking rejected: {str(e)}")
             raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in create_booking")
             raise BookingServiceError(f"Failed to create booking: {str(e)}")
             # return BookingCreateResponse(is_created=False, data=None, error=str(e))
 
-    async def get_bookings_by_user_id(self, user_id: str) -> BookingListResponse:
+    async def get_bookings_by_user_id(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[str] = None,
+        view: Optional[FieldView] = None,
+    ) -> BookingListResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
-            bookings = await self.booking_repository.get_bookings_by_user_id(user_id)
-            return BookingListResponse(data=bookings, error=None)
+            logger.info("get_bookings_by_user_id called")
+            selection = select_fields(Booking, BOOKING_VIEWS, fields, view)
+            if selection is not None:
+                return await self._find_fields(selection, user_id, limit, after)
+
+            page = await self.booking_repository.get_bookings_by_user_id(
+                user_id, limit, after
+            )
+            return BookingListResponse(
+                data=page.items, error=None, next_cursor=page.next_cursor
+            )
+        except (InvalidCursorError, InvalidRequestError) as e:
+            raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in get_bookings_by_user_id")
             raise BookingServiceError(
                 f"Failed to retrieve bookings for user {user_id}: {str(e)}"
             )
             # return BookingListResponse(data=[], error=str(e))
+
+    async def export_bookings(
+        self,
+        start_date: Optional[datetime.datetime] = None,
+        end_date: Optional[datetime.datetime] = None,
+        hotel_id: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream bookings as NDJSON, one chunk per database batch so memory stays flat."""
+        logger.info("export_bookings called")
+        try:
+            async for batch in self.booking_repository.stream_bookings(
+                start_date, end_date, hotel_id
+            ):
+                yield encode_ndjson(batch)
+        except Exception as e:
+            # the response has already started, so the client only sees a truncated body
+            logger.exception("error in export_bookings")
+            raise BookingServiceError(f"Failed to export bookings: {str(e)}")
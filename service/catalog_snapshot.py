@@ -0,0 +1,148 @@
+import asyncio
+import gzip
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from repository.hotel_repository import IHotelRepository
+from repository.pagination import DEFAULT_PAGE_SIZE
+from schemas.hotel.response.hotel_list_response import HotelListResponse
+
+try:
+    import brotli
+except ImportError:  # optional, responses are only offered gzipped then
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> dict[str, float]:
+    """Content codings of an Accept-Encoding header with their q-values."""
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The serialized findAllHotels first page at a catalog version, in every encoding."""
+
+    version: int
+    body: bytes
+    gzip: bytes
+    brotli: Optional[bytes]
+
+    def encoded(self, accept_encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+        """The variant the client prefers, brotli first on a tie, and its Content-Encoding."""
+        accepted = _accepted_encodings(accept_encoding)
+        best, best_quality = (self.body, None), 0.0
+        for coding, body in (("br", self.brotli), ("gzip", self.gzip)):
+            quality = accepted.get(coding, accepted.get("*", 0.0))
+            if body is not None and quality > best_quality:
+                best, best_quality = (body, coding), quality
+        return best
+
+
+class CatalogSnapshot:
+    """
+    The response of the plain `findAllHotels` request (first page, default limit, every
+    field), kept serialized and compressed in memory so serving it touches neither the
+    database nor pydantic.
+
+    It is built at startup and dropped by every hotel update made through the hotel
+    service, then rebuilt in the background; until then requests take the regular path.
+    Updates made by other worker processes are picked up by comparing the catalog
+    version every `refresh_seconds`.
+    """
+
+    def __init__(self, hotel_repository: IHotelRepository, refresh_seconds: float):
+        self.hotel_repository = hotel_repository
+        self.refresh_seconds = refresh_seconds
+        self.limit = DEFAULT_PAGE_SIZE
+        self._snapshot: Optional[Snapshot] = None
+        self._stale = False
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def current(self) -> Optional[Snapshot]:
+        return self._snapshot
+
+    async def _build(self) -> Snapshot:
+        # read before the page, so the page is never older than its version
+        version = await self.hotel_repository.get_catalog_version()
+        page = await self.hotel_repository.find_all(self.limit)
+        body = (
+            HotelListResponse(data=page.items, error=None, next_cursor=page.next_cursor)
+            .model_dump_json(by_alias=True)
+            .encode("utf-8")
+        )
+        return Snapshot(
+            version=version,
+            body=body,
+            gzip=gzip.compress(body, compresslevel=6),
+            brotli=brotli.compress(body) if brotli is not None else None,
+        )
+
+    async def _rebuild(self):
+        while self._stale:
+            self._stale = False
+            try:
+                snapshot = await self._build()
+            except Exception:
+                logger.exception("failed to build the catalog snapshot")
+                return
+            # an update during the build may not be in it, build again
+            if not self._stale:
+                self._snapshot = snapshot
+                logger.info(
+                    f"catalog snapshot built at version {snapshot.version}, "
+                    f"{len(snapshot.body)} bytes"
+                )
+
+    async def rebuild(self):
+        """Build the snapshot now, e.g. after hotels were written around the repositories."""
+        self._stale = True
+        await self._rebuild()
+
+    def invalidate(self):
+        """Drop the snapshot and rebuild it in the background."""
+        self._snapshot = None
+        self._stale = True
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.create_task(self._rebuild())
+
+    async def _refresh_periodically(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                version = await self.hotel_repository.get_catalog_version()
+            except Exception:
+                logger.exception("failed to check the catalog version")
+                continue
+            if self._snapshot is not None and self._snapshot.version == version:
+                continue
+            # a rebuild in progress, the next check catches what it may have missed
+            if self._rebuild_task is None or self._rebuild_task.done():
+                self.invalidate()
+
+    async def start(self):
+        await self.rebuild()
+        self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    def stop(self):
+        for task in (self._rebuild_task, self._refresh_task):
+            if task is not None:
+                task.cancel()
@@ -1,44 +1,154 @@
 from bson import ObjectId
 from repository.hotel_repository import IHotelRepository
+from repository.booking_repository import night_span
 from models.hotel import Hotel
-import inspect
 import logging
 from schemas.hotel.response.hotel_list_response import HotelListResponse
 from schemas.hotel.response.hotel_get_response import HotelGetResponse
 from schemas.hotel.response.hotel_update_response import HotelUpdateResponse
 from schemas.hotel.request.hotel_request import HotelRequest
-from exceptions.custom_exception import HotelServiceError
-
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level to INFO or DEBUG
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Format for log messages
+from schemas.hotel.request.hotel_search_request import HotelSearchRequest
+from schemas.hotel.response.hotel_views import HOTEL_VIEWS
+from schemas.field_selection import (
+    FieldView,
+    partial_model,
+    partial_response,
+    select_fields,
+)
+from exceptions.custom_exception import (
+    HotelNotFoundError,
+    HotelServiceError,
+    InvalidCursorError,
+    InvalidRequestError,
+)
+from repository.pagination import DEFAULT_PAGE_SIZE
+from typing import Optional
+import datetime
+from schemas.hotel.response.room_availability_response import (
+    RoomAvailabilityResponse,
 )
+from service.catalog_snapshot import CatalogSnapshot
+from service.occupancy_index import OccupancyIndex
+
+logger = logging.getLogger(__name__)
 
 
 class HotelService:
     def __init__(
         self,
         hotel_repository: IHotelRepository,
+        occupancy_index: OccupancyIndex,
+        catalog_snapshot: CatalogSnapshot,
     ):
         self.hotel_repository = hotel_repository
+        self.occupancy_index = occupancy_index
+        self.catalog_snapshot = catalog_snapshot
+
+    async def _find_fields(
+        self,
+        fields: tuple[str, ...],
+        criteria: Optional[HotelSearchRequest],
+        limit: int,
+        after: Optional[str],
+    ) -> HotelListResponse:
+        item_model = partial_model(Hotel, fields)
+        page = await self.hotel_repository.find_fields(fields, criteria, limit, after)
+        return partial_response(HotelListResponse, item_model)(
+            data=[item_model(**doc) for doc in page.items],
+            error=None,
+            next_cursor=page.next_cursor,
+        )
 
-    async def find_all(self) -> HotelListResponse:
+    async def find_all(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[str] = None,
+        view: Optional[FieldView] = None,
+    ) -> HotelListResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
-            hotels = await self.hotel_repository.find_all()
-            return HotelListResponse(data=hotels, error=None)
+            logger.info("find_all called")
+            selection = select_fields(Hotel, HOTEL_VIEWS, fields, view)
+            if selection is not None:
+                return await self._find_fields(selection, None, limit, after)
+
+            page = await self.hotel_repository.find_all(limit, after)
+            return HotelListResponse(
+                data=page.items, error=None, next_cursor=page.next_cursor
+            )
+        except (InvalidCursorError, InvalidRequestError) as e:
+            raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in find_all")
             raise HotelServiceError(f"Failed to retrieve hotels: {str(e)}")
             # return HotelListResponse(data=[], error=str(e))
 
-    async def get_by_id(self, hotel_id: str) -> HotelGetResponse:
+    async def search(
+        self,
+        criteria: HotelSearchRequest,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[str] = None,
+        view: Optional[FieldView] = None,
+    ) -> HotelListResponse:
+        try:
+            logger.info("search called")
+            selection = select_fields(Hotel, HOTEL_VIEWS, fields, view)
+            if selection is not None:
+                return await self._find_fields(selection, criteria, limit, after)
+
+            page = await self.hotel_repository.search(criteria, limit, after)
+            return HotelListResponse(
+                data=page.items, error=None, next_cursor=page.next_cursor
+            )
+        except (InvalidCursorError, InvalidRequestError) as e:
+            raise e
+        except Exception as e:
+            logger.exception("error in search")
+            raise HotelServiceError(f"Failed to search hotels: {str(e)}")
+
+    async def get_version(self, hotel_id: str) -> Optional[int]:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
+            return await self.hotel_repository.get_version(hotel_id)
+        except Exception as e:
+            logger.exception("error in get_version")
+            raise HotelServiceError(
+                f"Failed to retrieve the version of hotel {hotel_id}: {str(e)}"
+            )
+
+    async def get_catalog_version(self) -> int:
+        try:
+            return await self.hotel_repository.get_catalog_version()
+        except Exception as e:
+            logger.exception("error in get_catalog_version")
+            raise HotelServiceError(
+                f"Failed to retrieve the catalog version: {str(e)}"
+            )
+
+    async def get_by_id(
+        self,
+        hotel_id: str,
+        fields: Optional[str] = None,
+        view: Optional[FieldView] = None,
+    ) -> HotelGetResponse:
+        try:
+            logger.info("get_by_id called")
+            selection = select_fields(Hotel, HOTEL_VIEWS, fields, view)
+            if selection is not None:
+                item_model = partial_model(Hotel, selection)
+                document = await self.hotel_repository.get_fields_by_id(
+                    hotel_id, selection
+                )
+                return partial_response(HotelGetResponse, item_model)(
+                    data=item_model(**document) if document else None, error=None
+                )
+
             hotel = await self.hotel_repository.get_by_id(hotel_id)
             return HotelGetResponse(data=hotel, error=None)
+        except InvalidRequestError as e:
+            raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in get_by_id")
             raise HotelServiceError(
                 f"Failed to retrieve hotel with id {hotel_id}: {str(e)}"
             )
@@ -46,17 +156,18 @@ class HotelService:
 
     async def update(self, hotel_id: str, req: HotelRequest) -> HotelUpdateResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
+            logger.info("update called")
             hotel = Hotel(**req.model_dump(by_alias=True, exclude_unset=True))
 
-            modified_count = await self.hotel_repository.update(hotel_id, hotel)
-            if modified_count != 1:
+            updated_hotel = await self.hotel_repository.update(hotel_id, hotel)
+            if not updated_hotel:
                 raise HotelServiceError()
 
-            updated_hotel = await self.hotel_repository.get_by_id(hotel_id)
+            self.catalog_snapshot.invalidate()
+
             return HotelUpdateResponse(is_updated=True, data=updated_hotel, error=None)
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in update")
             raise HotelServiceError(
                 f"Failed to update hotel with id {hotel_id}: {str(e)}"
             )
@@ -64,12 +175,41 @@ class HotelService:
 
     async def get_hotels_by_user_id(self, user_id: str) -> HotelListResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
+            logger.info("get_hotels_by_user_id called")
             hotels = await self.hotel_repository.get_hotels_by_user_id(user_id)
             return HotelListResponse(data=hotels, error=None)
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in get_hotels_by_user_id")
             raise HotelServiceError(
                 f"Failed to retrieve hotels for user with id {user_id}: {str(e)}"
             )
             # return HotelListResponse(data=[], error=str(e))
+
+    async def get_available_rooms(
+        self,
+        hotel_id: str,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        number_of_guest: int,
+    ) -> RoomAvailabilityResponse:
+        try:
+            logger.info("get_available_rooms called")
+            # raises InvalidRequestError when the stay has no nights
+            night_span(start_date, end_date)
+
+            hotel = await self.hotel_repository.get_by_id(hotel_id)
+            if not hotel:
+                raise HotelNotFoundError(f"Hotel with id {hotel_id} does not exist")
+
+            room_ids = self.occupancy_index.available_rooms(
+                hotel, start_date, end_date, number_of_guest
+            )
+            return RoomAvailabilityResponse(data=room_ids, error=None)
+        except (HotelNotFoundError, InvalidRequestError) as e:
+            logger.warning(f"error in get_available_rooms: {str(e)}")
+            raise e
+        except Exception as e:
+            logger.exception("error in get_available_rooms")
+            raise HotelServiceError(
+                f"Failed to retrieve available rooms of hotel {hotel_id}: {str(e)}"
+            )
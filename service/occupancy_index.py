@@ -0,0 +1,116 @@
+import bisect
+import datetime
+import logging
+from models.hotel import Hotel
+from models.room_reservation import RoomReservation
+from repository.booking_repository import IBookingRepository, night_span
+
+logger = logging.getLogger(__name__)
+
+
+class RoomIntervals:
+    """
+    Half-open [start, end) stays of one room, sorted by start, as night spans. `max_ends[i]` is the
+    latest end among the first i + 1 stays, which makes the overlap check a single
+    binary search even if stays overlap each other.
+    """
+
+    __slots__ = ("starts", "ends", "max_ends")
+
+    def __init__(self):
+        self.starts: list[datetime.datetime] = []
+        self.ends: list[datetime.datetime] = []
+        self.max_ends: list[datetime.datetime] = []
+
+    def add(self, start: datetime.datetime, end: datetime.datetime):
+        i = bisect.bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.max_ends.insert(i, end)
+        for j in range(i, len(self.ends)):
+            previous = self.max_ends[j - 1] if j > 0 else None
+            self.max_ends[j] = (
+                self.ends[j] if previous is None else max(previous, self.ends[j])
+            )
+
+    def is_free(self, start: datetime.datetime, end: datetime.datetime) -> bool:
+        # only stays starting before `end` can overlap, the latest of their ends decides
+        i = bisect.bisect_left(self.starts, end)
+        return i == 0 or self.max_ends[i - 1] <= start
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class OccupancyIndex:
+    """
+    In-memory room occupancy per hotel, built from the bookings collection at startup
+    and kept current by BookingService.create_booking.
+
+    The index lives in each worker process, so bookings made through another worker
+    only show up after that worker's restart; treat results as advisory and let the
+    booking write itself be the final check.
+    """
+
+    def __init__(self):
+        self._hotels: dict[str, dict[str, RoomIntervals]] = {}
+        self.is_loaded = False
+
+    async def load(self, booking_repository: IBookingRepository):
+        self._hotels = {}
+        count = 0
+        async for reservation in booking_repository.iter_room_reservations():
+            if reservation.end_date <= reservation.start_date:
+                # stored before the dates were validated, it occupies no night
+                continue
+            self.add(reservation)
+            count += 1
+        self.is_loaded = True
+        logger.info(f"Occupancy index loaded with {count} bookings.")
+
+    def add(self, reservation: RoomReservation):
+        rooms = self._hotels.setdefault(str(reservation.hotel_id), {})
+        # the nights the repositories claim, so a fast-fail agrees with the store
+        start, end = night_span(reservation.start_date, reservation.end_date)
+        for room_id in reservation.rooms:
+            rooms.setdefault(room_id, RoomIntervals()).add(start, end)
+
+    def is_room_free(
+        self,
+        hotel_id: str,
+        room_id: str,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+    ) -> bool:
+        intervals = self._hotels.get(hotel_id, {}).get(room_id)
+        if intervals is None:
+            return True
+        return intervals.is_free(*night_span(start_date, end_date))
+
+    def available_rooms(
+        self,
+        hotel: Hotel,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        number_of_guest: int,
+    ) -> list[str]:
+        """Active rooms of the hotel that sleep enough guests and are free for the whole stay."""
+        return [
+            room.room_id
+            for room in hotel.rooms
+            if room.is_active
+            and room.sleep_count >= number_of_guest
+            and self.is_room_free(str(hotel.id), room.room_id, start_date, end_date)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.is_loaded,
+            "hotels": len(self._hotels),
+            "rooms": sum(len(rooms) for rooms in self._hotels.values()),
+            "stays": sum(
+                len(intervals)
+                for rooms in self._hotels.values()
+                for intervals in rooms.values()
+            ),
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Optional
+from repository.revoked_token_repository import IRevokedTokenRepository
+from util.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime.datetime.fromtimestamp(0, datetime.timezone.utc)
+
+# revocations written by other workers (or committed late) with a slightly earlier
+# revokedAt are still picked up; adding a jti twice to the filter is harmless
+_OVERLAP = datetime.timedelta(seconds=30)
+
+
+class TokenRevocations:
+    """
+    The revoked access tokens of the store, mirrored into a Bloom filter of their jtis.
+    Most tokens are not revoked and miss the filter, which costs a few bit probes and
+    no I/O; only hits (revoked tokens and false positives) are checked in the store.
+
+    The filter polls the revocations made since its last refresh every
+    `refresh_seconds`. Revocations only ever expire, never disappear early, so it is
+    rebuilt from scratch every `rebuild_seconds` (the access token lifetime: by then
+    every earlier entry has expired) or once it holds more than its capacity.
+    Until the first load succeeds every check goes to the store.
+    """
+
+    def __init__(
+        self,
+        revoked_token_repository: IRevokedTokenRepository,
+        refresh_seconds: float,
+        rebuild_seconds: float,
+        capacity: int,
+        error_rate: float,
+    ):
+        self.revoked_token_repository = revoked_token_repository
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter: Optional[BloomFilter] = None
+        self._built_at = 0.0
+        self._since = EPOCH
+        # jtis revoked here while a rebuild reads the store, re-added after the swap
+        self._revoked_during_build: Optional[list[str]] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.filter_misses = 0
+        self.store_checks = 0
+        self.false_positives = 0
+
+    async def is_revoked(self, jti: str) -> bool:
+        if self._filter is not None and jti not in self._filter:
+            self.filter_misses += 1
+            return False
+        self.store_checks += 1
+        revoked = await self.revoked_token_repository.is_revoked(jti)
+        if not revoked and self._filter is not None:
+            self.false_positives += 1
+        return revoked
+
+    async def revoke(self, jti: str, expired_at: datetime.datetime):
+        await self.revoked_token_repository.revoke(jti, expired_at)
+        # this worker rejects the token right away, the others on their next refresh
+        if self._filter is not None:
+            self._filter.add(jti)
+        if self._revoked_during_build is not None:
+            self._revoked_during_build.append(jti)
+
+    async def rebuild(self):
+        started = datetime.datetime.now(datetime.timezone.utc)
+        self._revoked_during_build = []
+        try:
+            revoked = await self.revoked_token_repository.find_revoked_since(EPOCH)
+            capacity = max(self.capacity, len(revoked))
+            bloom_filter = BloomFilter(capacity, self.error_rate)
+            for token in revoked:
+                bloom_filter.add(token.jti)
+            for jti in self._revoked_during_build:
+                bloom_filter.add(jti)
+        finally:
+            self._revoked_during_build = None
+
+        self._filter, self._since = bloom_filter, started - _OVERLAP
+        self._built_at = time.monotonic()
+        logger.info(f"revoked token filter built with {len(revoked)} tokens")
+
+    async def refresh(self):
+        if (
+            self._filter is None
+            or len(self._filter) > self._filter.capacity
+            or time.monotonic() - self._built_at >= self.rebuild_seconds
+        ):
+            await self.rebuild()
+            return
+
+        started = datetime.datetime.now(datetime.timezone.utc)
+        revoked = await self.revoked_token_repository.find_revoked_since(self._since)
+        for token in revoked:
+            self._filter.add(token.jti)
+        self._since = started - _OVERLAP
+
+    async def _refresh_periodically(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("failed to refresh the revoked token filter")
+
+    async def start(self):
+        try:
+            await self.rebuild()
+        except Exception:
+            logger.exception("failed to build the revoked token filter")
+        self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._filter is not None,
+            "size": len(self._filter) if self._filter is not None else 0,
+            "filterMisses": self.filter_misses,
+            "storeChecks": self.store_checks,
+            "falsePositives": self.false_positives,
+        }
@@ -7,7 +7,6 @@ from models.refresh_token_in_db import RefreshTokenInDB
 from repository.user_repository import IUserRepository
 from repository.refresh_token_repository import IRefreshTokenRepository
 from models.user import User
-import inspect
 import logging
 from schemas.user.request.login_request import LoginRequest
 from schemas.user.response.login_response import LoginResponse
@@ -20,6 +19,8 @@ from schemas.user.request.user_request import UserRequest
 from schemas.user.response.refresh_token_response import RefreshTokenResponse
 from exceptions.custom_exception import (
     AuthenticationError,
+    InvalidCursorError,
+    ServiceUnavailableError,
     TokenNotFoundError,
     UserAlreadyExistsError,
     UserNotFoundError,
@@ -27,128 +28,138 @@ from exceptions.custom_exception import (
     WrongCredentialsError,
 )
 from util.auth import AuthUtils
+from util.single_flight import SingleFlight
+from service.token_revocations import TokenRevocations
+from util.password_hasher import PasswordHasher
+from repository.pagination import DEFAULT_PAGE_SIZE
+from typing import Optional
 from config.auth.auth_settings import AuthSettings
+from config.auth.auth_keys import AuthKeys
 from fastapi import Response
+from jwt import InvalidTokenError
 
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level to INFO or DEBUG
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Format for log messages
-)
+logger = logging.getLogger(__name__)
 
 
 class UserService:
     def __init__(
         self,
         auth_settings: AuthSettings,
+        auth_keys: AuthKeys,
         user_repository: IUserRepository,
         refresh_token_repository: IRefreshTokenRepository,
+        password_hasher: PasswordHasher,
+        token_revocations: TokenRevocations,
     ):
         self.auth_settings = auth_settings
+        self.auth_keys = auth_keys
         self.user_repository = user_repository
         self.refresh_token_repository = refresh_token_repository
-
-    async def find_all(self) -> UserListResponse:
+        self.password_hasher = password_hasher
+        self.token_revocations = token_revocations
+        # concurrent refreshes with the same refresh token share one rotation
+        self.refresh_flights = SingleFlight()
+
+    async def find_all(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> UserListResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
-            users = await self.user_repository.find_all()
-            return UserListResponse(data=users, error=None)
+            logger.info("find_all called")
+            page = await self.user_repository.find_all(limit, after)
+            return UserListResponse(
+                data=page.items, error=None, next_cursor=page.next_cursor
+            )
+        except InvalidCursorError as e:
+            raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in find_all")
             raise UserServiceError(f"Failed to retrieve users: {str(e)}")
             # return UserListResponse(data=[], error=str(e))
 
     async def get_by_id(self, user_id: str) -> UserGetResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
+            logger.info("get_by_id called")
             user = await self.user_repository.get_by_id(user_id)
             return UserGetResponse(data=user, error=None)
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in get_by_id")
             raise UserServiceError(f"Failed to find user with id {user_id}: {str(e)}")
             # return UserGetResponse(data=None, error=str(e))
 
     async def get_by_email(self, email: str) -> UserGetResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called: {email}")
+            logger.info(f"get_by_email called: {email}")
             user = await self.user_repository.get_by_email(email.lower())
             return UserGetResponse(data=user, error=None)
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in get_by_email")
             raise UserServiceError(f"Failed to find user with email {email}: {str(e)}")
             # return UserGetResponse(data=None, error=str(e))
 
     async def create_user(self, req: UserRequest) -> UserCreateResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
-            existing_user = await self.user_repository.get_by_email(
-                str(req.email).lower()
-            )
-            if existing_user:
+            logger.info("create_user called")
+            if await self.user_repository.exists_by_email(str(req.email).lower()):
                 raise UserAlreadyExistsError(
                     f"User with email {req.email} already exists"
                 )
 
-            req.password = AuthUtils.get_hashed_password(req.password)
+            req.password = await self.password_hasher.get_hashed_password(req.password)
             user = User(**req.model_dump(by_alias=True, exclude_unset=True))
             inserted_id = await self.user_repository.create_user(user)
 
+            # the insert is acknowledged, no need to read the user back
             if not inserted_id:
                 raise UserServiceError()
 
-            # verify creation
-            created_user = await self.user_repository.get_by_id(inserted_id)
-            if not created_user:
-                raise UserServiceError()
-
             return UserCreateResponse(is_created=True, data=inserted_id, error=None)
         except UserAlreadyExistsError as e:
-            logging.error(f"User already exists: {str(e)}")
+            logger.warning(f"User already exists: {str(e)}")
+            raise e
+        except ServiceUnavailableError as e:
+            logger.error(f"Password hashing saturated: {str(e)}")
             raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in create_user")
             raise UserServiceError(f"Failed to create user: {str(e)}")
             # return UserCreateResponse(is_created=False, data=None, error=str(e))
 
     async def delete(self, user_id: str) -> UserDeleteResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
+            logger.info("delete called")
+            # an acknowledged delete_one is final, deleting a missing user stays a success
             await self.user_repository.delete(user_id)
 
-            user = await self.user_repository.get_by_id(user_id)
-            if user:
-                raise UserServiceError()
-
             return UserDeleteResponse(is_deleted=True, user_id=user_id, error=None)
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in delete")
             raise UserServiceError(f"Failed to delete user with id {user_id}: {str(e)}")
             # return UserDeleteResponse(is_deleted=False, user_id=None, error=str(e))
 
     async def update(self, user_id: str, req: UserRequest) -> UserUpdateResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
+            logger.info("update called")
             # check if another user with the same email exists
-            existing_user = await self.user_repository.get_by_email(
+            existing_user_id = await self.user_repository.get_id_by_email(
                 str(req.email).lower()
             )
-            if existing_user and str(existing_user.id) != user_id:
+            if existing_user_id and existing_user_id != user_id:
                 raise UserAlreadyExistsError(
                     f"User with email {req.email} already exists"
                 )
 
             user = User(**req.model_dump(by_alias=True, exclude_unset=True))
 
-            modified_count = await self.user_repository.update(user_id, user)
-            if modified_count != 1:
+            updated_user = await self.user_repository.update(user_id, user)
+            if not updated_user:
                 raise UserServiceError()
 
-            updated_user = await self.user_repository.get_by_id(user_id)
             return UserUpdateResponse(is_updated=True, data=updated_user, error=None)
         except UserAlreadyExistsError as e:
-            logging.error(f"User already exists: {str(e)}")
+            logger.warning(f"User already exists: {str(e)}")
             raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in update")
             raise UserServiceError(f"Failed to update user with id {user_id}: {str(e)}")
             # return UserUpdateResponse(is_updated=False, data=None, error=str(e))
 
@@ -156,16 +167,20 @@ class UserService:
         try:
             email = req.email.lower()
             password = req.password
-            logging.info(f"{inspect.stack()[1][3]} called")
+            logger.info("login called")
             user = await self.user_repository.get_by_email(email.lower())
             if not user or not user.id:
                 raise UserNotFoundError(UserIdentifier.email, email)
 
-            hashed_password = AuthUtils.get_hashed_password(password)
-            if not (
-                password == user.password
-                or AuthUtils.verify_password(password, hashed_password)
-            ):
+            # check against the stored hash, plain passwords are kept for legacy users
+            # only: comparing to a hash would let the hash itself in as the password
+            if AuthUtils.is_hashed_password(user.password):
+                matches = await self.password_hasher.verify_password(
+                    password, user.password
+                )
+            else:
+                matches = password == user.password
+            if not matches:
                 raise WrongCredentialsError("Incorrect password")
 
             to_encode = {
@@ -176,19 +191,19 @@ class UserService:
 
             access_token: str = AuthUtils.generate_access_token(
                 data=to_encode,
-                secret_key=self.auth_settings.access_token_private_key,
+                secret_key=self.auth_keys.access_token_private_key,
                 algorithm=self.auth_settings.algorithm,
             )
 
             refresh_token: dict = AuthUtils.generate_refresh_token(
                 data=to_encode,
-                secret_key=self.auth_settings.refresh_token_private_key,
+                secret_key=self.auth_keys.refresh_token_private_key,
                 algorithm=self.auth_settings.algorithm,
             )
 
             token_in_db = RefreshTokenInDB(
                 userId=user.id,
-                token=refresh_token["token"],
+                tokenHash=AuthUtils.token_key(refresh_token["jti"]),
                 createdAt=datetime.datetime.now(datetime.timezone.utc),
                 expiredAt=refresh_token["exp"],
             )
@@ -209,13 +224,7 @@ class UserService:
             #         f"Failed to create refresh token for user {user.id}"
             #     )
             # set refresh token in the response cookie
-            response.set_cookie(
-                key="refreshToken",
-                value=refresh_token["token"],
-                httponly=True,
-                max_age=1 * 60 * 60,  # 1 hour
-                secure=False,  # For development
-            )
+            self._set_refresh_cookie(response, refresh_token["token"])
 
             return LoginResponse(
                 message="Login successful",
@@ -223,13 +232,16 @@ class UserService:
                 token=access_token,
             )
         except WrongCredentialsError as e:
-            logging.error(f"Wrong credentials: {str(e)}")
+            logger.warning(f"Wrong credentials: {str(e)}")
             raise e
         except UserNotFoundError as e:
-            logging.error(f"User not found: {str(e)}")
+            logger.warning(f"User not found: {str(e)}")
+            raise e
+        except ServiceUnavailableError as e:
+            logger.error(f"Password hashing saturated: {str(e)}")
             raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in login")
             raise UserServiceError(
                 f"Failed to login user with email {req.email}: {str(e)}"
             )
@@ -237,92 +249,147 @@ class UserService:
             #     message="Something went wrong when trying to login", error=str(e)
             # )
 
+    def _set_refresh_cookie(self, response: Response, refresh_token: str):
+        response.set_cookie(
+            key="refreshToken",
+            value=refresh_token,
+            httponly=True,
+            max_age=1 * 60 * 60,  # 1 hour
+            secure=False,  # For development
+        )
+
+    async def _rotate_refresh_token(
+        self, key: str, claims: dict
+    ) -> tuple[str, Optional[dict]]:
+        """
+        The new access token and, unless the token was rotated moments ago by another
+        request, the refresh token replacing it.
+        """
+        to_encode = {
+            "email": str(claims["email"]),
+            "iss": "fast api backend",
+            "aud": "simplii-book",
+        }
+
+        new_access_token: str = AuthUtils.generate_access_token(
+            data=to_encode,
+            secret_key=self.auth_keys.access_token_private_key,
+            algorithm=self.auth_settings.algorithm,
+        )
+
+        new_refresh_token: dict = AuthUtils.generate_refresh_token(
+            data=to_encode,
+            secret_key=self.auth_keys.refresh_token_private_key,
+            algorithm=self.auth_settings.algorithm,
+        )
+
+        # one conditional write, of two rotations of the same token only one succeeds
+        rotated = await self.refresh_token_repository.rotate(
+            key,
+            AuthUtils.token_key(new_refresh_token["jti"]),
+            new_refresh_token["exp"],
+        )
+        if rotated:
+            return new_access_token, new_refresh_token
+
+        # lost the race to a request from another worker (or a retry): the client
+        # holds the new cookie already, keep it and only hand out an access token
+        grace = datetime.timedelta(
+            seconds=self.auth_settings.refresh_token_reuse_grace_seconds
+        )
+        rotated_after = datetime.datetime.now(datetime.timezone.utc) - grace
+        if await self.refresh_token_repository.get_by_previous_key(key, rotated_after):
+            logger.info("Refresh token was rotated just now, reusing the rotation")
+            return new_access_token, None
+
+        logger.info("Refresh token not found in the database")
+        raise TokenNotFoundError(f"Refresh token {key} not found")
+
     async def refresh_access_token(
         self, response: Response, refreshToken: str
     ) -> RefreshTokenResponse:
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
-
-            refreshTokenInDB = await self.refresh_token_repository.get_by_token(
-                refreshToken
-            )
-            if not refreshTokenInDB:
-                logging.info(f"Refresh token {refreshToken} not found in the database")
-                raise TokenNotFoundError(f"Refresh token {refreshToken} not found")
-
-            # raise error if invalid
-            res = AuthUtils.verify_token(
-                refreshToken, self.auth_settings.refresh_token_public_key
-            )
-
-            logging.info(f"Refresh token is valid")
+            logger.info("refresh_access_token called")
 
-            # generate new access token and refresh token
-            to_encode = {
-                "email": str(res["email"]),
-                "iss": "fast api backend",
-                "aud": "simplii-book",
-            }
-
-            new_access_token: str = AuthUtils.generate_access_token(
-                data=to_encode,
-                secret_key=self.auth_settings.access_token_private_key,
-                algorithm=self.auth_settings.algorithm,
+            # raise error if invalid, before touching the database
+            claims = AuthUtils.verify_token(
+                refreshToken,
+                self.auth_keys.refresh_token_public_key,
+                [self.auth_settings.algorithm],
             )
+            if not claims.get("jti"):
+                # issued before tokens were stored by their jti
+                raise TokenNotFoundError("Refresh token has no jti")
 
-            new_refresh_token: dict = AuthUtils.generate_refresh_token(
-                data=to_encode,
-                secret_key=self.auth_settings.refresh_token_private_key,
-                algorithm=self.auth_settings.algorithm,
-            )
+            logger.info("Refresh token is valid")
 
-            # update refresh token in the database
-            modified_count = await self.refresh_token_repository.update(
-                token=refreshToken, newToken=new_refresh_token["token"]
+            key = AuthUtils.token_key(claims["jti"])
+            new_access_token, new_refresh_token = await self.refresh_flights.run(
+                key, lambda: self._rotate_refresh_token(key, claims)
             )
 
-            if modified_count != 1:
-                raise UserServiceError(
-                    f"Failed to update refresh Token with email {res['email']}"
-                )
-
-            response.set_cookie(
-                key="refreshToken",
-                value=new_refresh_token["token"],
-                httponly=True,
-                max_age=1 * 60 * 60,  # 1 hour
-                secure=False,  # For development
-            )
+            if new_refresh_token:
+                self._set_refresh_cookie(response, new_refresh_token["token"])
 
             return RefreshTokenResponse(
                 message="Access token refreshed successfully", token=new_access_token
             )
-        except TokenNotFoundError as e:
+        except (TokenNotFoundError, InvalidTokenError) as e:
             raise e
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
+            logger.exception("error in refresh_access_token")
             raise UserServiceError(f"Failed to refresh access token: {str(e)}")
             # return RefreshTokenResponse(
             #     message="Something went wrong when trying to refresh access token",
             #     error=str(e),
             # )
 
-    async def logout(self, token: str, response: Response):
+    async def _revoke_access_token(self, access_token: str):
         try:
-            logging.info(f"{inspect.stack()[1][3]} called")
-            await self.refresh_token_repository.delete(token)
+            claims = AuthUtils.verify_token(
+                access_token,
+                self.auth_keys.access_token_public_key,
+                [self.auth_settings.algorithm],
+            )
+        except InvalidTokenError:
+            # expired or never issued by us, nothing to revoke
+            return
+        if claims.get("jti"):
+            await self.token_revocations.revoke(
+                claims["jti"],
+                datetime.datetime.fromtimestamp(claims["exp"], datetime.timezone.utc),
+            )
 
-            is_present = await self.refresh_token_repository.get_by_token(token)
-            if is_present:
-                raise UserServiceError(f"Failed to delete refresh token {token}")
+    async def logout(
+        self,
+        token: Optional[str],
+        response: Response,
+        access_token: Optional[str] = None,
+    ):
+        try:
+            logger.info("logout called")
+            jti = None
+            if token:
+                try:
+                    jti = AuthUtils.token_id(
+                        token,
+                        self.auth_keys.refresh_token_public_key,
+                        [self.auth_settings.algorithm],
+                    )
+                except InvalidTokenError:
+                    # never issued by us, nothing stored to delete
+                    pass
+            if jti:
+                await self.refresh_token_repository.delete(AuthUtils.token_key(jti))
+
+            if access_token:
+                await self._revoke_access_token(access_token)
 
             response.delete_cookie(key="refreshToken", httponly=True)
             return {"message": "Logout successful"}
         except Exception as e:
-            logging.error(f"error in {inspect.stack()[1][3]}: ", exc_info=True)
-            raise UserServiceError(
-                f"Failed to logout user with token {token}: {str(e)}"
-            )
+            logger.exception("error in logout")
+            raise UserServiceError(f"Failed to logout user: {str(e)}")
             # return {
             #     "message": "Something went wrong when trying to logout",
             #     "error": str(e),
@@ -1,12 +1,12 @@
 import datetime
+import hashlib
+import uuid
+from typing import Any, Optional
 from passlib.context import CryptContext
 import jwt
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level to INFO or DEBUG
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Format for log messages
-)
+logger = logging.getLogger(__name__)
 
 
 class AuthUtils:
@@ -20,51 +20,81 @@ class AuthUtils:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against a hashed password."""
-        return AuthUtils.pwd_context.verify(plain_password, hashed_password)
+        try:
+            return AuthUtils.pwd_context.verify(plain_password, hashed_password)
+        except ValueError:
+            # the stored value is not a bcrypt hash
+            return False
+
+    @staticmethod
+    def is_hashed_password(password: str) -> bool:
+        """Whether a stored password is a bcrypt hash rather than legacy plain text."""
+        return AuthUtils.pwd_context.identify(password, required=False) is not None
 
     @staticmethod
     def generate_access_token(
         data: dict,
-        secret_key: str,
+        secret_key: str | Any,
         algorithm: str = "RS256",
         expires_delta: datetime.timedelta | None = None,
     ) -> str:
-        """Generate a JWT access token."""
+        """Generate a JWT access token with a unique `jti`, the key it is revoked by."""
         if not expires_delta:
             exp = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
                 minutes=15
             )
         else:
             exp = datetime.datetime.now(datetime.timezone.utc) + expires_delta
-        data.update({"exp": exp})
+        data.update({"exp": exp, "jti": uuid.uuid4().hex})
         return jwt.encode(payload=data, key=secret_key, algorithm=algorithm)
 
     @staticmethod
     def generate_refresh_token(
         data: dict,
-        secret_key: str,
+        secret_key: str | Any,
         algorithm: str = "RS256",
         expires_delta: datetime.timedelta | None = None,
     ) -> dict:
-        """Generate a JWT refresh token."""
-        logging.debug(f"Generating refresh token with data: {data}")
+        """Generate a JWT refresh token with a unique `jti`, stored by its `token_key`."""
+        logger.debug(f"Generating refresh token with data: {data}")
         if not expires_delta:
             exp = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
                 hours=1
             )
         else:
             exp = datetime.datetime.now(datetime.timezone.utc) + expires_delta
-        data.update({"exp": exp})
+        jti = uuid.uuid4().hex
+        data.update({"exp": exp, "jti": jti})
         return {
             "exp": exp,
+            "jti": jti,
             "token": jwt.encode(payload=data, key=secret_key, algorithm=algorithm),
         }
 
+    @staticmethod
+    def token_key(jti: str) -> str:
+        """Short fixed-size key a token is stored and looked up by, derived from its jti."""
+        return hashlib.blake2b(jti.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def token_id(
+        token: str, secret_key: str | Any, algorithms: list[str] = ["RS256"]
+    ) -> Optional[str]:
+        """The jti of a token with a valid signature, expired or not."""
+        claims = jwt.decode(
+            token,
+            key=secret_key,
+            algorithms=algorithms,
+            audience="simplii-book",
+            options={"verify_exp": False},
+        )
+        return claims.get("jti")
+
     @staticmethod
     def verify_token(
-        token: str, secret_key: str, algorithms: list[str] = ["RS256"]
+        token: str, secret_key: str | Any, algorithms: list[str] = ["RS256"]
     ) -> dict:
-        """Decode a JWT token."""
+        """Decode a JWT token. The key can be a PEM string or a key object from AuthKeys."""
         try:
             return jwt.decode(
                 token,
@@ -74,8 +104,8 @@ class AuthUtils:
                 audience="simplii-book",
             )
         except jwt.ExpiredSignatureError as e:
-            logging.error(f"Token has expired: {str(e)}")
+            logger.warning(f"Token has expired: {str(e)}")
             raise e
         except jwt.InvalidTokenError as e:
-            logging.error(f"Invalid token: {str(e)}")
+            logger.warning(f"Invalid token: {str(e)}")
             raise e
@@ -0,0 +1,47 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Set membership with false positives but no false negatives, in a fixed bit array.
+    Sized for `capacity` keys at `error_rate`; past the capacity the false positive
+    rate grows, so the owner rebuilds it. Positions come from one blake2b digest by
+    double hashing, so a lookup is one hash and `hash_count` bit probes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.size = max(
+            8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> bool:
+        """Add `key`, False if it (or a false positive) was in the filter already."""
+        added = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        # keys added twice are counted once, so len() stays comparable to the capacity
+        self._count += added
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
@@ -0,0 +1,76 @@
+import time
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while a dependency is known to be down.
+
+    It is driven by the database heartbeat only: a request's outcome says little about
+    the database, many are answered from caches or rejected before reaching it.
+    `failure_threshold` failed pings in a row open the circuit and requests are
+    rejected. After `reset_seconds` it half-opens, the heartbeat probes at once and
+    requests are still rejected until the probe succeeds (closed) or fails (open
+    again for another `reset_seconds`).
+
+    Only the event loop touches it, and no method awaits.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self.opened = 0
+        self.rejected = 0
+
+    def admit(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        self.rejected += 1
+        return False
+
+    def begin_probe(self) -> bool:
+        """Half-open the circuit if it has been open long enough, True if it did."""
+        if (
+            self.state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_seconds
+        ):
+            self.state = CircuitState.HALF_OPEN
+            return True
+        return False
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self.opened += 1
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit half-opens, 0 when it is not open."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "consecutiveFailures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
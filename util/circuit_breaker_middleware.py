@@ -0,0 +1,36 @@
+import math
+from fastapi.responses import JSONResponse
+
+# health checks and scrapes must keep answering while the database is down
+EXEMPT_PATH_PREFIXES = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+class CircuitBreakerMiddleware:
+    """
+    Pure ASGI middleware rejecting requests with 503 while the database circuit is not
+    closed, instead of letting each of them wait for the database to time out.
+    Whether it closes again is up to the database heartbeat.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        # set in the lifespan, absent while the app starts
+        db_manager = getattr(scope["app"].state, "db_manager", None)
+        if db_manager is None or db_manager.circuit_breaker.admit():
+            await self.app(scope, receive, send)
+            return
+
+        # a half-open circuit is being probed, the answer is a heartbeat away
+        retry_after = max(1, math.ceil(db_manager.circuit_breaker.retry_after()))
+        response = JSONResponse(
+            status_code=503,
+            content={"message": "Database unavailable, retry later"},
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,37 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response
+
+
+def make_etag(
+    version: int, request: Request, content_encoding: Optional[str] = None
+) -> str:
+    """
+    Strong ETag of the representation of `version` the request asks for: the path and
+    the query parameters (page, fields, view, ...) select what is rendered from it.
+    Compressed bodies are different representations and get their own tag.
+    """
+    query = "&".join(
+        f"{key}={value}" for key, value in sorted(request.query_params.multi_items())
+    )
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{query}".encode("utf-8"), digest_size=8
+    ).hexdigest()
+    if content_encoding:
+        return f'"{version}-{digest}-{content_encoding}"'
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, a W/ prefix on the client's tags is ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, headers: Optional[dict] = None) -> Response:
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
@@ -0,0 +1,40 @@
+import time
+from util.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+# requests that did not match a route share one label, so scanners probing
+# random paths cannot grow the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording count, status and latency per route template.
+    The template is read from the scope after the app ran, where FastAPI stores the matched route.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            HTTP_REQUESTS.inc((method, route_path, str(status)))
+            HTTP_REQUEST_DURATION.observe((method, route_path), elapsed)
@@ -0,0 +1,22 @@
+from fastapi import Response
+from pydantic import BaseModel
+
+
+class ModelResponse(Response):
+    """
+    JSON response rendered straight from a response model by pydantic-core.
+
+    A model returned under `response_model=` is dumped to a dict, validated against the
+    response model a second time, turned into plain Python values and only then encoded
+    by json.dumps. The services build their responses from models that were validated when
+    they were read, so routes wrap them in a ModelResponse and the body is produced in one
+    pass, byte for byte the same. `response_model=` stays on the route for the OpenAPI schema.
+
+    Headers and cookies set on an injected `Response` are not copied over, so routes that
+    set cookies keep returning the model.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json(by_alias=True).encode("utf-8")
@@ -0,0 +1,20 @@
+import datetime
+import json
+from typing import Any, Iterable
+from bson import ObjectId
+
+
+def _default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_ndjson(documents: Iterable[dict]) -> bytes:
+    """Serialize documents as newline-delimited JSON, one document per line."""
+    return "".join(
+        json.dumps(doc, default=_default, separators=(",", ":")) + "\n"
+        for doc in documents
+    ).encode("utf-8")
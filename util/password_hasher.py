@@ -0,0 +1,80 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from exceptions.custom_exception import ServiceUnavailableError
+from util.auth import AuthUtils
+
+
+class PasswordHasher:
+    """
+    Runs the bcrypt calls of AuthUtils on a dedicated, size-limited thread pool so they
+    do not block the event loop. bcrypt releases the GIL while hashing, so threads are
+    enough to use several cores.
+
+    At most `max_pending` calls may be queued or running at once; beyond that callers
+    get a ServiceUnavailableError (503) right away instead of piling up behind the pool.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def get_hashed_password(self, password: str) -> str:
+        """Hash a password using bcrypt off the event loop."""
+        return await self._run(AuthUtils.get_hashed_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hashed password off the event loop."""
+        return await self._run(AuthUtils.verify_password, plain_password, hashed_password)
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise ServiceUnavailableError(
+                "Too many password operations in progress, please retry later"
+            )
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            # time spent waiting for a free worker thread
+            wait_seconds = time.perf_counter() - submitted_at
+            return wait_seconds, fn(*args)
+
+        self._pending += 1
+        try:
+            wait_seconds, result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, task
+            )
+        finally:
+            self._pending -= 1
+
+        self.completed += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "maxPending": self.max_pending,
+            "inFlight": self._pending,
+            "queueDepth": max(0, self._pending - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avgWaitSeconds": (
+                self.total_wait_seconds / self.completed if self.completed else 0.0
+            ),
+            "maxWaitSeconds": self.max_wait_seconds,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
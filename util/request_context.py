@@ -0,0 +1,74 @@
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+REQUEST_ID_HEADER = "x-request-id"
+# client supplied ids longer than this are replaced by a generated one
+_MAX_REQUEST_ID_LENGTH = 128
+
+
+class RequestContext:
+    """
+    Per-request values attached to every log record written while the request runs.
+    The route is read lazily from the ASGI scope, where FastAPI stores the matched
+    route only after the middleware has already started.
+    """
+
+    __slots__ = ("request_id", "scope", "user")
+
+    def __init__(self, request_id: str, scope: dict):
+        self.request_id = request_id
+        self.scope = scope
+        self.user: Optional[str] = None
+
+    @property
+    def route(self) -> Optional[str]:
+        route = self.scope.get("route")
+        return getattr(route, "path", None)
+
+
+request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    return request_context.get()
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware that sets the request context and echoes the request id
+    back in the `X-Request-ID` response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or len(request_id) > _MAX_REQUEST_ID_LENGTH:
+            request_id = uuid.uuid4().hex
+
+        ctx = RequestContext(request_id, scope)
+        token = request_context.set(ctx)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((REQUEST_ID_HEADER.encode(), request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_context.reset(token)
@@ -0,0 +1,22 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the call, callers
+    arriving while it is in flight await its result (or exception) instead of running it
+    again. Nothing is kept once the call finishes.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        # a cancelled caller must not cancel the call the others are waiting on
+        return await asyncio.shield(flight)
@@ -0,0 +1,35 @@
+import hashlib
+import time
+from typing import Optional
+from util.cache import TTLCache
+
+
+class VerifiedTokenCache:
+    """
+    Claims of already verified access tokens, keyed by the SHA-256 digest of the token.
+    An entry never outlives the token's own `exp`, so an expired token is always
+    verified again (and rejected) by PyJWT.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache: TTLCache[bytes, dict] = TTLCache(max_size, ttl_seconds)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        return self._cache.get(self._digest(token))
+
+    def put(self, token: str, claims: dict):
+        exp = claims.get("exp")
+        if exp is None:
+            # without an expiry we cannot bound the entry, keep verifying it
+            return
+        self._cache.set(self._digest(token), claims, ttl_seconds=exp - time.time())
+
+    def invalidate(self, token: str):
+        self._cache.invalidate(self._digest(token))
+
+    def stats(self) -> dict:
+        return self._cache.stats()